@@ -0,0 +1,45 @@
+import argparse
+import json
+import sys
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Compare two benchmark JSON files (baseline vs candidate).")
+    p.add_argument("baseline", help="JSON from run_benchmarks.py on the base commit")
+    p.add_argument("candidate", help="JSON from run_benchmarks.py on the new commit")
+    p.add_argument("--metric", default="p50_ms", help="Field to compare (default: p50_ms)")
+    p.add_argument("--threshold", type=float, default=0.2,
+                   help="Relative slowdown treated as a regression (default: 0.2 = +20%%)")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    with open(args.baseline) as f:
+        base = json.load(f)["results"]
+    with open(args.candidate) as f:
+        cand = json.load(f)["results"]
+
+    regressions = []
+    print(f"{'BENCHMARK':<40} {'BASE':>10} {'NEW':>10} {'CHANGE':>8}")
+    print("-" * 72)
+    for name in sorted(set(base) | set(cand)):
+        if name not in base or name not in cand:
+            print(f"{name:<40} {'-' if name not in base else base[name][args.metric]:>10} "
+                  f"{'-' if name not in cand else cand[name][args.metric]:>10}")
+            continue
+        b, c = base[name][args.metric], cand[name][args.metric]
+        change = (c - b) / b if b else 0.0
+        flag = "  <-- regression" if change > args.threshold else ""
+        print(f"{name:<40} {b:>10.2f} {c:>10.2f} {change:>+7.0%}{flag}")
+        if flag:
+            regressions.append(name)
+
+    if regressions:
+        print(f"\n[FAIL] {len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+    print("\n[OK] no regressions")
+
+
+if __name__ == "__main__":
+    main()
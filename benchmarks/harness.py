@@ -0,0 +1,69 @@
+import json
+import platform
+import statistics
+import subprocess
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class BenchmarkSuite:
+    """
+    간단한 벤치마크 러너.
+    - bench(name, fn, repeat, ops_per_call): fn을 repeat번 실행하며 호출별 지연시간(ms) 측정
+    - ops_per_call: 한 번 호출에 처리하는 연산 수 (예: metric 1000개를 한 번에 보내면 1000) → ops_per_s 계산
+    - 결과는 커밋 간 비교를 위해 JSON으로 저장
+    """
+
+    def __init__(self, warmup: int = 1):
+        self.warmup = warmup
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    def bench(self, name: str, fn: Callable[[], Any], repeat: int = 20, ops_per_call: int = 1, setup: Optional[Callable[[], Any]] = None):
+        for _ in range(self.warmup):
+            if setup:
+                setup()
+            fn()
+        samples: List[float] = []
+        for _ in range(repeat):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - start) * 1000)
+        samples.sort()
+        mean = statistics.fmean(samples)
+        self.results[name] = {
+            "n": repeat,
+            "ops_per_call": ops_per_call,
+            "mean_ms": mean,
+            "p50_ms": samples[len(samples) // 2],
+            "p95_ms": samples[min(len(samples) - 1, int(0.95 * len(samples)))],
+            "min_ms": samples[0],
+            "max_ms": samples[-1],
+            "ops_per_s": ops_per_call / (mean / 1000) if mean > 0 else None,
+        }
+        r = self.results[name]
+        print(f"{name:<40} mean={r['mean_ms']:9.2f}ms  p95={r['p95_ms']:9.2f}ms  ops/s={r['ops_per_s']:,.0f}")
+        return r
+
+    def save(self, path: str, extra_meta: Optional[Dict[str, Any]] = None):
+        payload = {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "git_commit": _git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                **(extra_meta or {}),
+            },
+            "results": self.results,
+        }
+        with open(path, "w") as f:
+            json.dump(payload, f, indent=2)
+        print(f"[OK] results written to {path}")
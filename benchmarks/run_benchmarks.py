@@ -0,0 +1,144 @@
+"""
+튜토리얼에서 사용하는 MLflow 호출들의 호출당 지연시간 / 처리량 벤치마크.
+
+- 로컬 SQLite tracking/registry store + 로컬 artifact 디렉터리를 사용하므로 서버 없이 오프라인 실행 가능
+- 결과는 JSON으로 저장 → benchmarks/compare.py로 커밋 간 회귀 비교
+
+    python benchmarks/run_benchmarks.py --out bench_base.json
+    python benchmarks/compare.py bench_base.json bench_new.json
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # src / benchmarks import용
+
+from benchmarks.harness import BenchmarkSuite
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Benchmark MLflow tracking / registry / artifact overhead (offline).")
+    p.add_argument("--out", default="bench_results.json", help="Output JSON path")
+    p.add_argument("--repeat", type=int, default=20, help="Repetitions per benchmark")
+    p.add_argument("--n-metrics", type=int, default=100, help="Metrics per logging benchmark call")
+    p.add_argument("--n-runs", type=int, default=200, help="Runs to create before search_runs benchmark")
+    p.add_argument("--workdir", default=None, help="Directory for the SQLite DB / artifacts (default: temp dir)")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix="mlflow-bench-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    import mlflow
+    import numpy as np
+    import pandas as pd
+    from mlflow.entities import Metric
+    from mlflow.models.signature import infer_signature
+    from mlflow.tracking import MlflowClient
+    from sklearn.datasets import load_iris
+    from sklearn.linear_model import LogisticRegression
+
+    from src.mlflow_utils import BufferedMetricLogger
+    from src.model_cache import ModelCache
+    from src.signature_cache import infer_signature_cached
+
+    db_uri = f"sqlite:///{workdir / 'mlflow.db'}"
+    mlflow.set_tracking_uri(db_uri)
+    mlflow.set_registry_uri(db_uri)
+    client = MlflowClient()
+    exp_name = f"bench-{int(time.time())}"
+    exp_id = client.create_experiment(exp_name, artifact_location=(workdir / "artifacts").as_uri())
+    mlflow.set_experiment(experiment_id=exp_id)
+
+    suite = BenchmarkSuite()
+    n = args.n_metrics
+    repeat = args.repeat
+
+    X, y = load_iris(return_X_y=True, as_frame=True)
+    clf = LogisticRegression(max_iter=200).fit(X, y)
+    df = pd.DataFrame({"step": np.arange(1000), "val_acc": np.random.default_rng(0).random(1000)})
+    img = np.zeros((120, 200, 3), dtype=np.uint8)
+    text_path = workdir / "report.txt"
+    text_path.write_text("benchmark report\n" * 100)
+
+    with mlflow.start_run(run_name="bench") as run:
+        run_id = run.info.run_id
+
+        # 1) metric 로깅: 호출당 1개 vs log_batch vs BufferedMetricLogger
+        suite.bench(f"log_metric_x{n}", lambda: [mlflow.log_metric("m", float(i), step=i) for i in range(n)],
+                    repeat=repeat, ops_per_call=n)
+
+        def log_batch():
+            ts = int(time.time() * 1000)
+            client.log_batch(run_id, metrics=[Metric("b", float(i), ts, i) for i in range(n)])
+
+        suite.bench(f"log_batch_x{n}", log_batch, repeat=repeat, ops_per_call=n)
+
+        buffered = BufferedMetricLogger(run_id=run_id, client=client)
+
+        def log_buffered():
+            for i in range(n):
+                buffered.log_metric("buf", float(i), step=i)
+            buffered.flush()
+
+        suite.bench(f"buffered_logger_x{n}", log_buffered, repeat=repeat, ops_per_call=n)
+        suite.bench(f"buffered_logger_enqueue_x{n}",
+                    lambda: [buffered.log_metric("buf_enq", float(i), step=i) for i in range(n)],
+                    repeat=repeat, ops_per_call=n)
+        buffered.close()
+
+        # 2) 아티팩트
+        suite.bench("log_artifact_text", lambda: mlflow.log_artifact(str(text_path), artifact_path="reports"),
+                    repeat=repeat)
+        suite.bench("log_table_1000rows", lambda: mlflow.log_table(data=df, artifact_file="tables/metrics.json"),
+                    repeat=repeat)
+        suite.bench("log_image_200x120", lambda: mlflow.log_image(img, artifact_file="images/gradient.png"),
+                    repeat=repeat)
+
+        # 3) 모델 로깅 (signature 추론 포함)
+        model_repeat = max(3, repeat // 4)
+        suite.bench("infer_signature", lambda: infer_signature(X, clf.predict(X)), repeat=repeat)
+        suite.bench("infer_signature_cached", lambda: infer_signature_cached(clf, X), repeat=repeat)
+        suite.bench(
+            "infer_signature+log_model",
+            lambda: mlflow.sklearn.log_model(clf, artifact_path="model",
+                                             signature=infer_signature(X, clf.predict(X)),
+                                             input_example=X.head(2)),
+            repeat=model_repeat,
+        )
+        model_uri = f"runs:/{run_id}/model"
+
+    # 4) search_runs (n_runs개 run 생성 후)
+    for i in range(args.n_runs):
+        r = client.create_run(exp_id, tags={"stage": "tuning"}, run_name=f"trial_{i:03d}")
+        client.log_batch(r.info.run_id, metrics=[Metric("val_f1", float(i % 97) / 97, 0, 0)])
+        client.set_terminated(r.info.run_id)
+    suite.bench(
+        f"search_runs_{args.n_runs}runs",
+        lambda: client.search_runs([exp_id], filter_string="tags.stage = 'tuning'",
+                                   order_by=["metrics.val_f1 DESC"], max_results=1),
+        repeat=repeat,
+    )
+
+    # 5) registry
+    model_name = f"bench_model_{exp_id}"
+    client.create_registered_model(model_name)
+    for _ in range(10):
+        client.create_model_version(model_name, source=f"{run.info.artifact_uri}/model", run_id=run_id)
+    suite.bench("search_model_versions_10", lambda: client.search_model_versions(f"name='{model_name}'"),
+                repeat=repeat)
+
+    # 6) 모델 로드: 매번 로드 vs 로컬 캐시
+    suite.bench("pyfunc.load_model", lambda: mlflow.pyfunc.load_model(model_uri), repeat=model_repeat)
+    cache = ModelCache(cache_dir=workdir / "model_cache")
+    suite.bench("ModelCache.load (warm)", lambda: cache.load(model_uri), repeat=repeat)
+
+    suite.save(args.out, extra_meta={"mlflow": mlflow.__version__, "tracking_uri": db_uri, "n_metrics": n})
+
+
+if __name__ == "__main__":
+    main()
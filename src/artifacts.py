@@ -0,0 +1,272 @@
+import io
+import json
+import os
+import posixpath
+import tarfile
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from src.lazy import lazy_import
+
+mlflow = lazy_import("mlflow")
+
+# 이 크기 이상이면 S3 multipart 업로드 (part 크기 CHUNK_SIZE)
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+CHUNK_SIZE = 8 * 1024 * 1024
+
+
+class ArtifactUploader:
+    """
+    run 아티팩트를 스레드 풀에서 동시에 업로드하는 업로더.
+    - log_* 호출은 즉시 반환하고 업로드는 백그라운드에서 진행 (close()/with 종료 시 모두 대기)
+    - 텍스트/dict/DataFrame/이미지는 임시 파일 없이 메모리 버퍼에서 바로 전송
+    - artifact_uri 스킴별 전송:
+      - mlflow-artifacts:/ (--serve-artifacts 프록시): 풀링된 requests.Session으로 HTTP PUT,
+        파일은 메모리에 올리지 않고 스트리밍 (재시도 시 파일을 되감아 전체 재전송)
+      - s3:// : boto3 upload_fileobj (multipart_threshold 이상이면 multipart)
+      - 그 외: MLflow artifact repository로 위임
+    - bundle_small=True면 small_threshold 미만 항목을 모아 tar.gz 하나로 업로드
+    """
+
+    def __init__(
+        self,
+        run_id: Optional[str] = None,
+        client=None,
+        max_workers: int = 8,
+        bundle_small: bool = False,
+        small_threshold: int = 64 * 1024,
+        bundle_path: str = "bundles/artifacts.tar.gz",
+    ):
+        if run_id is None:
+            active = mlflow.active_run()
+            if active is None:
+                raise RuntimeError("No active run. Pass run_id or call inside mlflow.start_run().")
+            run_id = active.info.run_id
+        self.run_id = run_id
+        self.client = client or mlflow.tracking.MlflowClient()
+        self.artifact_uri = self.client.get_run(run_id).info.artifact_uri
+        self.max_workers = max_workers
+        self.bundle_small = bundle_small
+        self.small_threshold = small_threshold
+        self.bundle_path = bundle_path
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="artifact-upload")
+        self._futures: List[Future] = []
+        self._bundle: List[Tuple[str, bytes]] = []
+        self._lock = threading.Lock()
+        self._session = None
+        self._s3 = None
+        self._n_uploaded = 0
+        self._n_bytes = 0
+        self._start = time.perf_counter()
+        self._closed = False
+
+    # ---- 기록 API ----
+    def log_bytes(self, data: bytes, artifact_file: str):
+        if self.bundle_small and len(data) < self.small_threshold:
+            with self._lock:
+                self._bundle.append((artifact_file, data))
+            return
+        self._submit(self._upload, artifact_file, data, len(data))
+
+    def log_text(self, text: str, artifact_file: str):
+        self.log_bytes(text.encode("utf-8"), artifact_file)
+
+    def log_dict(self, dictionary: Dict[str, Any], artifact_file: str):
+        self.log_text(json.dumps(dictionary, indent=2), artifact_file)
+
+    def log_csv(self, df, artifact_file: str, index: bool = False):
+        """DataFrame을 로컬 CSV 파일 없이 메모리에서 바로 업로드"""
+        self.log_bytes(df.to_csv(index=index).encode("utf-8"), artifact_file)
+
+    def log_table(self, df, artifact_file: str):
+        """mlflow.log_table과 같은 JSON 포맷 + UI 미리보기용 태그(mlflow.loggedArtifacts) 갱신"""
+        payload = {"columns": [str(c) for c in df.columns], "data": json.loads(df.to_json(orient="values"))}
+        self.log_dict(payload, artifact_file)
+        self._add_logged_artifact_tag(artifact_file, "table")
+
+    def log_image(self, image, artifact_file: str):
+        """numpy 배열 또는 PIL 이미지를 PNG로 인코딩해 업로드"""
+        from PIL import Image
+
+        if not isinstance(image, Image.Image):
+            image = Image.fromarray(image)
+        buf = io.BytesIO()
+        image.save(buf, format="PNG")
+        self.log_bytes(buf.getvalue(), artifact_file)
+
+    def log_file(self, local_path: Union[str, os.PathLike], artifact_path: Optional[str] = None):
+        local_path = os.fspath(local_path)
+        name = os.path.basename(local_path)
+        artifact_file = posixpath.join(artifact_path, name) if artifact_path else name
+        size = os.path.getsize(local_path)
+        if self.bundle_small and size < self.small_threshold:
+            with open(local_path, "rb") as f:
+                self.log_bytes(f.read(), artifact_file)
+            return
+        self._submit(self._upload, artifact_file, local_path, size)
+
+    def log_dir(self, local_dir: Union[str, os.PathLike], artifact_path: Optional[str] = None):
+        for root, _, files in os.walk(local_dir):
+            rel = os.path.relpath(root, local_dir)
+            sub = artifact_path if rel == "." else posixpath.join(artifact_path or "", *rel.split(os.sep))
+            for name in files:
+                self.log_file(os.path.join(root, name), sub or None)
+
+    def wait(self):
+        """지금까지 제출된 업로드가 모두 끝날 때까지 대기, 실패가 있으면 예외"""
+        with self._lock:
+            futures, self._futures = self._futures, []
+        wait(futures)
+        errors = [f.exception() for f in futures if f.exception() is not None]
+        if errors:
+            raise RuntimeError(f"{len(errors)} artifact upload(s) failed; first error: {errors[0]!r}") from errors[0]
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._flush_bundle()
+            self.wait()
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "n_uploaded": self._n_uploaded,
+            "bytes": self._n_bytes,
+            "elapsed_s": time.perf_counter() - self._start,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ---- 내부 ----
+    def _submit(self, fn, *args):
+        if self._closed:
+            raise RuntimeError("ArtifactUploader is closed.")
+        fut = self._executor.submit(fn, *args)
+        with self._lock:
+            self._futures.append(fut)
+
+    def _flush_bundle(self):
+        with self._lock:
+            items, self._bundle = self._bundle, []
+        if not items:
+            return
+        buf = io.BytesIO()
+        with tarfile.open(fileobj=buf, mode="w:gz") as tar:
+            for name, data in items:
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                info.mtime = int(time.time())
+                tar.addfile(info, io.BytesIO(data))
+        data = buf.getvalue()
+        self._submit(self._upload, self.bundle_path, data, len(data))
+
+    def _add_logged_artifact_tag(self, path: str, artifact_type: str):
+        with self._lock:
+            tags = self.client.get_run(self.run_id).data.tags
+            logged = json.loads(tags.get("mlflow.loggedArtifacts", "[]"))
+            if not any(a.get("path") == path for a in logged):
+                logged.append({"path": path, "type": artifact_type})
+                self.client.set_tag(self.run_id, "mlflow.loggedArtifacts", json.dumps(logged))
+
+    def _http_session(self):
+        with self._lock:
+            if self._session is not None:
+                return self._session
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            session = requests.Session()
+            retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                          allowed_methods=None)
+            adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers, max_retries=retry)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            # MLflow client와 같은 인증 환경변수 (token이 있으면 우선)
+            token = os.getenv("MLFLOW_TRACKING_TOKEN")
+            user, password = os.getenv("MLFLOW_TRACKING_USERNAME"), os.getenv("MLFLOW_TRACKING_PASSWORD")
+            if token:
+                session.headers["Authorization"] = f"Bearer {token}"
+            elif user and password:
+                session.auth = (user, password)
+            self._session = session
+            return session
+
+    def _s3_client(self):
+        # boto3 client는 스레드 안전하지만 생성(기본 session 공유)은 아님 → 잠금 안에서 하나만 만들어 공유
+        with self._lock:
+            if self._s3 is not None:
+                return self._s3
+            import boto3
+            from botocore.config import Config
+
+            self._s3 = boto3.session.Session().client(
+                "s3",
+                endpoint_url=os.getenv("MLFLOW_S3_ENDPOINT_URL"),
+                config=Config(max_pool_connections=self.max_workers),
+            )
+            return self._s3
+
+    def _upload(self, artifact_file: str, source: Union[bytes, str], size: int):
+        dest = posixpath.join(self.artifact_uri, artifact_file)
+        if self.artifact_uri.startswith("mlflow-artifacts:"):
+            self._upload_http(dest, source, size)
+        elif self.artifact_uri.startswith("s3://"):
+            self._upload_s3(dest, source)
+        else:
+            self._upload_repo(artifact_file, source)
+        with self._lock:
+            self._n_uploaded += 1
+            self._n_bytes += size
+
+    def _upload_http(self, dest: str, source: Union[bytes, str], size: int):
+        from urllib.parse import urlparse
+
+        tracking = mlflow.get_tracking_uri().rstrip("/")
+        path = urlparse(dest).path.lstrip("/")
+        url = f"{tracking}/api/2.0/mlflow-artifacts/artifacts/{path}"
+        session = self._http_session()
+        if isinstance(source, bytes):
+            resp = session.put(url, data=source)
+        else:
+            with open(source, "rb") as f:
+                # 파일 객체 그대로 전달: 메모리에 올리지 않고 스트리밍하며, 재시도 시 처음 위치로 되감겨 본문 전체를 다시 보냄
+                # (generator는 한 번만 읽히므로 재시도 때 빈 / 잘린 본문이 전송됨)
+                resp = session.put(url, data=f)
+        resp.raise_for_status()
+
+    def _upload_s3(self, dest: str, source: Union[bytes, str]):
+        from boto3.s3.transfer import TransferConfig
+
+        bucket, key = dest[len("s3://"):].split("/", 1)
+        config = TransferConfig(multipart_threshold=MULTIPART_THRESHOLD, multipart_chunksize=CHUNK_SIZE)
+        if isinstance(source, bytes):
+            self._s3_client().upload_fileobj(io.BytesIO(source), bucket, key, Config=config)
+        else:
+            self._s3_client().upload_file(source, bucket, key, Config=config)
+
+    def _upload_repo(self, artifact_file: str, source: Union[bytes, str]):
+        from mlflow.store.artifact.artifact_repository_registry import get_artifact_repository
+
+        repo = get_artifact_repository(self.artifact_uri)
+        artifact_dir = posixpath.dirname(artifact_file) or None
+        if isinstance(source, bytes):
+            # 로컬/기타 스토어는 파일 경로가 필요하므로 임시 파일 경유
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, posixpath.basename(artifact_file))
+                with open(path, "wb") as f:
+                    f.write(source)
+                repo.log_artifact(path, artifact_dir)
+        else:
+            repo.log_artifact(source, artifact_dir)
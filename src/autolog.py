@@ -0,0 +1,152 @@
+import importlib
+import logging
+import math
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from src.mlflow_utils import BufferedMetricLogger
+
+POLICIES = ("every_n", "epsilon", "summary")
+# 이름에 포함되면 "작을수록 좋은" metric으로 간주 (best 값 판단용)
+LOWER_IS_BETTER_HINTS = ("loss", "error", "rmse", "mae", "mse", "mape", "deviance")
+
+_original_loggers: Dict[str, object] = {}
+
+
+def _lower_is_better(key: str) -> bool:
+    k = key.lower()
+    return any(h in k for h in LOWER_IS_BETTER_HINTS)
+
+
+class MetricDownsampler:
+    """
+    반복(step)별 metric을 정책에 따라 솎아내는 필터.
+    - every_n: step 0, 그리고 every_n 스텝마다 기록
+    - epsilon: 마지막으로 기록한 값 대비 변화가 epsilon(relative=True면 비율)을 넘을 때만 기록
+    - summary: 스텝별 값은 기록하지 않고 종료 시 {key}_min / _max / _mean 요약만 기록
+    - 모든 정책 공통: 마지막 step 값과 best step 값은 원래 step 그대로 반드시 기록 (finalize)
+    """
+
+    def __init__(self, policy: str = "every_n", every_n: int = 10, epsilon: float = 1e-3, relative: bool = True):
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}, got {policy!r}")
+        self.policy = policy
+        self.every_n = max(1, every_n)
+        self.epsilon = epsilon
+        self.relative = relative
+        # key → 상태
+        self._last_logged: Dict[str, float] = {}
+        self._logged_steps: Dict[str, set] = {}
+        self._last: Dict[str, Tuple[int, float]] = {}
+        self._best: Dict[str, Tuple[int, float]] = {}
+        self._agg: Dict[str, List[float]] = {}  # [count, sum, min, max]
+        self.n_seen = 0
+        self.n_logged = 0
+
+    def observe(self, key: str, value: float, step: int) -> bool:
+        """값을 관찰하고 지금 기록해야 하면 True"""
+        value = float(value)
+        self.n_seen += 1
+        self._last[key] = (step, value)
+        best = self._best.get(key)
+        if best is None or (value < best[1] if _lower_is_better(key) else value > best[1]):
+            self._best[key] = (step, value)
+        agg = self._agg.setdefault(key, [0, 0.0, math.inf, -math.inf])
+        agg[0] += 1
+        agg[1] += value
+        agg[2] = min(agg[2], value)
+        agg[3] = max(agg[3], value)
+
+        if self.policy == "summary":
+            return False
+        if self.policy == "every_n":
+            log = step % self.every_n == 0
+        else:
+            prev = self._last_logged.get(key)
+            tol = self.epsilon * max(abs(prev), 1e-12) if (prev is not None and self.relative) else self.epsilon
+            log = prev is None or abs(value - prev) > tol
+        if log:
+            self._mark(key, value, step)
+        return log
+
+    def _mark(self, key: str, value: float, step: int):
+        self._last_logged[key] = value
+        self._logged_steps.setdefault(key, set()).add(step)
+        self.n_logged += 1
+
+    def finalize(self) -> List[Tuple[str, float, int]]:
+        """아직 기록되지 않은 마지막 / best 값 + (summary) 요약값 → [(key, value, step)]"""
+        out = []
+        for key, (last_step, last_value) in self._last.items():
+            for step, value in {self._best[key], (last_step, last_value)}:
+                if step not in self._logged_steps.get(key, ()):
+                    out.append((key, value, step))
+                    self._mark(key, value, step)
+            if self.policy == "summary":
+                count, total, lo, hi = self._agg[key]
+                out += [(f"{key}_min", lo, last_step), (f"{key}_max", hi, last_step),
+                        (f"{key}_mean", total / count, last_step)]
+                self.n_logged += 3
+        return out
+
+
+class _DownsampledMetricsLogger:
+    """autolog 내부 BatchMetricsLogger 대체: record_metrics(metrics, step)만 구현"""
+
+    def __init__(self, sampler: MetricDownsampler, buffered: BufferedMetricLogger):
+        self.sampler = sampler
+        self.buffered = buffered
+
+    def record_metrics(self, metrics: Dict[str, float], step: Optional[int] = None, **kwargs):
+        step = step or 0
+        for key, value in metrics.items():
+            if self.sampler.observe(key, value, step):
+                self.buffered.log_metric(key, value, step=step)
+
+    def flush(self):
+        self.buffered.flush()
+
+
+def downsampled_autolog(
+    flavor: str = "xgboost",
+    policy: str = "every_n",
+    every_n: int = 10,
+    epsilon: float = 1e-3,
+    relative: bool = True,
+    **autolog_kwargs,
+):
+    """
+    mlflow.<flavor>.autolog(**autolog_kwargs) + 반복별 metric 솎아내기.
+    - autolog가 학습 중 사용하는 batch_metrics_logger(run_id)를 MetricDownsampler + BufferedMetricLogger로 교체
+      → params / 모델 / best_iteration 등 나머지 autolog 동작은 그대로
+    - 기록 정책은 run 태그 autolog.downsample에 남김
+    - 해당 flavor가 batch_metrics_logger를 쓰지 않는 MLflow 버전이면 경고 후 일반 autolog로 동작
+    """
+    module = importlib.import_module(f"mlflow.{flavor}")
+    module.autolog(**autolog_kwargs)
+    if not hasattr(module, "batch_metrics_logger"):
+        logging.warning(f"[downsampled_autolog] mlflow.{flavor} has no batch_metrics_logger; logging every step.")
+        return
+    MetricDownsampler(policy, every_n, epsilon, relative)  # 인자 검증
+    _original_loggers.setdefault(flavor, module.batch_metrics_logger)
+    description = {"every_n": f"every_n={every_n}", "epsilon": f"epsilon={epsilon}{' (relative)' if relative else ''}",
+                   "summary": "summary"}[policy]
+
+    @contextmanager
+    def batch_metrics_logger(run_id: str, *args, **kwargs):
+        sampler = MetricDownsampler(policy, every_n, epsilon, relative)
+        with BufferedMetricLogger(run_id=run_id) as buffered:
+            buffered.set_tag("autolog.downsample", description)
+            yield _DownsampledMetricsLogger(sampler, buffered)
+            for key, value, step in sampler.finalize():
+                buffered.log_metric(key, value, step=step)
+            buffered.set_tags({"autolog.points_seen": sampler.n_seen, "autolog.points_logged": sampler.n_logged})
+
+    module.batch_metrics_logger = batch_metrics_logger
+
+
+def disable_downsampling(flavor: str = "xgboost"):
+    """downsampled_autolog 이전의 batch_metrics_logger로 복원 (autolog 자체는 유지)"""
+    original = _original_loggers.pop(flavor, None)
+    if original is not None:
+        importlib.import_module(f"mlflow.{flavor}").batch_metrics_logger = original
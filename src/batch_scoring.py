@@ -0,0 +1,168 @@
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.evaluation import StreamingConfusion, aligned_csv_chunks
+from src.model_cache import ModelCache
+
+
+def resolve_candidates(specs: Iterable[Union[str, Dict[str, Any]]], cache: ModelCache) -> List[Tuple[str, str]]:
+    """
+    후보 지정 → [(label, 고정 URI)] (중복 버전 제거, 지정 순서 유지 — 첫 후보가 비교 기준)
+    - 문자열: "models:/iris_xgb@champion", "models:/iris_xgb/Production", "runs:/<id>/model" ...
+    - dict: {"name": "iris_xgb", "stages": ["Production", "Staging"]} / {"name": ..., "aliases": [...]}
+            / {"name": ..., "versions": "all" | [1, 2]}
+    """
+    out: List[Tuple[str, str]] = []
+
+    def add(uri: str):
+        fixed = cache.resolve(uri)
+        if fixed not in [u for _, u in out]:
+            if fixed.startswith("models:/"):
+                label = fixed[len("models:/"):].replace("/", "_v")
+            else:
+                label = f"run_{fixed.split('/')[1][:8]}" if fixed.startswith("runs:/") else fixed
+            label = re.sub(r"[^\w\-.]", "_", label)  # metric key로 쓸 수 있는 문자만
+            out.append((label, fixed))
+
+    for spec in specs:
+        if isinstance(spec, str):
+            add(spec)
+            continue
+        name = spec["name"]
+        for alias in spec.get("aliases", []):
+            add(f"models:/{name}@{alias}")
+        if "stages" in spec or "versions" in spec:
+            versions = sorted(cache.client.search_model_versions(f"name='{name}'"), key=lambda v: -int(v.version))
+            wanted = spec.get("versions")
+            for stage in spec.get("stages", []):
+                for v in versions:
+                    if v.current_stage == stage:
+                        add(f"models:/{name}/{v.version}")
+            if wanted is not None:
+                for v in versions:
+                    if wanted == "all" or int(v.version) in {int(w) for w in wanted}:
+                        add(f"models:/{name}/{v.version}")
+    return out
+
+
+def _schema_key(model) -> str:
+    schema = model.metadata.get_input_schema() if model.metadata is not None else None
+    return json.dumps(schema.to_dict() if schema is not None else None, sort_keys=True)
+
+
+def _convert(X: pd.DataFrame, model) -> pd.DataFrame:
+    """모델 입력 스키마의 컬럼 순서 / dtype으로 한 번 변환 → 이후 pyfunc 스키마 검사는 복사 없이 통과"""
+    schema = model.metadata.get_input_schema() if model.metadata is not None else None
+    if schema is None or not schema.has_input_names():
+        return X
+    names = schema.input_names()
+    dtypes = dict(zip(names, schema.numpy_types()))
+    return X[names].astype(dtypes, copy=False)
+
+
+def score_models(
+    candidates: List[Tuple[str, str]],
+    batches: Iterator[Tuple[pd.DataFrame, np.ndarray]],
+    cache: Optional[ModelCache] = None,
+    max_workers: int = 8,
+    average: str = "macro",
+) -> pd.DataFrame:
+    """
+    모든 후보 모델을 같은 입력 배치로 채점해 비교표(DataFrame, 후보당 한 행)를 반환.
+    - 배치는 한 번만 읽고, 입력 스키마가 같은 모델끼리는 dtype 변환 결과도 공유
+    - 배치마다 후보별 predict를 스레드 풀에서 병렬 실행 (모델 로드도 병렬)
+    - 지표: accuracy / precision / recall / f1 + 배치 지연시간 p50/p95, rows/s, 로드 시간,
+      첫 후보(기준) 대비 예측 일치율 agreement
+    """
+    cache = cache or ModelCache()
+    labels = [label for label, _ in candidates]
+
+    def load(uri: str):
+        t0 = time.perf_counter()
+        model = cache.load(uri)
+        return model, time.perf_counter() - t0
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="score") as pool:
+        loaded = list(pool.map(load, [uri for _, uri in candidates]))
+        models = [m for m, _ in loaded]
+        schema_keys = [_schema_key(m) for m in models]
+
+        confusions = [StreamingConfusion() for _ in models]
+        latencies: List[List[float]] = [[] for _ in models]
+        agree = np.zeros(len(models), dtype=np.int64)
+        n_rows = 0
+
+        def predict(i: int, X: pd.DataFrame):
+            t0 = time.perf_counter()
+            y = np.asarray(models[i].predict(X)).ravel()
+            return y, time.perf_counter() - t0
+
+        for X_batch, y_batch in batches:
+            converted: Dict[str, pd.DataFrame] = {}
+            inputs = []
+            for model, key in zip(models, schema_keys):
+                if key not in converted:
+                    converted[key] = _convert(X_batch, model)
+                inputs.append(converted[key])
+            results = list(pool.map(predict, range(len(models)), inputs))
+            baseline = results[0][0]
+            for i, (y_pred, elapsed) in enumerate(results):
+                confusions[i].update(y_batch, y_pred)
+                latencies[i].append(elapsed)
+                agree[i] += int(np.sum(y_pred == baseline))
+            n_rows += len(X_batch)
+
+    rows = []
+    for i, label in enumerate(labels):
+        lat = np.asarray(latencies[i]) * 1000
+        total_s = float(lat.sum() / 1000)
+        rows.append({
+            "candidate": label,
+            "model_uri": candidates[i][1],
+            **confusions[i].result(average),
+            "agreement": agree[i] / max(n_rows, 1),
+            "load_s": loaded[i][1],
+            "predict_s": total_s,
+            "rows_per_s": n_rows / max(total_s, 1e-9),
+            "batch_p50_ms": float(np.percentile(lat, 50)) if len(lat) else float("nan"),
+            "batch_p95_ms": float(np.percentile(lat, 95)) if len(lat) else float("nan"),
+            "n_rows": n_rows,
+        })
+    return pd.DataFrame(rows)
+
+
+def csv_batches(x_path, y_path, label_col: str = "y_true", batch_size: int = 10_000):
+    """X / y CSV를 batch_size행씩 나란히 읽는 제너레이터 (행 수가 다르면 ValueError — evaluation과 같은 reader)"""
+    return aligned_csv_chunks(x_path, y_path, label_col=label_col, chunksize=batch_size)
+
+
+def log_comparison(table: pd.DataFrame, metric: str = "f1", run_name: str = "champion_challenger",
+                   params: Optional[Dict[str, Any]] = None) -> str:
+    """비교표를 평가 run 하나로 기록 (후보별 metric은 <candidate>/<metric>, 표는 table + CSV 아티팩트)"""
+    import mlflow
+
+    from src.mlflow_utils import BufferedMetricLogger
+
+    best = table.sort_values([metric, "rows_per_s"], ascending=False).iloc[0]
+    with mlflow.start_run(run_name=run_name, tags={"stage": "evaluation", "evaluation.type": "champion_challenger"}) as run:
+        mlflow.log_params({
+            "candidates": ",".join(table["candidate"])[:500],  # param 값 길이 제한
+            "baseline": table["candidate"].iloc[0],
+            "n_rows": int(table["n_rows"].iloc[0]),
+            **(params or {}),
+        })
+        with BufferedMetricLogger(run_id=run.info.run_id) as logger:
+            for _, row in table.iterrows():
+                for col in ("accuracy", "precision", "recall", "f1", "agreement", "load_s", "predict_s",
+                            "rows_per_s", "batch_p50_ms", "batch_p95_ms"):
+                    logger.log_metric(f"{row['candidate']}/{col}", float(row[col]))
+            logger.set_tags({"winner": best["candidate"], "winner_uri": best["model_uri"], "selection_metric": metric})
+        mlflow.log_table(table, artifact_file="comparison/table.json")
+        mlflow.log_text(table.to_csv(index=False), "comparison/table.csv")
+        return run.info.run_id
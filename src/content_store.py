@@ -0,0 +1,232 @@
+import hashlib
+import json
+import os
+import posixpath
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.lazy import lazy_import
+
+mlflow = lazy_import("mlflow")
+
+MANIFEST_FILE = "cas_manifest.json"
+DEFAULT_CACHE_DIR = Path(os.getenv("CAS_CACHE_DIR", Path.home() / ".cache" / "mlflow-study" / "cas"))
+
+
+def file_sha256(path: os.PathLike) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def default_root(artifact_uri: str) -> str:
+    """
+    run artifact URI(<experiment location>/<run_id>/artifacts)에서 공유 blob 저장소 위치를 유도.
+    예) s3://mlflow/1/<run_id>/artifacts → s3://mlflow/cas
+    """
+    return posixpath.join(artifact_uri.rstrip("/").rsplit("/", 3)[0], "cas")
+
+
+def blob_path(digest: str) -> str:
+    return f"blobs/{digest[:2]}/{digest}"
+
+
+def is_manifest_dir(local_dir: os.PathLike) -> bool:
+    return (Path(local_dir) / MANIFEST_FILE).exists()
+
+
+class ContentStore:
+    """
+    내용 주소(content-addressed) 모델 아티팩트 저장소.
+    - log_model_dir(): 파일마다 sha256을 계산해 공유 저장소(root/blobs/ab/<sha256>)에 없는 blob만 업로드하고,
+      run에는 "상대경로 → sha256" manifest(cas_manifest.json)만 기록
+    - materialize(): manifest를 읽어 로컬 blob 캐시에서 모델 디렉터리를 재구성 (없는 blob만 다운로드)
+    - root 기본값: CAS_ROOT_URI 환경변수, 없으면 run artifact URI의 실험 위치 옆 cas/
+    - 주의: run에는 manifest만 있으므로 mlflow.pyfunc.load_model 대신 src.model_cache.load_model로 로드
+      (blob은 여러 run이 공유 → run 삭제 시 자동으로 지워지지 않음)
+    - registry에는 manifest를 등록하지 않음: 등록할 때 registrable_source()로 전체 모델 위치를 얻음
+    """
+
+    def __init__(
+        self,
+        root_uri: Optional[str] = None,
+        client=None,
+        max_workers: int = 8,
+        cache_dir: Optional[os.PathLike] = None,
+    ):
+        self.root_uri = root_uri or os.getenv("CAS_ROOT_URI")
+        self._client = client
+        self.max_workers = max_workers
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self._lock = threading.Lock()
+        self._known: Dict[str, set] = {}  # root → 업로드가 확인된 digest
+        self._stats = {"files": 0, "bytes": 0, "uploaded_blobs": 0, "uploaded_bytes": 0, "reused_blobs": 0}
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = mlflow.tracking.MlflowClient()
+        return self._client
+
+    def _root_for(self, artifact_uri: str) -> str:
+        return self.root_uri or default_root(artifact_uri)
+
+    def _repo(self, root: str):
+        from mlflow.store.artifact.artifact_repository_registry import get_artifact_repository
+
+        return get_artifact_repository(root)
+
+    # ---- 알려진 blob (로컬 기록 + 원격 조회) ----
+    def _known_path(self, root: str) -> Path:
+        key = hashlib.sha256(root.encode()).hexdigest()[:16]
+        return self.cache_dir / "known" / f"{key}.txt"
+
+    def _load_known(self, root: str) -> set:
+        with self._lock:
+            if root not in self._known:
+                path = self._known_path(root)
+                self._known[root] = set(path.read_text().split()) if path.exists() else set()
+            return self._known[root]
+
+    def _remember(self, root: str, digests):
+        path = self._known_path(root)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._known[root].update(digests)
+            with open(path, "a") as f:
+                f.writelines(f"{d}\n" for d in digests)
+
+    def _remote_existing(self, root: str, digests) -> set:
+        """shard 디렉터리(blobs/ab/) 단위로 list_artifacts → digest당 HEAD 요청 대신 shard당 한 번"""
+        repo = self._repo(root)
+        found = set()
+        for shard in sorted({d[:2] for d in digests}):
+            try:
+                found.update(posixpath.basename(f.path) for f in repo.list_artifacts(f"blobs/{shard}"))
+            except Exception:
+                pass  # shard가 아직 없음
+        return found & set(digests)
+
+    # ---- 기록 ----
+    def log_model_dir(self, local_dir: os.PathLike, run_id: str, artifact_path: str = "model") -> Dict[str, Any]:
+        """로컬 모델 디렉터리를 blob + manifest로 기록하고 manifest를 반환"""
+        local_dir = Path(local_dir)
+        root = self._root_for(self.client.get_run(run_id).info.artifact_uri)
+
+        files = {}
+        for f in sorted(p for p in local_dir.rglob("*") if p.is_file()):
+            files[f.relative_to(local_dir).as_posix()] = {"sha256": file_sha256(f), "size": f.stat().st_size}
+        by_digest = {meta["sha256"]: local_dir / rel for rel, meta in files.items()}
+
+        known = self._load_known(root)
+        unknown = [d for d in by_digest if d not in known]
+        existing = self._remote_existing(root, unknown) if unknown else set()
+        missing = [d for d in unknown if d not in existing]
+
+        repo = self._repo(root)
+
+        def upload(digest: str):
+            # blob 이름 = digest가 되도록 임시 디렉터리에 이름을 바꿔 링크/복사 후 업로드
+            with tempfile.TemporaryDirectory() as tmp:
+                staged = os.path.join(tmp, digest)
+                try:
+                    os.link(by_digest[digest], staged)
+                except OSError:
+                    shutil.copyfile(by_digest[digest], staged)
+                repo.log_artifact(staged, posixpath.dirname(blob_path(digest)))
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="cas-upload") as pool:
+                list(pool.map(upload, missing))
+        self._remember(root, existing | set(missing))
+
+        manifest = {"version": 1, "root": root, "files": files}
+        self.client.log_dict(run_id, manifest, posixpath.join(artifact_path, MANIFEST_FILE))
+        self.client.set_tag(run_id, "cas.artifact_path", artifact_path)
+
+        uploaded_bytes = sum(by_digest[d].stat().st_size for d in missing)
+        with self._lock:
+            self._stats["files"] += len(files)
+            self._stats["bytes"] += sum(m["size"] for m in files.values())
+            self._stats["uploaded_blobs"] += len(missing)
+            self._stats["uploaded_bytes"] += uploaded_bytes
+            self._stats["reused_blobs"] += len(by_digest) - len(missing)
+        return manifest
+
+    def log_model(self, flavor, model, artifact_path: str = "model", run_id: Optional[str] = None, **save_kwargs):
+        """flavor.save_model(model, tmp, **save_kwargs) → log_model_dir (fluent log_model 대체)"""
+        if run_id is None:
+            active = mlflow.active_run()
+            if active is None:
+                raise RuntimeError("No active run. Pass run_id or call inside mlflow.start_run().")
+            run_id = active.info.run_id
+        with tempfile.TemporaryDirectory() as tmp:
+            model_dir = os.path.join(tmp, "model")
+            flavor.save_model(model, model_dir, **save_kwargs)
+            return self.log_model_dir(model_dir, run_id, artifact_path)
+
+    def registrable_source(self, run_id: str, artifact_path: str = "model") -> str:
+        """
+        registry에 등록할 source URI.
+        - run의 artifact_path가 CAS manifest면 전체 모델로 재구성해 <artifact_path>_full/에 한 번 업로드하고 그 위치를 반환
+          (manifest만 가리키는 버전은 mlflow.pyfunc.load_model / `mlflow models serve`로 열 수 없음)
+        - 일반 모델이면 artifact_path 위치를 그대로 반환
+        """
+        run = self.client.get_run(run_id)
+        source = posixpath.join(run.info.artifact_uri, artifact_path)
+        if run.data.tags.get("cas.artifact_path") != artifact_path:
+            return source
+        full_path = f"{artifact_path}_full"
+        if self.client.list_artifacts(run_id, full_path):  # 이전 등록 때 이미 재구성
+            return posixpath.join(run.info.artifact_uri, full_path)
+        with tempfile.TemporaryDirectory() as tmp:
+            local = mlflow.artifacts.download_artifacts(run_id=run_id, artifact_path=artifact_path, dst_path=tmp)
+            if not is_manifest_dir(local):
+                return source
+            model_dir = self.materialize(local, Path(tmp) / "full")
+            self.client.log_artifacts(run_id, str(model_dir), artifact_path=full_path)
+        return posixpath.join(run.info.artifact_uri, full_path)
+
+    # ---- 복원 ----
+    def _fetch_blob(self, root: str, digest: str) -> Path:
+        local = self.cache_dir / "blobs" / digest[:2] / digest
+        if local.exists():
+            return local
+        local.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=local.parent) as tmp:
+            path = Path(self._repo(root).download_artifacts(blob_path(digest), tmp))
+            if file_sha256(path) != digest:
+                raise RuntimeError(f"CAS blob {digest} is corrupted.")
+            os.replace(path, local)
+        return local
+
+    def materialize(self, manifest_dir: os.PathLike, dst: os.PathLike) -> Path:
+        """manifest가 있는 디렉터리(다운로드한 run 아티팩트)를 실제 모델 디렉터리로 재구성"""
+        manifest = json.loads((Path(manifest_dir) / MANIFEST_FILE).read_text())
+        root = self.root_uri or manifest["root"]
+        dst = Path(dst)
+        digests = sorted({m["sha256"] for m in manifest["files"].values()})
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="cas-download") as pool:
+            blobs = dict(zip(digests, pool.map(lambda d: self._fetch_blob(root, d), digests)))
+        for rel, meta in manifest["files"].items():
+            target = dst / rel
+            target.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.link(blobs[meta["sha256"]], target)  # 같은 파일시스템이면 복사 없이 하드링크
+            except OSError:
+                shutil.copyfile(blobs[meta["sha256"]], target)
+        return dst
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+
+def cas_enabled() -> bool:
+    return os.getenv("CAS_MODELS", "").lower() in {"1", "true", "yes"}
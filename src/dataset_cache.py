@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_CACHE_DIR = Path(os.getenv("DATASET_CACHE_DIR", Path.home() / ".cache" / "mlflow-study" / "datasets"))
+SPLIT_NAMES = ("X_tr", "X_te", "y_tr", "y_te")
+
+
+def fingerprint(source: str, split_params: Dict[str, Any], source_version: Optional[str] = None) -> str:
+    """데이터 출처 + split 파라미터(test_size, random_state, stratify ...)로 만든 sha256"""
+    payload = json.dumps(
+        {"source": source, "source_version": source_version, "split": split_params},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def file_fingerprint(path: os.PathLike) -> str:
+    """파일 기반 데이터셋이면 내용 해시를 source_version으로 사용"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class DatasetSplit:
+    """train/test split 결과 + fingerprint (X_tr, X_te: DataFrame / y_tr, y_te: Series)"""
+
+    def __init__(self, X_tr, X_te, y_tr, y_te, fingerprint: str, source: str, cache_hit: bool):
+        self.X_tr, self.X_te, self.y_tr, self.y_te = X_tr, X_te, y_tr, y_te
+        self.fingerprint = fingerprint
+        self.source = source
+        self.cache_hit = cache_hit
+
+    def __iter__(self):
+        # X_tr, X_te, y_tr, y_te = split 처럼 언패킹 가능 (train_test_split과 같은 순서)
+        return iter((self.X_tr, self.X_te, self.y_tr, self.y_te))
+
+
+def _save_frame(obj, path: Path):
+    import pandas as pd
+
+    path.mkdir(parents=True)
+    frame = obj.to_frame() if isinstance(obj, pd.Series) else obj
+    meta = {"kind": "series" if isinstance(obj, pd.Series) else "frame", "columns": [], "name": getattr(obj, "name", None)}
+    index = frame.index.to_numpy()
+    np.save(path / "index.npy", index, allow_pickle=index.dtype == object)
+    meta["index_mmap"] = index.dtype != object
+    for i, col in enumerate(frame.columns):
+        arr = frame[col].to_numpy()
+        mmap = arr.dtype != object
+        np.save(path / f"c{i}.npy", arr, allow_pickle=not mmap)
+        meta["columns"].append({"name": col, "file": f"c{i}.npy", "mmap": mmap})
+    (path / "meta.json").write_text(json.dumps(meta, default=str))
+
+
+def _load_frame(path: Path):
+    import pandas as pd
+
+    meta = json.loads((path / "meta.json").read_text())
+    if meta.get("index_mmap", True):
+        index = pd.Index(np.load(path / "index.npy", mmap_mode="r"))
+    else:
+        index = pd.Index(np.load(path / "index.npy", allow_pickle=True))
+    cols = {}
+    for c in meta["columns"]:
+        if c["mmap"]:
+            cols[c["name"]] = np.load(path / c["file"], mmap_mode="r")  # 복사 없이 페이지 캐시 공유
+        else:
+            cols[c["name"]] = np.load(path / c["file"], allow_pickle=True)
+    frame = pd.DataFrame(cols, index=index, copy=False)
+    if meta["kind"] == "series":
+        s = frame.iloc[:, 0]
+        s.name = meta["name"]
+        return s
+    return frame
+
+
+def cached_split(
+    source: str,
+    loader: Callable[[], Tuple[Any, Any]],
+    test_size: float = 0.2,
+    random_state: int = 42,
+    stratify: bool = True,
+    source_version: Optional[str] = None,
+    cache_dir: Optional[os.PathLike] = None,
+) -> DatasetSplit:
+    """
+    loader() -> (X DataFrame, y Series) 결과를 train_test_split한 뒤 컬럼별 .npy로 캐시.
+    - 키: fingerprint(source, split 파라미터, source_version)
+    - 적중 시 loader / train_test_split을 건너뛰고 np.load(mmap_mode="r")로 zero-copy 로드
+    """
+    split_params = {"test_size": test_size, "random_state": random_state, "stratify": stratify}
+    fp = fingerprint(source, split_params, source_version)
+    root = Path(cache_dir or DEFAULT_CACHE_DIR)
+    target = root / fp
+
+    if (target / "COMPLETE").exists():
+        parts = [_load_frame(target / name) for name in SPLIT_NAMES]
+        return DatasetSplit(*parts, fingerprint=fp, source=source, cache_hit=True)
+
+    from sklearn.model_selection import train_test_split
+
+    X, y = loader()
+    parts = train_test_split(
+        X, y, test_size=test_size, random_state=random_state, stratify=y if stratify else None
+    )
+
+    # 임시 디렉터리에 쓰고 rename → 동시에 여러 스크립트가 만들어도 깨진 캐시가 남지 않음
+    root.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(dir=root, prefix=f".{fp[:8]}-"))
+    try:
+        for name, part in zip(SPLIT_NAMES, parts):
+            _save_frame(part, tmp / name)
+        (tmp / "meta.json").write_text(json.dumps({"source": source, "split": split_params}))
+        (tmp / "COMPLETE").touch()
+        try:
+            os.rename(tmp, target)
+        except OSError:
+            pass  # 다른 프로세스가 먼저 만든 경우
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    if (target / "COMPLETE").exists():
+        parts = [_load_frame(target / name) for name in SPLIT_NAMES]
+    return DatasetSplit(*parts, fingerprint=fp, source=source, cache_hit=False)
+
+
+def load_iris_split(test_size: float = 0.2, random_state: int = 42, stratify: bool = True) -> DatasetSplit:
+    """튜토리얼 공통: load_iris(as_frame=True) + train_test_split 캐시 버전"""
+    import sklearn
+
+    def loader():
+        from sklearn.datasets import load_iris
+
+        return load_iris(return_X_y=True, as_frame=True)
+
+    return cached_split(
+        "sklearn.datasets.load_iris",
+        loader,
+        test_size=test_size,
+        random_state=random_state,
+        stratify=stratify,
+        source_version=sklearn.__version__,
+    )
+
+
+def log_dataset_inputs(split: DatasetSplit, name: Optional[str] = None, run_id: Optional[str] = None):
+    """
+    active run(또는 run_id)에 train / eval 데이터셋을 input으로 기록 (digest = fingerprint → lineage 추적).
+    - run_id: fluent active run 없이 client로 기록 (예: 종료하지 않고 열어 두는 공유 parent run)
+    """
+    import mlflow
+    import pandas as pd
+    from mlflow.entities import DatasetInput, InputTag
+
+    name = name or split.source.rsplit(".", 1)[-1]
+    digest = split.fingerprint[:32]
+    inputs = []
+    for context, X, y in (("training", split.X_tr, split.y_tr), ("evaluation", split.X_te, split.y_te)):
+        target = y.name or "target"
+        df = pd.concat([X, y.rename(target)], axis=1)
+        dataset = mlflow.data.from_pandas(df, targets=target, name=f"{name}_{context}", digest=digest)
+        tags = {"fingerprint": split.fingerprint, "source": split.source}
+        if run_id is None:
+            mlflow.log_input(dataset, context=context, tags=tags)
+        else:
+            # fluent log_input과 같은 형태 (context는 mlflow.data.context 태그)
+            input_tags = [InputTag("mlflow.data.context", context)] + [InputTag(k, v) for k, v in tags.items()]
+            inputs.append(DatasetInput(dataset._to_mlflow_entity(), input_tags))
+    if inputs:
+        mlflow.tracking.MlflowClient().log_inputs(run_id, datasets=inputs)
@@ -0,0 +1,127 @@
+import time
+from itertools import zip_longest
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from src.metrics import metrics_from_confusion
+
+
+class StreamingConfusion:
+    """
+    청크 단위로 혼동행렬을 누적하는 accumulator (메모리 사용량은 클래스 수 K에만 비례).
+    - 처음 보는 라벨이 나오면 행렬을 확장
+    - result()는 get_metrics와 같은 accuracy / precision / recall / f1을 반환
+    """
+
+    def __init__(self):
+        self.labels: list = []
+        self._index: Dict[Any, int] = {}
+        self.cm = np.zeros((0, 0), dtype=np.int64)
+        self.n = 0
+
+    def update(self, y_true, y_pred):
+        y_true = np.asarray(y_true).ravel()
+        y_pred = np.asarray(y_pred).ravel()
+        if len(y_true) != len(y_pred):
+            raise ValueError(f"length mismatch: y_true={len(y_true)}, y_pred={len(y_pred)}")
+
+        for label in np.unique(np.concatenate([y_true, y_pred])):
+            label = label.item() if hasattr(label, "item") else label
+            if label not in self._index:
+                self._index[label] = len(self.labels)
+                self.labels.append(label)
+        k = len(self.labels)
+        if self.cm.shape[0] < k:
+            grown = np.zeros((k, k), dtype=np.int64)
+            grown[: self.cm.shape[0], : self.cm.shape[1]] = self.cm
+            self.cm = grown
+
+        # 청크 내부는 bincount 한 번으로 집계
+        chunk_labels = np.asarray(self.labels)
+        order = np.argsort(chunk_labels)
+        sorted_labels = chunk_labels[order]
+        t = order[np.searchsorted(sorted_labels, y_true)]
+        p = order[np.searchsorted(sorted_labels, y_pred)]
+        self.cm += np.bincount(t * k + p, minlength=k * k).reshape(k, k)
+        self.n += len(y_true)
+
+    def result(self, average: Optional[str] = "macro", pos_label=1) -> Dict[str, Any]:
+        # 라벨 정렬 순서로 맞춰서 계산 (binary의 pos_label 해석 / 클래스별 출력 순서를 sklearn과 동일하게)
+        order = np.argsort(np.asarray(self.labels))
+        cm = self.cm[np.ix_(order, order)]
+        labels = np.asarray(self.labels)[order]
+        m = metrics_from_confusion(cm, average, labels=labels, pos_label=pos_label)
+        if average is None:
+            return {"accuracy": float(m["accuracy"]), **{k: m[k] for k in ("precision", "recall", "f1")}}
+        return {k: float(v) for k, v in m.items()}
+
+
+_MISSING = object()
+
+
+def aligned_csv_chunks(x_path, y_path, label_col: str = "y_true",
+                       chunksize: int = 100_000) -> Iterator[Tuple[Any, np.ndarray]]:
+    """
+    X / y CSV를 chunksize행씩 나란히 읽는 제너레이터 → (X DataFrame, y 배열).
+    - 두 파일의 행 수가 다르면(어느 쪽이 먼저 끝나든) ValueError
+    """
+    import pandas as pd
+
+    x_iter = pd.read_csv(x_path, chunksize=chunksize)
+    y_iter = pd.read_csv(y_path, chunksize=chunksize, usecols=[label_col])
+    # zip은 짧은 쪽에서 멈추면서 긴 쪽의 청크를 하나 버리므로 zip_longest로 끝까지 맞춰 봄
+    for step, (x_chunk, y_chunk) in enumerate(zip_longest(x_iter, y_iter, fillvalue=_MISSING)):
+        if x_chunk is _MISSING or y_chunk is _MISSING or len(x_chunk) != len(y_chunk):
+            raise ValueError(f"chunk {step}: X and y files have different numbers of rows.")
+        yield x_chunk, y_chunk[label_col].to_numpy()
+
+
+def evaluate_streaming(
+    model,
+    x_path,
+    y_path,
+    label_col: str = "y_true",
+    chunksize: int = 100_000,
+    average: str = "macro",
+    run_id: Optional[str] = None,
+    metric_prefix: str = "eval_",
+) -> Dict[str, Any]:
+    """
+    X / y CSV를 같은 크기의 청크로 나란히 읽으면서 predict → 혼동행렬 누적.
+    - 메모리 사용량은 chunksize에 비례 (전체 테스트셋을 한 번에 올리지 않음)
+    - run_id가 주어지면 청크별 처리량(rows/s)과 predict 시간을 step별 metric으로,
+      최종 metric을 {metric_prefix}accuracy 등으로 기록 (BufferedMetricLogger 사용)
+    """
+    logger = None
+    if run_id is not None:
+        from src.mlflow_utils import BufferedMetricLogger
+
+        logger = BufferedMetricLogger(run_id=run_id)
+
+    acc = StreamingConfusion()
+    start = time.perf_counter()
+    try:
+        for step, (x_chunk, y_true) in enumerate(aligned_csv_chunks(x_path, y_path, label_col, chunksize)):
+            t0 = time.perf_counter()
+            y_pred = model.predict(x_chunk)
+            predict_s = time.perf_counter() - t0
+            acc.update(y_true, y_pred)
+            if logger is not None:
+                logger.log_metrics(
+                    {
+                        f"{metric_prefix}chunk_rows_per_s": len(x_chunk) / max(predict_s, 1e-9),
+                        f"{metric_prefix}chunk_predict_ms": predict_s * 1000,
+                    },
+                    step=step,
+                )
+
+        result = acc.result(average)
+        elapsed = time.perf_counter() - start
+        result.update({"n_rows": acc.n, "elapsed_s": elapsed, "rows_per_s": acc.n / max(elapsed, 1e-9)})
+        if logger is not None:
+            logger.log_metrics({f"{metric_prefix}{k}": v for k, v in result.items() if np.isscalar(v)})
+        return result
+    finally:
+        if logger is not None:
+            logger.close()
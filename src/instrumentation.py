@@ -0,0 +1,357 @@
+import atexit
+import contextvars
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+# 감싸는 대상: 튜토리얼에서 사용하는 fluent API / MlflowClient 메서드
+FLUENT_FUNCS = (
+    "set_experiment", "start_run", "log_metric", "log_metrics", "log_param", "log_params", "set_tag", "set_tags",
+    "log_artifact", "log_artifacts", "log_text", "log_dict", "log_table", "log_image", "log_input",
+    "search_runs", "get_artifact_uri",
+)
+FLAVOR_FUNCS = {
+    "mlflow.sklearn": ("log_model", "save_model", "autolog"),
+    "mlflow.xgboost": ("log_model", "save_model", "autolog"),
+    "mlflow.pyfunc": ("load_model",),
+    "mlflow.artifacts": ("download_artifacts",),
+}
+CLIENT_METHODS = (
+    "get_experiment_by_name", "create_experiment", "get_run", "create_run", "set_terminated", "search_runs",
+    "log_batch", "log_metric", "log_param", "set_tag", "log_artifact", "log_artifacts", "get_metric_history",
+    "download_artifacts", "create_registered_model", "create_model_version", "search_model_versions",
+    "get_latest_versions", "transition_model_version_stage", "set_registered_model_alias",
+    "get_model_version_by_alias", "delete_registered_model_alias",
+)
+REGISTRY_CALLS = {
+    "create_registered_model", "create_model_version", "search_model_versions", "get_latest_versions",
+    "transition_model_version_stage", "set_registered_model_alias", "get_model_version_by_alias",
+    "delete_registered_model_alias",
+}
+ARTIFACT_CALLS = {
+    "log_artifact", "log_artifacts", "log_text", "log_dict", "log_table", "log_image", "log_model", "save_model",
+    "load_model", "download_artifacts",
+}
+# 로컬 파일 / 디렉터리 크기로 payload를 잴 인자 이름 (그 외 문자열은 경로로 보지 않음)
+PATH_PARAMS = ("local_path", "local_dir")
+# rest_utils.http_request를 `from ... import http_request`로 가져가 쓰는 모듈 (이 참조도 교체해야 집계됨)
+HTTP_REQUEST_MODULES = (
+    "mlflow.store.artifact.http_artifact_repo",
+    "mlflow.store.artifact.presigned_url_artifact_repo",
+    "mlflow.store.artifact.databricks_artifact_repo",
+)
+
+_current_call: contextvars.ContextVar = contextvars.ContextVar("mlflow_instrumented_call", default=None)
+_suspended: contextvars.ContextVar = contextvars.ContextVar("mlflow_instrumentation_suspended", default=False)
+
+
+def _category(name: str) -> str:
+    short = name.rsplit(".", 1)[-1]
+    if short in REGISTRY_CALLS:
+        return "registry"
+    if short in ARTIFACT_CALLS:
+        return "artifact"
+    return "tracking"
+
+
+def _payload_bytes(sig: Optional[inspect.Signature], args, kwargs) -> int:
+    """요청 크기 추정: PATH_PARAMS 인자는 로컬 파일/디렉터리 크기, 그 외에는 인자를 JSON으로 직렬화한 크기"""
+    try:
+        named = sig.bind_partial(*args, **kwargs).arguments if sig is not None else None
+    except TypeError:
+        named = None
+    if named is None:
+        named = {str(i): v for i, v in enumerate(args)}
+        named.update(kwargs)
+    size = 0
+    for k, v in named.items():
+        if k == "self":
+            continue
+        if k in PATH_PARAMS and isinstance(v, (str, os.PathLike)):
+            if os.path.isdir(v):
+                size += sum(os.path.getsize(os.path.join(r, f)) for r, _, fs in os.walk(v) for f in fs)
+            elif os.path.isfile(v):
+                size += os.path.getsize(v)
+        else:
+            try:
+                size += len(json.dumps(v, default=str))
+            except (TypeError, ValueError):
+                pass
+    return size
+
+
+def _caller() -> str:
+    """mlflow / 이 모듈 밖의 첫 호출 위치 (파일:라인)"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        fname = frame.f_code.co_filename
+        if "mlflow" + os.sep not in fname and not fname.endswith("instrumentation.py"):
+            return f"{os.path.relpath(fname)}:{frame.f_lineno}"
+        frame = frame.f_back
+    return "?"
+
+
+class CallProfiler:
+    """
+    MLflow 호출별 지연시간 / payload 크기 / HTTP 요청·재시도 횟수 / 호출 위치 기록.
+    - 중첩 호출(fluent → client → REST)은 가장 바깥 호출 하나로만 집계
+    - attach_to_run(): run에 call_profile.json 아티팩트 + mlflow_time_* metric 기록
+    - export_prometheus() / export_spans(): Prometheus text / OpenTelemetry 스타일 JSON span
+    """
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self.trace_id = uuid.uuid4().hex
+
+    def wrap(self, name: str, fn):
+        profiler = self
+        try:
+            sig = inspect.signature(fn)
+        except (TypeError, ValueError):
+            sig = None
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _suspended.get() or _current_call.get() is not None:
+                return fn(*args, **kwargs)  # 중첩 호출 / 프로파일 자체 기록은 집계하지 않음
+            rec = {
+                "name": name,
+                "category": _category(name),
+                "caller": _caller(),
+                "payload_bytes": _payload_bytes(sig, args, kwargs),
+                "http_requests": 0,
+                "retries": 0,
+                "thread": threading.current_thread().name,
+                "span_id": uuid.uuid4().hex[:16],
+            }
+            token = _current_call.set(rec)
+            rec["start_ns"] = time.time_ns()
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except BaseException as e:
+                rec["error"] = type(e).__name__
+                raise
+            finally:
+                rec["duration_ms"] = (time.perf_counter() - t0) * 1000
+                rec["end_ns"] = rec["start_ns"] + int(rec["duration_ms"] * 1e6)
+                _current_call.reset(token)
+                with profiler._lock:
+                    profiler.records.append(rec)
+
+        wrapper.__wrapped_by_profiler__ = True
+        return wrapper
+
+    # ---- 집계 / 내보내기 ----
+    def summary(self, records: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Dict[str, Any]]:
+        import numpy as np
+
+        groups = defaultdict(list)
+        for r in records if records is not None else list(self.records):
+            groups[r["name"]].append(r)
+        out = {}
+        for name, rs in sorted(groups.items()):
+            d = np.array([r["duration_ms"] for r in rs])
+            out[name] = {
+                "category": rs[0]["category"],
+                "count": len(rs),
+                "total_ms": float(d.sum()),
+                "p50_ms": float(np.percentile(d, 50)),
+                "p95_ms": float(np.percentile(d, 95)),
+                "payload_bytes": int(sum(r["payload_bytes"] for r in rs)),
+                "http_requests": int(sum(r["http_requests"] for r in rs)),
+                "retries": int(sum(r["retries"] for r in rs)),
+                "errors": sum(1 for r in rs if "error" in r),
+                "callers": sorted({r["caller"] for r in rs})[:10],
+            }
+        return out
+
+    def attach_to_run(self, run_id: str, since: int = 0, wall_time_s: Optional[float] = None):
+        """records[since:]의 프로파일을 run에 기록 (이 기록 자체는 집계에서 제외)"""
+        from mlflow.entities import Metric
+        from mlflow.tracking import MlflowClient
+
+        records = self.records[since:]
+        if not records:
+            return
+        token = _suspended.set(True)
+        try:
+            summary = self.summary(records)
+            by_cat = defaultdict(float)
+            for s in summary.values():
+                by_cat[s["category"]] += s["total_ms"] / 1000
+            ts = int(time.time() * 1000)
+            metrics = {f"mlflow_time_{c}_s": v for c, v in by_cat.items()}
+            metrics["mlflow_time_total_s"] = sum(by_cat.values())
+            metrics["mlflow_calls"] = float(len(records))
+            if wall_time_s:
+                metrics["mlflow_time_fraction"] = metrics["mlflow_time_total_s"] / wall_time_s
+            client = MlflowClient()
+            client.log_batch(run_id, metrics=[Metric(k, float(v), ts, 0) for k, v in metrics.items()])
+            client.log_dict(run_id, {"summary": summary, "wall_time_s": wall_time_s}, "profiling/call_profile.json")
+        finally:
+            _suspended.reset(token)
+
+    def export_prometheus(self, path: str):
+        lines = [
+            "# HELP mlflow_client_call_duration_seconds Latency of MLflow client calls",
+            "# TYPE mlflow_client_call_duration_seconds summary",
+        ]
+        for name, s in self.summary().items():
+            labels = f'method="{name}",category="{s["category"]}"'
+            lines += [
+                f'mlflow_client_call_duration_seconds{{{labels},quantile="0.5"}} {s["p50_ms"] / 1000:.6f}',
+                f'mlflow_client_call_duration_seconds{{{labels},quantile="0.95"}} {s["p95_ms"] / 1000:.6f}',
+                f"mlflow_client_call_duration_seconds_sum{{{labels}}} {s['total_ms'] / 1000:.6f}",
+                f"mlflow_client_call_duration_seconds_count{{{labels}}} {s['count']}",
+                f"mlflow_client_call_payload_bytes_total{{{labels}}} {s['payload_bytes']}",
+                f"mlflow_client_call_retries_total{{{labels}}} {s['retries']}",
+            ]
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, path)
+
+    def export_spans(self, path: str, service_name: str = "mlflow-study"):
+        def attr(k, v):
+            key = "intValue" if isinstance(v, int) else "stringValue"
+            return {"key": k, "value": {key: v if isinstance(v, int) else str(v)}}
+
+        spans = [
+            {
+                "traceId": self.trace_id,
+                "spanId": r["span_id"],
+                "name": r["name"],
+                "kind": 3,  # SPAN_KIND_CLIENT
+                "startTimeUnixNano": str(r["start_ns"]),
+                "endTimeUnixNano": str(r["end_ns"]),
+                "attributes": [
+                    attr("mlflow.category", r["category"]),
+                    attr("code.caller", r["caller"]),
+                    attr("payload.bytes", r["payload_bytes"]),
+                    attr("http.requests", r["http_requests"]),
+                    attr("http.retries", r["retries"]),
+                    attr("thread.name", r["thread"]),
+                ],
+                "status": {"code": 2 if "error" in r else 1},
+            }
+            for r in list(self.records)
+        ]
+        payload = {"resourceSpans": [{
+            "resource": {"attributes": [attr("service.name", service_name)]},
+            "scopeSpans": [{"scope": {"name": "src.instrumentation"}, "spans": spans}],
+        }]}
+        with open(path, "w") as f:
+            json.dump(payload, f)
+
+
+_profiler: Optional[CallProfiler] = None
+
+
+def _patch(owner, attr: str, name: str, profiler: CallProfiler):
+    fn = getattr(owner, attr, None)
+    if fn is None or getattr(fn, "__wrapped_by_profiler__", False):
+        return
+    setattr(owner, attr, profiler.wrap(name, fn))
+
+
+def enable_instrumentation(attach_profiles: bool = True) -> CallProfiler:
+    """
+    MLflow fluent API / flavor 함수 / MlflowClient 메서드를 감싸 호출마다 기록 (opt-in, 한 번만 적용).
+    - attach_profiles=True: fluent run이 끝날 때(end_run) 그 run 동안의 호출 프로파일을 run에 기록
+    - 환경변수 MLFLOW_INSTRUMENT_PROM / MLFLOW_INSTRUMENT_SPANS 경로가 있으면 종료 시 해당 파일로 내보냄
+    - 주의: `from mlflow import log_metric`처럼 이 함수 호출 이전에 이름을 직접 가져온 경우는 감싸지지 않음
+    """
+    global _profiler
+    if _profiler is not None:
+        return _profiler
+    import importlib
+
+    import mlflow
+    import mlflow.tracking.fluent as fluent
+    from mlflow.tracking import MlflowClient
+    from mlflow.utils import rest_utils
+
+    profiler = CallProfiler()
+    for fname in FLUENT_FUNCS:
+        _patch(mlflow, fname, f"mlflow.{fname}", profiler)
+    for module_name, funcs in FLAVOR_FUNCS.items():
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            continue
+        for fname in funcs:
+            _patch(module, fname, f"{module_name}.{fname}", profiler)
+    for mname in CLIENT_METHODS:
+        _patch(MlflowClient, mname, f"MlflowClient.{mname}", profiler)
+
+    # REST 호출마다 현재 (가장 바깥) 호출에 HTTP 요청 수 / urllib3 재시도 횟수를 누적
+    original_http_request = rest_utils.http_request
+
+    @functools.wraps(original_http_request)
+    def http_request(*args, **kwargs):
+        resp = original_http_request(*args, **kwargs)
+        rec = _current_call.get()
+        if rec is not None:
+            rec["http_requests"] += 1
+            retries = getattr(getattr(resp, "raw", None), "retries", None)
+            rec["retries"] += len(getattr(retries, "history", ()) or ())
+        return resp
+
+    rest_utils.http_request = http_request
+    # 아티팩트 저장소 모듈은 import 시점의 http_request를 들고 있으므로 그 참조도 교체
+    for module_name in HTTP_REQUEST_MODULES:
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            continue
+        if getattr(module, "http_request", None) is original_http_request:
+            module.http_request = http_request
+
+    if attach_profiles:
+        run_marks: Dict[str, Any] = {}
+        original_end_run = fluent.end_run
+        original_start_run = mlflow.start_run
+
+        @functools.wraps(original_start_run)
+        def start_run(*args, **kwargs):
+            run = original_start_run(*args, **kwargs)
+            run_marks[run.info.run_id] = (len(profiler.records), time.perf_counter())
+            return run
+
+        @functools.wraps(original_end_run)
+        def end_run(*args, **kwargs):
+            active = mlflow.active_run()
+            if active is not None and active.info.run_id in run_marks:
+                since, t0 = run_marks.pop(active.info.run_id)
+                try:
+                    profiler.attach_to_run(active.info.run_id, since=since, wall_time_s=time.perf_counter() - t0)
+                except Exception as e:
+                    print(f"[instrumentation] failed to attach profile: {e}", file=sys.stderr)
+            return original_end_run(*args, **kwargs)
+
+        mlflow.start_run = fluent.start_run = start_run
+        # ActiveRun.__exit__는 fluent 모듈의 end_run을 호출하므로 양쪽 모두 교체
+        mlflow.end_run = fluent.end_run = end_run
+
+    prom_path = os.getenv("MLFLOW_INSTRUMENT_PROM")
+    spans_path = os.getenv("MLFLOW_INSTRUMENT_SPANS")
+    if prom_path:
+        atexit.register(profiler.export_prometheus, prom_path)
+    if spans_path:
+        atexit.register(profiler.export_spans, spans_path)
+
+    _profiler = profiler
+    return profiler
+
+
+def get_profiler() -> Optional[CallProfiler]:
+    return _profiler
@@ -0,0 +1,73 @@
+import importlib
+import os
+import sys
+import time
+import types
+from typing import Any, Dict
+
+# 무거운 의존성 (import만으로 수백 ms ~ 수 초)
+HEAVY_MODULES = ("mlflow", "sklearn", "xgboost", "optuna", "pandas", "pyarrow", "scipy")
+
+_T0 = time.perf_counter()
+_import_ms: Dict[str, float] = {}
+
+
+class _LazyModule(types.ModuleType):
+    """첫 속성 접근 시점에 실제로 import하는 모듈 프록시"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            start = time.perf_counter()
+            module = importlib.import_module(self.__name__)
+            _import_ms.setdefault(self.__name__, (time.perf_counter() - start) * 1000)
+            self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self._load(), item)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str):
+    """
+    `mlflow = lazy_import("mlflow")` 처럼 사용.
+    - 이미 import된 모듈이면 그대로 반환
+    - 아니면 실제 속성 접근 전까지 import를 미룸 (짧은 CLI 스크립트의 시작 시간 단축)
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    return _LazyModule(name)
+
+
+def _process_elapsed_ms() -> float:
+    # Linux: /proc에서 프로세스 시작 시각을 읽어 인터프리터 기동 시간까지 포함
+    try:
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return (uptime - start_ticks / os.sysconf("SC_CLK_TCK")) * 1000
+    except (OSError, ValueError, IndexError):
+        return (time.perf_counter() - _T0) * 1000
+
+
+def startup_report() -> Dict[str, Any]:
+    """프로세스 시작 후 경과 시간, lazy import별 소요 시간, 로드된 무거운 모듈 목록"""
+    return {
+        "elapsed_ms": round(_process_elapsed_ms(), 1),
+        "lazy_imports_ms": {k: round(v, 1) for k, v in _import_ms.items()},
+        "heavy_modules_loaded": [m for m in HEAVY_MODULES if m in sys.modules],
+    }
+
+
+def report_startup():
+    """STARTUP_REPORT=1 이면 startup_report()를 stderr로 출력"""
+    if os.getenv("STARTUP_REPORT", "").lower() in {"1", "true", "yes"}:
+        print(f"[STARTUP] {startup_report()}", file=sys.stderr)
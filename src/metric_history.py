@@ -0,0 +1,144 @@
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CACHE_DIR = Path(os.getenv("METRIC_HISTORY_CACHE_DIR", Path.home() / ".cache" / "mlflow-study" / "metric_history"))
+# 종료된 run의 history는 더 이상 바뀌지 않으므로 캐시 가능
+TERMINAL_STATUSES = {"FINISHED", "FAILED", "KILLED"}
+HISTORY_DTYPE = np.dtype([("step", np.int64), ("timestamp", np.int64), ("value", np.float64)])
+
+
+def child_run_ids(client, experiment_id: str, parent_run_id: str, status: Optional[str] = None) -> List[str]:
+    """parent run 아래 child run ID 전체 (페이지 단위로 모두 조회)"""
+    filter_string = f"tags.mlflow.parentRunId = '{parent_run_id}'"
+    if status:
+        filter_string += f" and attributes.status = '{status}'"
+    ids, token = [], None
+    while True:
+        page = client.search_runs([experiment_id], filter_string=filter_string, max_results=1000, page_token=token)
+        ids += [r.info.run_id for r in page]
+        token = page.token
+        if not token:
+            return ids
+
+
+class MetricHistoryFetcher:
+    """
+    여러 run × 여러 metric key의 전체 history를 병렬로 가져오는 fetcher.
+    - 크기가 제한된 스레드 풀(max_workers)에서 get_metric_history 호출, 실패 시 지수 backoff로 재시도
+    - 종료된(FINISHED/FAILED/KILLED) run의 history는 로컬 .npy(cache_dir/<run_id>/<key>.npy)로 캐시
+      → 다시 요청하면 서버 왕복 없이 로드 (RUNNING run은 매번 새로 조회)
+    - fetch() 결과를 long DataFrame / step 기준으로 정렬된 wide DataFrame / NumPy 배열로 변환
+    """
+
+    def __init__(
+        self,
+        client=None,
+        max_workers: int = 16,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        cache_dir: Optional[os.PathLike] = None,
+    ):
+        if client is None:
+            from mlflow.tracking import MlflowClient
+
+            client = MlflowClient()
+        self.client = client
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self._lock = threading.Lock()
+        self._stats = {"cache_hits": 0, "fetched": 0, "retries": 0}
+
+    def _cache_path(self, run_id: str, key: str) -> Path:
+        safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in key)
+        return self.cache_dir / run_id / f"{safe}.npy"
+
+    def _retry(self, fn, *args):
+        for attempt in range(self.max_retries + 1):
+            try:
+                return fn(*args)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                with self._lock:
+                    self._stats["retries"] += 1
+                delay = self.backoff * (2 ** attempt) * (1 + random.random())
+                logging.warning(f"[MetricHistoryFetcher] {fn.__name__}{args} failed ({e}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    def _fetch_run(self, run_id: str, keys: List[str]) -> Dict[str, np.ndarray]:
+        paths = {k: self._cache_path(run_id, k) for k in keys}
+        out = {k: np.load(p) for k, p in paths.items() if p.exists()}
+        with self._lock:
+            self._stats["cache_hits"] += len(out)
+        missing = [k for k in keys if k not in out]
+        if not missing:
+            return out
+
+        # 상태를 history보다 먼저 확인: 이때 이미 종료된 run이면 이후 받는 history는 완전함
+        terminal = self._retry(self.client.get_run, run_id).info.status in TERMINAL_STATUSES
+        for key in missing:
+            metrics = self._retry(self.client.get_metric_history, run_id, key)
+            arr = np.array([(m.step, m.timestamp, m.value) for m in metrics], dtype=HISTORY_DTYPE)
+            arr.sort(order=["step", "timestamp"])
+            out[key] = arr
+            if terminal:
+                paths[key].parent.mkdir(parents=True, exist_ok=True)
+                tmp = paths[key].with_suffix(f".{threading.get_ident()}.tmp.npy")
+                np.save(tmp, arr)
+                os.replace(tmp, paths[key])
+        with self._lock:
+            self._stats["fetched"] += len(missing)
+        return out
+
+    def fetch(self, run_ids: Iterable[str], keys: Iterable[str]) -> Dict[Tuple[str, str], np.ndarray]:
+        """{(run_id, key): 구조화 배열(step, timestamp, value)} — run 단위로 병렬 조회"""
+        run_ids, keys = list(dict.fromkeys(run_ids)), list(keys)
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="metric-history") as pool:
+            results = list(pool.map(lambda r: self._fetch_run(r, keys), run_ids))
+        return {(r, k): arr for r, by_key in zip(run_ids, results) for k, arr in by_key.items()}
+
+    def to_frame(self, histories: Dict[Tuple[str, str], np.ndarray]) -> pd.DataFrame:
+        """long format: run_id / key / step / timestamp / value"""
+        frames = [
+            pd.DataFrame(arr).assign(run_id=run_id, key=key)
+            for (run_id, key), arr in histories.items() if len(arr)
+        ]
+        if not frames:
+            return pd.DataFrame(columns=["run_id", "key", "step", "timestamp", "value"])
+        return pd.concat(frames, ignore_index=True)[["run_id", "key", "step", "timestamp", "value"]]
+
+    def aligned(self, run_ids: Iterable[str], key: str, ffill: bool = False) -> pd.DataFrame:
+        """
+        한 key의 history를 step 기준으로 정렬한 wide DataFrame (index=step, columns=run_id).
+        - 같은 step에 값이 여러 개면 마지막(timestamp 기준) 값을 사용
+        - 일찍 끝난 run(early stopping)의 이후 step은 NaN, ffill=True면 마지막 값으로 채움
+        - .to_numpy()로 (n_steps, n_runs) 배열을 바로 얻을 수 있음
+        """
+        run_ids = list(dict.fromkeys(run_ids))
+        histories = self.fetch(run_ids, [key])
+        steps = np.unique(np.concatenate([histories[(r, key)]["step"] for r in run_ids] or [np.array([], np.int64)]))
+        out = np.full((len(steps), len(run_ids)), np.nan)
+        for j, r in enumerate(run_ids):
+            arr = histories[(r, key)]
+            if not len(arr):
+                continue
+            # 정렬되어 있으므로 step별 마지막 값의 위치 = 다음 step이 시작하기 직전
+            last = np.r_[np.flatnonzero(np.diff(arr["step"])), len(arr) - 1]
+            out[np.searchsorted(steps, arr["step"][last]), j] = arr["value"][last]
+        df = pd.DataFrame(out, index=pd.Index(steps, name="step"), columns=run_ids)
+        return df.ffill() if ffill else df
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
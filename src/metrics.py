@@ -0,0 +1,139 @@
+import numpy as np
+
+from typing import Dict, Optional, Tuple
+
+AVERAGES = ("macro", "micro", "weighted", "binary", None)
+
+
+def _encode(y_true, y_pred, labels=None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """라벨을 0..K-1 정수로 인코딩 (labels가 없으면 y_true ∪ y_pred의 정렬된 고유값)"""
+    y_true = np.asarray(y_true)
+    y_pred = np.asarray(y_pred)
+    if labels is None:
+        labels = np.unique(np.concatenate([y_true.ravel(), y_pred.ravel()]))
+    else:
+        labels = np.asarray(labels)
+    order = np.argsort(labels)
+    sorted_labels = labels[order]
+
+    def enc(y):
+        idx = np.searchsorted(sorted_labels, y)
+        idx = np.clip(idx, 0, len(labels) - 1)
+        if not np.all(sorted_labels[idx] == y):
+            raise ValueError("y contains labels not present in `labels`.")
+        return order[idx]
+
+    return enc(y_true), enc(y_pred), labels
+
+
+def confusion_matrix(y_true, y_pred, labels=None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    bincount 한 번으로 혼동행렬 계산.
+    - y_true: (n,) 또는 (B, n) / y_pred: (n,) 또는 (B, n)  (B개 예측 벡터를 한 번에 처리)
+    - 반환: (cm, labels) — cm은 (K, K) 또는 (B, K, K), cm[..., true, pred]
+    """
+    t, p, labels = _encode(y_true, y_pred, labels)
+    k = len(labels)
+    if t.ndim == 1 and p.ndim == 1:
+        cm = np.bincount(t * k + p, minlength=k * k).reshape(k, k)
+        return cm, labels
+
+    t, p = np.broadcast_arrays(np.atleast_2d(t), np.atleast_2d(p))
+    b = t.shape[0]
+    offset = (np.arange(b) * k * k)[:, None]
+    cm = np.bincount((offset + t * k + p).ravel(), minlength=b * k * k).reshape(b, k, k)
+    return cm, labels
+
+
+def _safe_div(num, den):
+    num = np.asarray(num, dtype=float)
+    den = np.asarray(den, dtype=float)
+    out = np.zeros(np.broadcast(num, den).shape, dtype=float)
+    np.divide(num, den, out=out, where=den != 0)
+    return out
+
+
+def metrics_from_confusion(
+    cm: np.ndarray,
+    average: Optional[str] = "macro",
+    labels=None,
+    pos_label=1,
+) -> Dict[str, np.ndarray]:
+    """
+    혼동행렬(들)에서 accuracy / precision / recall / f1을 한 번에 계산.
+    - average: "macro" | "micro" | "weighted" | "binary" | None(클래스별)
+    - labels를 주면 macro는 labels 전체를 평균 (등장하지 않은 클래스는 0), 없으면 등장한 클래스만 평균
+    - zero division은 sklearn 기본값처럼 0으로 처리
+    - cm이 (B, K, K)면 각 값이 길이 B 배열
+    """
+    if average not in AVERAGES:
+        raise ValueError(f"average must be one of {AVERAGES}, got {average!r}")
+    cm = np.asarray(cm)
+    tp = np.diagonal(cm, axis1=-2, axis2=-1).astype(float)
+    true_cnt = cm.sum(axis=-1).astype(float)
+    pred_cnt = cm.sum(axis=-2).astype(float)
+    total = true_cnt.sum(axis=-1)
+
+    acc = _safe_div(tp.sum(axis=-1), total)
+    precision = _safe_div(tp, pred_cnt)
+    recall = _safe_div(tp, true_cnt)
+    f1 = _safe_div(2 * tp, pred_cnt + true_cnt)
+
+    if average is None:
+        pass
+    elif average == "micro":
+        precision = _safe_div(tp.sum(axis=-1), pred_cnt.sum(axis=-1))
+        recall = _safe_div(tp.sum(axis=-1), true_cnt.sum(axis=-1))
+        f1 = _safe_div(2 * precision * recall, precision + recall)
+    elif average == "macro":
+        if labels is not None:
+            # labels를 명시하면 sklearn(labels=...)처럼 모든 라벨을 평균
+            precision, recall, f1 = (m.mean(axis=-1) for m in (precision, recall, f1))
+        else:
+            # 라벨을 추론한 경우: 해당 샘플에 (true 또는 pred로) 등장한 클래스만 평균 (sklearn과 동일)
+            present = (true_cnt + pred_cnt) > 0
+            n_present = present.sum(axis=-1)
+            precision, recall, f1 = (
+                _safe_div((m * present).sum(axis=-1), n_present) for m in (precision, recall, f1)
+            )
+    elif average == "weighted":
+        w = _safe_div(true_cnt, total[..., None])
+        precision, recall, f1 = ((m * w).sum(axis=-1) for m in (precision, recall, f1))
+    elif average == "binary":
+        if labels is None:
+            raise ValueError("labels are required for average='binary'")
+        labels = np.asarray(labels)
+        if len(labels) > 2:
+            raise ValueError("average='binary' requires at most 2 labels; use 'macro'/'micro'/'weighted'")
+        idx = np.flatnonzero(labels == pos_label)
+        if len(idx) == 0:
+            raise ValueError(f"pos_label={pos_label!r} is not a valid label: {labels.tolist()}")
+        precision, recall, f1 = (m[..., idx[0]] for m in (precision, recall, f1))
+
+    return {"accuracy": acc, "precision": precision, "recall": recall, "f1": f1}
+
+
+def compute_metrics(y_true, y_pred, average: Optional[str] = "macro", labels=None, pos_label=1):
+    """
+    단일 또는 배치(B, n) 예측에 대해 metric dict 반환.
+    - 혼동행렬을 한 번만 만들고 모든 metric을 거기서 유도
+    - 예: Optuna trial들의 예측이나 bootstrap 재표본을 (B, n)으로 쌓아 한 번에 평가
+    """
+    explicit = labels is not None
+    cm, labels = confusion_matrix(y_true, y_pred, labels)
+    # binary는 pos_label 위치를 찾기 위해 항상 labels 필요 / macro는 명시한 labels일 때만 전체 평균
+    return metrics_from_confusion(cm, average, labels=labels if explicit or average == "binary" else None,
+                                  pos_label=pos_label)
+
+
+def bootstrap_metrics(y_true, y_pred, n_boot: int = 1000, average: Optional[str] = "macro", seed: int = 42):
+    """
+    bootstrap 재표본 n_boot개를 (n_boot, n) 인덱스로 만들어 한 번에 평가.
+    - 전체 데이터의 라벨을 명시하므로 macro는 재표본에 빠진 클래스도 0으로 평균에 포함
+    """
+    y_true = np.asarray(y_true)
+    y_pred = np.asarray(y_pred)
+    rng = np.random.default_rng(seed)
+    idx = rng.integers(0, len(y_true), size=(n_boot, len(y_true)))
+    labels = np.unique(np.concatenate([y_true, y_pred]))
+    return compute_metrics(y_true[idx], y_pred[idx], average, labels=labels)
@@ -1,16 +1,326 @@
-import mlflow
-
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from pathlib import Path
 from typing import Optional, Dict, Any
 
+from src.lazy import lazy_import
+
+# mlflow import는 1~2초 걸리므로 실제로 쓰일 때 로드
+mlflow = lazy_import("mlflow")
+
+EXPERIMENT_CACHE_PATH = Path(
+    os.getenv("EXPERIMENT_CACHE_PATH", Path.home() / ".cache" / "mlflow-study" / "experiments.json")
+)
+_experiment_cache: Optional[Dict[str, Dict[str, str]]] = None
+
+
+def _load_experiment_cache() -> Dict[str, Dict[str, str]]:
+    global _experiment_cache
+    if _experiment_cache is None:
+        try:
+            _experiment_cache = json.loads(EXPERIMENT_CACHE_PATH.read_text())
+        except (OSError, ValueError):
+            _experiment_cache = {}
+    return _experiment_cache
+
+
+def _save_experiment_cache():
+    try:
+        EXPERIMENT_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = EXPERIMENT_CACHE_PATH.with_suffix(".tmp")
+        tmp.write_text(json.dumps(_experiment_cache, indent=2))
+        os.replace(tmp, EXPERIMENT_CACHE_PATH)
+    except OSError as e:
+        logging.warning(f"[setup_mlflow] failed to write experiment cache: {e}")
 
-def setup_mlflow(experiment_name: str, tracking_uri: Optional[str] = None):
+
+def invalidate_experiment_cache(experiment_name: Optional[str] = None, tracking_uri: Optional[str] = None):
+    """실험 이름 → ID 캐시 삭제 (tracking_uri 기준, 이름이 없으면 해당 URI 전체)"""
+    cache = _load_experiment_cache()
+    uri = tracking_uri or mlflow.get_tracking_uri()
+    if experiment_name is None:
+        cache.pop(uri, None)
+    else:
+        cache.get(uri, {}).pop(experiment_name, None)
+    _save_experiment_cache()
+
+
+def setup_mlflow(
+    experiment_name: str,
+    tracking_uri: Optional[str] = None,
+    validate: bool = True,
+    offline: bool = False,
+):
     """
     MLflow 환경 설정 헬퍼:
     - (옵션) tracking_uri가 주어지면 먼저 set_tracking_uri
     - experiment_name이 없으면 생성, 있으면 해당 실험으로 설정
+    - 이름 → ID는 tracking URI별로 로컬 캐시(EXPERIMENT_CACHE_PATH)에 저장
+      - validate=True: 캐시된 ID를 get_experiment 한 번으로 검증 (삭제/이름 변경 시 캐시 무효화 후 재조회)
+      - validate=False: 캐시 적중 시 서버 왕복 없이 MLFLOW_EXPERIMENT_ID만 설정 (None 반환)
+    - offline=True: 서버에 접속하지 않고 local-first OfflineTracker를 반환
+      (src/offline.py — journal에 기록 후 백그라운드에서 서버로 재전송).
+      fluent API(mlflow.start_run)는 그대로 서버를 쓰므로 반환된 tracker로 기록하는 스크립트에서만 사용
+    - MLFLOW_INSTRUMENT=1: 모든 MLflow 호출의 지연시간 / payload / 재시도 / 호출 위치를 기록
+      (src/instrumentation.py — run 종료 시 프로파일을 run에 첨부)
     - Experiment 객체(또는 None)를 반환
     """
     if tracking_uri:
         mlflow.set_tracking_uri(tracking_uri)
-    mlflow.set_experiment(experiment_name)
-    return mlflow.get_experiment_by_name(experiment_name)
\ No newline at end of file
+    if os.getenv("MLFLOW_INSTRUMENT", "").lower() in {"1", "true", "yes"}:
+        from src.instrumentation import enable_instrumentation
+
+        enable_instrumentation()
+    if offline:
+        from src.offline import OfflineTracker
+
+        return OfflineTracker(experiment_name)
+    uri = mlflow.get_tracking_uri()
+    cache = _load_experiment_cache().setdefault(uri, {})
+
+    exp_id = cache.get(experiment_name)
+    if exp_id is not None:
+        if not validate:
+            os.environ["MLFLOW_EXPERIMENT_ID"] = exp_id
+            return None
+        try:
+            exp = mlflow.set_experiment(experiment_id=exp_id)
+            if exp.name == experiment_name and exp.lifecycle_stage == "active":
+                return exp
+        except Exception:
+            pass
+        # 캐시 miss: 삭제되었거나 다른 실험을 가리킴
+        cache.pop(experiment_name, None)
+
+    exp = mlflow.set_experiment(experiment_name)
+    cache[experiment_name] = exp.experiment_id
+    _save_experiment_cache()
+    return exp
+
+
+# log_batch 한 번에 보낼 수 있는 최대 개수 (MLflow REST API 제한)
+MAX_BATCH_METRICS = 1000
+MAX_BATCH_PARAMS = 100
+MAX_BATCH_TAGS = 100
+# 다시 보내도 같은 이유로 실패하는 요청의 서버 오류 코드 (재시도하지 않음)
+REJECTED_ERROR_CODES = {"INVALID_PARAMETER_VALUE", "RESOURCE_DOES_NOT_EXIST", "BAD_REQUEST"}
+
+_STOP = object()
+
+
+class _FlushRequest:
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class BufferedMetricLogger:
+    """
+    metric / param / tag를 메모리에 모아 백그라운드 스레드에서 log_batch로 전송하는 로거.
+    - max_batch_size개가 모이거나 flush_interval초가 지나면 전송
+    - 큐가 max_queue_size만큼 차면 log_* 호출이 블록됨 (backpressure)
+    - close() / with 블록 종료 / 프로세스 종료(atexit) 시 남은 항목을 반드시 flush
+    - log_batch 실패(서버 장애)는 지수 backoff로 재시도하며 그동안 큐를 비우지 않음 → 항목을 잃지 않고 backpressure로 전환
+      (close 이후에는 max_retries번까지만 재시도하고 남은 항목은 n_dropped로 집계)
+    - 서버가 거부한 batch(중복 / 잘못된 param 등)는 metric·tag와 param을 나눠 다시 보내 metric은 살림
+    - 같은 batch 안의 중복 param / tag key는 마지막 값만 전송
+    - stats()로 flush 횟수, 전송 개수, flush 지연시간(ms) 통계 확인 (지연시간은 최근 latency_window개)
+    """
+
+    def __init__(
+        self,
+        run_id: Optional[str] = None,
+        client=None,
+        max_batch_size: int = MAX_BATCH_METRICS,
+        flush_interval: float = 1.0,
+        max_queue_size: int = 10000,
+        max_retries: int = 5,
+        retry_backoff: float = 0.5,
+        latency_window: int = 10000,
+    ):
+        if run_id is None:
+            active = mlflow.active_run()
+            if active is None:
+                raise RuntimeError("No active run. Pass run_id or call inside mlflow.start_run().")
+            run_id = active.info.run_id
+        self.run_id = run_id
+        self.client = client or mlflow.tracking.MlflowClient()
+        self.max_batch_size = min(max_batch_size, MAX_BATCH_METRICS)
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self._latencies: "deque[float]" = deque(maxlen=latency_window)
+        self._n_flushes = 0
+        self._n_items = 0
+        self._n_errors = 0
+        self._n_dropped = 0
+        self._last_error: Optional[BaseException] = None
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._worker, name="mlflow-buffered-logger", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ---- 기록 API (학습 스레드에서 호출) ----
+    def log_metric(self, key: str, value: float, step: Optional[int] = None, timestamp: Optional[int] = None):
+        from mlflow.entities import Metric
+
+        ts = timestamp if timestamp is not None else int(time.time() * 1000)
+        self._put(Metric(key, float(value), ts, step or 0))
+
+    def log_metrics(self, metrics: Dict[str, float], step: Optional[int] = None):
+        ts = int(time.time() * 1000)
+        for k, v in metrics.items():
+            self.log_metric(k, v, step=step, timestamp=ts)
+
+    def log_param(self, key: str, value: Any):
+        from mlflow.entities import Param
+
+        self._put(Param(key, str(value)))
+
+    def log_params(self, params: Dict[str, Any]):
+        for k, v in params.items():
+            self.log_param(k, v)
+
+    def set_tag(self, key: str, value: Any):
+        from mlflow.entities import RunTag
+
+        self._put(RunTag(key, str(value)))
+
+    def set_tags(self, tags: Dict[str, Any]):
+        for k, v in tags.items():
+            self.set_tag(k, v)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """지금까지 쌓인 항목을 모두 전송할 때까지 대기. 완료 여부를 반환"""
+        if self._closed:
+            return True
+        req = _FlushRequest()
+        self._queue.put(req)
+        return req.done.wait(timeout)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        atexit.unregister(self.close)
+
+    def stats(self) -> Dict[str, Any]:
+        lat = sorted(self._latencies)
+
+        def pct(p):
+            return lat[min(len(lat) - 1, int(p / 100 * len(lat)))] if lat else None
+
+        return {
+            "n_flushes": self._n_flushes,
+            "n_items": self._n_items,
+            "n_errors": self._n_errors,
+            "n_dropped": self._n_dropped,
+            "pending": self._queue.qsize(),
+            "flush_ms_mean": sum(lat) / len(lat) if lat else None,
+            "flush_ms_p50": pct(50),
+            "flush_ms_p95": pct(95),
+            "flush_ms_max": lat[-1] if lat else None,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ---- 내부 ----
+    def _put(self, item):
+        if self._closed:
+            raise RuntimeError("BufferedMetricLogger is closed.")
+        self._queue.put(item)  # 큐가 가득 차면 여기서 블록
+
+    def _worker(self):
+        pending = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            timeout = max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._send(pending)
+                return
+            if isinstance(item, _FlushRequest):
+                self._send(pending)
+                pending = []
+                item.done.set()
+                deadline = time.monotonic() + self.flush_interval
+                continue
+            if item is not None:
+                pending.append(item)
+
+            if len(pending) >= self.max_batch_size or time.monotonic() >= deadline:
+                self._send(pending)
+                pending = []
+                deadline = time.monotonic() + self.flush_interval
+
+    def _send(self, items):
+        if not items:
+            return
+        from mlflow.entities import Metric, Param, RunTag
+
+        metrics = [i for i in items if isinstance(i, Metric)]
+        # 같은 key가 한 batch에 두 번 있으면 서버가 batch 전체를 거부 → 마지막 값만
+        params = list({i.key: i for i in items if isinstance(i, Param)}.values())
+        tags = list({i.key: i for i in items if isinstance(i, RunTag)}.values())
+
+        # REST 제한에 맞춰 잘라서 전송
+        while metrics or params or tags:
+            p, params = params[:MAX_BATCH_PARAMS], params[MAX_BATCH_PARAMS:]
+            t, tags = tags[:MAX_BATCH_TAGS], tags[MAX_BATCH_TAGS:]
+            n_m = MAX_BATCH_METRICS - len(p) - len(t)  # 한 요청당 전체 1000개 제한
+            m, metrics = metrics[:n_m], metrics[n_m:]
+            if self._log_batch(m, p, t):
+                continue
+            # 거부된 batch: param 때문에 metric / tag까지 잃지 않도록 나눠서 다시 전송
+            parts = [(m, [], t), ([], p, [])] if p and (m or t) else []
+            for part in parts:
+                if not self._log_batch(*part):
+                    self._n_dropped += sum(map(len, part))
+            if not parts:
+                self._n_dropped += len(m) + len(p) + len(t)
+
+    def _log_batch(self, metrics, params, tags) -> bool:
+        """재시도하며 전송, 서버가 거부하면 False (close 이후 재시도가 끝나도 실패하면 버림)"""
+        n = len(metrics) + len(params) + len(tags)
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                self.client.log_batch(self.run_id, metrics=metrics, params=params, tags=tags)
+                self._n_items += n
+                return True
+            except Exception as e:  # 학습 스레드를 죽이지 않도록 여기서 처리
+                self._n_errors += 1
+                self._last_error = e
+                if getattr(e, "error_code", None) in REJECTED_ERROR_CODES:
+                    logging.warning(f"[BufferedMetricLogger] log_batch rejected ({n} items): {e}")
+                    return False
+                if self._closed and attempt >= self.max_retries:
+                    self._n_dropped += n
+                    logging.error(f"[BufferedMetricLogger] dropped {n} items after {attempt} retries: {e}")
+                    return True
+                delay = min(self.retry_backoff * 2 ** attempt, 30.0)
+                logging.warning(f"[BufferedMetricLogger] log_batch failed, retry in {delay:.1f}s: {e}")
+                attempt += 1
+                time.sleep(delay)
+            finally:
+                self._n_flushes += 1
+                self._latencies.append((time.perf_counter() - start) * 1000)
@@ -0,0 +1,211 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from src.content_store import ContentStore, is_manifest_dir
+
+DEFAULT_CACHE_DIR = Path(os.getenv("MODEL_CACHE_DIR", Path.home() / ".cache" / "mlflow-study" / "models"))
+
+
+def _dir_digest(path: Path) -> Tuple[str, int]:
+    """디렉터리 내용(상대경로 + 바이트)의 sha256과 전체 크기"""
+    h = hashlib.sha256()
+    size = 0
+    for f in sorted(p for p in path.rglob("*") if p.is_file()):
+        h.update(f.relative_to(path).as_posix().encode())
+        with open(f, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                h.update(chunk)
+        size += f.stat().st_size
+    return h.hexdigest(), size
+
+
+class ModelCache:
+    """
+    pyfunc 모델 로딩 캐시.
+    1) URI 해석: runs:/ , models:/name/<version> 은 그대로, models:/name@alias 와
+       models:/name/<stage> 는 레지스트리 조회로 고정 버전(models:/name/<version>)으로 변환
+       (가변 참조라서 resolve_ttl초 동안만 메모이즈)
+    2) 디스크 캐시: 다운로드한 아티팩트를 내용 해시(blobs/<sha256>)로 저장하고
+       index.json에 "고정 URI → 해시"를 기록 → 같은 URI는 다시 다운로드하지 않음
+       (cas_manifest.json만 있는 content-addressed 모델은 공유 blob으로 재구성)
+    3) 메모리 LRU: 역직렬화된 모델을 max_memory_bytes(디스크 크기 기준)까지 보관
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[os.PathLike] = None,
+        max_memory_bytes: int = 1 << 30,
+        resolve_ttl: float = 60.0,
+        client=None,
+    ):
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.blob_dir = self.cache_dir / "blobs"
+        self.index_path = self.cache_dir / "index.json"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.max_memory_bytes = max_memory_bytes
+        self.resolve_ttl = resolve_ttl
+        self._client = client
+
+        self._lock = threading.RLock()
+        self._download_locks: Dict[str, threading.Lock] = {}  # 고정 URI별 (다른 모델 다운로드는 서로 막지 않음)
+        self._resolved: Dict[str, Tuple[float, str]] = {}
+        self._models: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "downloads": 0, "evictions": 0}
+
+    @property
+    def client(self):
+        if self._client is None:
+            from mlflow.tracking import MlflowClient
+
+            self._client = MlflowClient()
+        return self._client
+
+    # ---- 1) URI 해석 ----
+    def resolve(self, model_uri: str) -> str:
+        """가변 URI(alias/stage)를 고정 URI로 변환"""
+        if not model_uri.startswith("models:/"):
+            return model_uri
+
+        now = time.monotonic()
+        with self._lock:
+            hit = self._resolved.get(model_uri)
+            if hit and now - hit[0] < self.resolve_ttl:
+                return hit[1]
+
+        name_ref = model_uri[len("models:/"):].rstrip("/")
+        if "@" in name_ref:
+            name, alias = name_ref.split("@", 1)
+            version = self.client.get_model_version_by_alias(name, alias).version
+        else:
+            name, ref = name_ref.rsplit("/", 1)
+            if ref.isdigit():
+                return model_uri  # 이미 고정 버전
+            if ref.lower() == "latest":
+                versions = self.client.search_model_versions(f"name='{name}'")
+            else:
+                versions = self.client.get_latest_versions(name, stages=[ref])
+            if not versions:
+                raise RuntimeError(f"No model version found for '{model_uri}'.")
+            version = max(versions, key=lambda v: int(v.version)).version
+
+        resolved = f"models:/{name}/{version}"
+        with self._lock:
+            self._resolved[model_uri] = (now, resolved)
+        return resolved
+
+    def invalidate(self, model_uri: Optional[str] = None):
+        """alias/stage를 바꾼 직후 등 해석 결과를 즉시 버리고 싶을 때"""
+        with self._lock:
+            if model_uri is None:
+                self._resolved.clear()
+            else:
+                self._resolved.pop(model_uri, None)
+
+    # ---- 2) 디스크 캐시 ----
+    def _read_index(self) -> Dict[str, str]:
+        if self.index_path.exists():
+            return json.loads(self.index_path.read_text())
+        return {}
+
+    def _write_index(self, index: Dict[str, str]):
+        tmp = self.index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(index, indent=2))
+        os.replace(tmp, self.index_path)
+
+    def _cached_path(self, resolved: str) -> Optional[Path]:
+        with self._lock:
+            digest = self._read_index().get(resolved)
+            if digest and (self.blob_dir / digest).exists():
+                self._stats["disk_hits"] += 1
+                return self.blob_dir / digest
+        return None
+
+    def local_path(self, model_uri: str) -> Tuple[str, Path]:
+        """(고정 URI, 로컬 모델 디렉터리) — 디스크에 없으면 한 번만 다운로드"""
+        import mlflow
+
+        resolved = self.resolve(model_uri)
+        cached = self._cached_path(resolved)
+        if cached is not None:
+            return resolved, cached
+
+        # 같은 URI는 한 스레드만 다운로드, 다른 URI의 다운로드 / 디스크 적중은 기다리지 않음
+        with self._lock:
+            download_lock = self._download_locks.setdefault(resolved, threading.Lock())
+        with download_lock:
+            cached = self._cached_path(resolved)  # 기다리는 동안 다른 스레드가 받았을 수 있음
+            if cached is not None:
+                return resolved, cached
+
+            tmp = Path(tempfile.mkdtemp(dir=self.cache_dir, prefix="dl-"))
+            try:
+                local = Path(mlflow.artifacts.download_artifacts(artifact_uri=resolved, dst_path=str(tmp)))
+                if is_manifest_dir(local):
+                    # content-addressed 모델(src/content_store.py): manifest → 실제 모델 디렉터리로 재구성
+                    local = ContentStore().materialize(local, tmp / "materialized")
+                digest, _ = _dir_digest(local)
+                target = self.blob_dir / digest
+                try:
+                    os.replace(local, target)
+                except OSError:
+                    if not target.exists():
+                        raise  # 다른 URI가 같은 내용을 이미 캐시한 경우만 무시
+            finally:
+                shutil.rmtree(tmp, ignore_errors=True)
+
+            with self._lock:
+                index = self._read_index()
+                index[resolved] = digest
+                self._write_index(index)
+                self._stats["downloads"] += 1
+            return resolved, target
+
+    # ---- 3) 메모리 LRU ----
+    def load(self, model_uri: str):
+        """mlflow.pyfunc.load_model과 같은 결과를 반환 (메모리 → 디스크 → 원격 순으로 조회)"""
+        import mlflow.pyfunc
+
+        resolved, path = self.local_path(model_uri)
+        key = path.name
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return self._models[key][0]
+
+        model = mlflow.pyfunc.load_model(str(path))
+        size = sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+        with self._lock:
+            if key in self._models:  # 다른 스레드가 먼저 로드한 경우
+                return self._models[key][0]
+            self._models[key] = (model, size)
+            self._memory_bytes += size
+            while self._memory_bytes > self.max_memory_bytes and len(self._models) > 1:
+                _, (_, evicted_size) = self._models.popitem(last=False)
+                self._memory_bytes -= evicted_size
+                self._stats["evictions"] += 1
+        return model
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "models_in_memory": len(self._models), "memory_bytes": self._memory_bytes}
+
+
+_default_cache: Optional[ModelCache] = None
+
+
+def load_model(model_uri: str):
+    """프로세스 기본 ModelCache로 모델 로드"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ModelCache()
+    return _default_cache.load(model_uri)
@@ -0,0 +1,423 @@
+import fcntl
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.lazy import lazy_import
+
+mlflow = lazy_import("mlflow")
+
+DEFAULT_SPOOL_DIR = Path(os.getenv("MLFLOW_SPOOL_DIR", Path.home() / ".cache" / "mlflow-study" / "spool"))
+LOCAL_RUN_ID_TAG = "offline.local_run_id"
+
+# log_batch 제한 (src/mlflow_utils.py와 동일)
+MAX_BATCH_METRICS = 1000
+MAX_BATCH_PARAMS = 100
+MAX_BATCH_TAGS = 100
+# 다시 보내도 같은 이유로 실패하는 레코드의 서버 오류 코드 → dead letter로 격리
+REJECTED_ERROR_CODES = {"INVALID_PARAMETER_VALUE", "RESOURCE_DOES_NOT_EXIST", "RESOURCE_ALREADY_EXISTS", "BAD_REQUEST"}
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _is_rejected(e: BaseException) -> bool:
+    """재시도해도 소용없는 레코드 오류인지 (매핑 없는 run / 알 수 없는 op / 서버가 거부한 값)"""
+    if isinstance(e, (KeyError, ValueError)) and not isinstance(e, OSError):  # requests 오류는 OSError
+        return True
+    return getattr(e, "error_code", None) in REJECTED_ERROR_CODES
+
+
+class OfflineRun:
+    """OfflineTracker.start_run()이 반환하는 run 핸들 (BufferedMetricLogger와 같은 log_* API)"""
+
+    def __init__(self, tracker: "OfflineTracker", local_run_id: str):
+        self.tracker = tracker
+        self.run_id = local_run_id  # 로컬 ID (서버 run ID는 동기화 후 tracker.server_run_id()로 확인)
+
+    def log_metric(self, key: str, value: float, step: Optional[int] = None, timestamp: Optional[int] = None):
+        self.tracker._append({"op": "metric", "run": self.run_id, "key": key, "value": float(value),
+                              "step": step or 0, "ts": timestamp or _now_ms()})
+
+    def log_metrics(self, metrics: Dict[str, float], step: Optional[int] = None):
+        ts = _now_ms()
+        for k, v in metrics.items():
+            self.log_metric(k, v, step=step, timestamp=ts)
+
+    def log_param(self, key: str, value: Any):
+        self.tracker._append({"op": "param", "run": self.run_id, "key": key, "value": str(value)})
+
+    def log_params(self, params: Dict[str, Any]):
+        for k, v in params.items():
+            self.log_param(k, v)
+
+    def set_tag(self, key: str, value: Any):
+        self.tracker._append({"op": "tag", "run": self.run_id, "key": key, "value": str(value)})
+
+    def set_tags(self, tags: Dict[str, Any]):
+        for k, v in tags.items():
+            self.set_tag(k, v)
+
+    def log_artifact(self, local_path: os.PathLike, artifact_path: Optional[str] = None):
+        """파일을 spool의 blobs/로 복사해 두고 (원본이 사라져도 재전송 가능) journal에 기록"""
+        blob = self.tracker.blob_dir / uuid.uuid4().hex / os.path.basename(local_path)
+        blob.parent.mkdir(parents=True)
+        shutil.copy2(local_path, blob)
+        self.tracker._append({"op": "artifact", "run": self.run_id, "path": str(blob), "artifact_path": artifact_path})
+
+    def log_text(self, text: str, artifact_file: str):
+        blob = self.tracker.blob_dir / uuid.uuid4().hex / os.path.basename(artifact_file)
+        blob.parent.mkdir(parents=True)
+        blob.write_text(text)
+        self.tracker._append({"op": "artifact", "run": self.run_id, "path": str(blob),
+                              "artifact_path": os.path.dirname(artifact_file) or None})
+
+    def end(self, status: str = "FINISHED"):
+        self.tracker._append({"op": "end_run", "run": self.run_id, "status": status, "ts": _now_ms()})
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        return self.tracker.flush(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end("FINISHED" if exc_type is None else "FAILED")
+
+
+class OfflineTracker:
+    """
+    local-first tracking: run / metric / param / tag / artifact를 append-only journal(JSONL)에 디스크 속도로 기록하고,
+    백그라운드 syncer가 순서대로 tracking 서버에 재전송(store-and-forward).
+    - journal: <spool_dir>/<experiment>/journal-*.jsonl, 적용 위치는 *.offset 파일에 기록 → 크래시 후 이어서 재전송
+    - 로컬 run ID → 서버 run ID 매핑은 run_map.json에 저장, 서버 run에는 tags.offline.local_run_id를 남겨
+      매핑 저장 전에 죽었더라도 같은 run을 다시 만들지 않음 (idempotent)
+    - 연속된 metric/param/tag는 run별로 모아서 log_batch로 전송
+    - 서버가 느리거나 재시작 중이면 지수 backoff로 재시도, 학습 코드는 기다리지 않음
+    - 같은 실험 spool을 쓰는 여러 프로세스의 동기화는 파일 잠금(.sync.lock)으로 직렬화하고 run_map.json은 잠금 안에서 다시 읽음
+    - journal을 쓰는 프로세스는 파일에 flock을 유지 → 잠금이 풀린(종료 / 크래시) 이전 세션 journal이 끝까지
+      전송되면 journal / offset / blob / run_map 항목을 삭제 (spool이 무한히 커지지 않음).
+      이번 세션 journal은 다음 세션이 정리 (close 후에도 server_run_id()로 매핑 확인 가능)
+    - 재시도해도 실패하는 레코드(_is_rejected)는 dead_letter.jsonl로 옮기고 다음 레코드로 진행 (spool이 멈추지 않음)
+    """
+
+    def __init__(
+        self,
+        experiment_name: str,
+        spool_dir: Optional[os.PathLike] = None,
+        sync: bool = True,
+        sync_interval: float = 2.0,
+        fsync: bool = False,
+        client=None,
+    ):
+        self.experiment_name = experiment_name
+        self.root = Path(spool_dir or DEFAULT_SPOOL_DIR) / experiment_name
+        self.blob_dir = self.root / "blobs"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.map_path = self.root / "run_map.json"
+        self.dead_letter_path = self.root / "dead_letter.jsonl"
+        self.fsync = fsync
+        self.sync_interval = sync_interval
+        self._client = client
+
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._journal_path = self.root / f"journal-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}.jsonl"
+        self._journal = open(self._journal_path, "a", encoding="utf-8")
+        fcntl.flock(self._journal.fileno(), fcntl.LOCK_EX)  # 쓰는 동안 다른 프로세스가 정리하지 않도록
+        self._seq = 0
+        self._run_map: Dict[str, str] = self._load_run_map()
+        self._experiment_id: Optional[str] = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._last_error: Optional[BaseException] = None
+
+        self._thread = None
+        if sync:
+            self._thread = threading.Thread(target=self._sync_loop, name="mlflow-offline-sync", daemon=True)
+            self._thread.start()
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = mlflow.tracking.MlflowClient()
+        return self._client
+
+    # ---- 기록 ----
+    def start_run(self, run_name: Optional[str] = None, tags: Optional[Dict[str, Any]] = None,
+                  parent: Optional[OfflineRun] = None) -> OfflineRun:
+        local_id = uuid.uuid4().hex
+        self._append({"op": "create_run", "run": local_id, "run_name": run_name, "ts": _now_ms(),
+                      "tags": {k: str(v) for k, v in (tags or {}).items()},
+                      "parent": parent.run_id if parent else None})
+        return OfflineRun(self, local_id)
+
+    def _append(self, record: Dict[str, Any]):
+        with self._lock:
+            self._seq += 1
+            record["seq"] = self._seq
+            self._journal.write(json.dumps(record) + "\n")
+            self._journal.flush()
+            if self.fsync:
+                os.fsync(self._journal.fileno())
+
+    def server_run_id(self, local_run_id: str) -> Optional[str]:
+        return self._run_map.get(local_run_id)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """지금까지 journal에 쓴 내용을 서버로 모두 보낼 때까지 대기 (성공 여부 반환)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                if self.sync_once() == 0 and self.pending_bytes() == 0:
+                    return True
+            except Exception as e:
+                self._last_error = e
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(min(self.sync_interval, 1.0))
+
+    def close(self, flush_timeout: Optional[float] = 30.0):
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join()
+        if flush_timeout:
+            if not self.flush(flush_timeout):
+                logging.warning(f"[OfflineTracker] not fully synced; remaining data stays in {self.root}")
+        with self._lock:
+            self._journal.close()  # flock 해제 → 다음 세션의 정리 대상이 됨
+
+    def pending_bytes(self) -> int:
+        return sum(max(0, p.stat().st_size - self._read_offset(p)) for p in sorted(self.root.glob("journal-*.jsonl")))
+
+    # ---- 동기화 ----
+    def _sync_loop(self):
+        backoff = self.sync_interval
+        while not self._stop.is_set():
+            try:
+                self.sync_once()
+                backoff = self.sync_interval
+            except Exception as e:  # 서버 장애: 데이터는 journal에 남아 있으므로 나중에 재시도
+                self._last_error = e
+                logging.warning(f"[OfflineTracker] sync failed, retry in {backoff:.0f}s: {e}")
+                backoff = min(backoff * 2, 60.0)
+            self._wake.wait(backoff)
+            self._wake.clear()
+
+    @staticmethod
+    def _offset_path(journal: Path) -> Path:
+        return journal.with_suffix(".offset")
+
+    def _read_offset(self, journal: Path) -> int:
+        p = self._offset_path(journal)
+        return int(p.read_text()) if p.exists() else 0
+
+    def _write_offset(self, journal: Path, offset: int):
+        tmp = self._offset_path(journal).with_suffix(".offset.tmp")
+        tmp.write_text(str(offset))
+        os.replace(tmp, self._offset_path(journal))
+
+    def _load_run_map(self) -> Dict[str, str]:
+        return json.loads(self.map_path.read_text()) if self.map_path.exists() else {}
+
+    def _save_run_map(self):
+        tmp = self.map_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._run_map, indent=2))
+        os.replace(tmp, self.map_path)
+
+    @contextmanager
+    def _spool_lock(self):
+        """같은 spool을 동기화하는 모든 프로세스 / 스레드 사이의 배타 잠금"""
+        with self._sync_lock, open(self.root / ".sync.lock", "a") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _writer_alive(journal: Path) -> bool:
+        with open(journal, "rb") as f:
+            try:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return True
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            return False
+
+    def sync_once(self) -> int:
+        """모든 journal(이전 세션 포함)의 미전송 레코드를 순서대로 재전송, 적용한 레코드 수 반환"""
+        with self._spool_lock():
+            # 다른 프로세스가 만든 매핑을 반영 (덮어쓰지 않도록 잠금 안에서 다시 읽음)
+            self._run_map = self._load_run_map()
+            applied = 0
+            for journal in sorted(self.root.glob("journal-*.jsonl")):
+                applied += self._replay(journal)
+                if journal != self._journal_path and self._read_offset(journal) >= journal.stat().st_size \
+                        and not self._writer_alive(journal):
+                    self._compact(journal)
+            return applied
+
+    def _compact(self, journal: Path):
+        """끝까지 전송되었고 쓰는 프로세스도 없는 이전 세션 journal과 그 blob / offset / run_map 항목 삭제"""
+        local_runs = []
+        with open(journal, "rb") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                if rec["op"] == "artifact":
+                    shutil.rmtree(Path(rec["path"]).parent, ignore_errors=True)
+                elif rec["op"] == "create_run":
+                    local_runs.append(rec["run"])
+        for run in local_runs:
+            self._run_map.pop(run, None)
+        self._save_run_map()
+        self._offset_path(journal).unlink(missing_ok=True)
+        journal.unlink()
+
+    def _dead_letter(self, journal: Path, rec: Dict[str, Any], error: BaseException):
+        logging.warning(f"[OfflineTracker] moved {rec.get('op')} record to {self.dead_letter_path.name}: {error!r}")
+        with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"journal": journal.name, "record": rec, "error": repr(error)}) + "\n")
+
+    def _log_batch(self, run_id: str, recs: List[Dict[str, Any]]):
+        from mlflow.entities import Metric, Param, RunTag
+
+        kinds = {"metric": [], "param": [], "tag": []}
+        for r in recs:
+            kinds[r["op"]].append(r)
+        self.client.log_batch(
+            run_id,
+            metrics=[Metric(r["key"], r["value"], r["ts"], r["step"]) for r in kinds["metric"]],
+            params=[Param(r["key"], r["value"]) for r in kinds["param"]],
+            tags=[RunTag(r["key"], r["value"]) for r in kinds["tag"]],
+        )
+
+    def _replay(self, journal: Path) -> int:
+        offset = self._read_offset(journal)
+        with open(journal, "rb") as f:
+            f.seek(offset)
+            lines = []
+            while True:
+                line = f.readline()
+                if not line.endswith(b"\n"):  # 쓰는 중인 마지막 줄은 다음 번에
+                    break
+                try:
+                    rec = json.loads(line)
+                except ValueError:  # 깨진 줄 → _apply에서 거부되어 dead letter로
+                    rec = {"op": "corrupt", "raw": line.decode("utf-8", errors="replace")}
+                lines.append((f.tell(), rec))
+        if not lines:
+            return 0
+
+        pending: Dict[str, Dict[str, List]] = {}
+        applied_offset = offset
+
+        def flush_pending():
+            for run_id, items in pending.items():
+                m, p, t = items["metric"], items["param"], items["tag"]
+                while m or p or t:
+                    bp, p = p[:MAX_BATCH_PARAMS], p[MAX_BATCH_PARAMS:]
+                    bt, t = t[:MAX_BATCH_TAGS], t[MAX_BATCH_TAGS:]
+                    n = MAX_BATCH_METRICS - len(bp) - len(bt)
+                    bm, m = m[:n], m[n:]
+                    try:
+                        self._log_batch(run_id, bm + bp + bt)
+                    except Exception as e:
+                        if not _is_rejected(e):
+                            raise
+                        # 서버가 batch를 거부 → 레코드별로 다시 보내 거부된 것만 격리
+                        for r in bm + bp + bt:
+                            try:
+                                self._log_batch(run_id, [r])
+                            except Exception as e:
+                                if not _is_rejected(e):
+                                    raise
+                                self._dead_letter(journal, r, e)
+            pending.clear()
+
+        n = 0
+        for end_offset, rec in lines:
+            op = rec.get("op")
+            try:
+                if op in ("metric", "param", "tag"):
+                    run_id = self._run_map[rec["run"]]
+                    bucket = pending.setdefault(run_id, {"metric": [], "param": [], "tag": []})
+                    bucket[op].append(rec)
+                    if sum(len(v) for v in bucket.values()) >= MAX_BATCH_METRICS:
+                        flush_pending()
+                        applied_offset = end_offset
+                        self._write_offset(journal, applied_offset)
+                else:
+                    flush_pending()
+                    self._apply(rec)
+                    applied_offset = end_offset
+                    self._write_offset(journal, applied_offset)
+            except Exception as e:
+                if not _is_rejected(e):
+                    raise  # 서버 장애 등: offset을 그대로 두고 다음 sync에서 재시도
+                self._dead_letter(journal, rec, e)
+                if not pending:  # 앞선 레코드가 모두 전송됐으면 격리한 레코드 뒤로 offset 이동
+                    applied_offset = end_offset
+                    self._write_offset(journal, applied_offset)
+            n += 1
+
+        flush_pending()
+        self._write_offset(journal, lines[-1][0])
+        return n
+
+    def _ensure_experiment(self) -> str:
+        if self._experiment_id is None:
+            exp = self.client.get_experiment_by_name(self.experiment_name)
+            self._experiment_id = exp.experiment_id if exp else self.client.create_experiment(self.experiment_name)
+        return self._experiment_id
+
+    def _apply(self, rec: Dict[str, Any]):
+        op = rec["op"]
+        if op == "create_run":
+            if rec["run"] in self._run_map:
+                return
+            exp_id = self._ensure_experiment()
+            # 매핑 저장 전에 크래시한 경우: 이미 만들어진 run을 태그로 찾아 재사용
+            existing = self.client.search_runs(
+                [exp_id], filter_string=f"tags.`{LOCAL_RUN_ID_TAG}` = '{rec['run']}'", max_results=1
+            )
+            if existing:
+                server_id = existing[0].info.run_id
+            else:
+                tags = {**rec["tags"], LOCAL_RUN_ID_TAG: rec["run"]}
+                if rec.get("run_name"):
+                    tags["mlflow.runName"] = rec["run_name"]
+                if rec.get("parent"):
+                    tags["mlflow.parentRunId"] = self._run_map[rec["parent"]]
+                server_id = self.client.create_run(exp_id, start_time=rec["ts"], tags=tags,
+                                                   run_name=rec.get("run_name")).info.run_id
+            self._run_map[rec["run"]] = server_id
+            self._save_run_map()
+        elif op == "artifact":
+            self.client.log_artifact(self._run_map[rec["run"]], rec["path"], rec.get("artifact_path"))
+        elif op == "end_run":
+            self.client.set_terminated(self._run_map[rec["run"]], status=rec["status"], end_time=rec["ts"])
+        else:
+            raise ValueError(f"Unknown journal op: {op!r}")
+
+
+if __name__ == "__main__":
+    # 남은 spool을 수동으로 재전송: python -m src.offline <experiment_name>
+    import sys
+
+    tracker = OfflineTracker(sys.argv[1], sync=False)
+    ok = tracker.flush(timeout=float(os.getenv("SYNC_TIMEOUT", "300")))
+    print(f"[{'OK' if ok else 'PARTIAL'}] pending bytes: {tracker.pending_bytes()}")
+    tracker.close(flush_timeout=None)
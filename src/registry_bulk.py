@@ -0,0 +1,218 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from src.rest_client import RegistryRestClient
+
+DEFAULT_CACHE_DIR = Path(os.getenv("REGISTRY_CACHE_DIR", Path.home() / ".cache" / "mlflow-study" / "registry"))
+STAGES = ("None", "Staging", "Production", "Archived")
+
+
+def load_manifest(path: os.PathLike) -> List[Dict[str, Any]]:
+    """
+    JSON / YAML 매니페스트 → 항목 리스트. 최상위가 리스트이거나 {"defaults": {...}, "changes": [...]}.
+    항목 예) {"model": "iris_clf", "version": 3, "stage": "Production", "aliases": ["prod"]}
+      - model 대신 model_like: "iris_%" (LIKE 패턴으로 여러 모델에 적용)
+      - version: 정수 | "latest" | "stage:Staging" | "alias:champion"
+      - archive_existing (기본 true), remove_aliases: [...]
+    """
+    text = Path(path).read_text()
+    if str(path).endswith((".yaml", ".yml")):
+        import yaml
+
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+    if isinstance(data, list):
+        return data
+    defaults = data.get("defaults", {})
+    return [{**defaults, **entry} for entry in data.get("changes", [])]
+
+
+class RegistryState:
+    """
+    모델별 현재 stage / alias 맵의 로컬 캐시 (tracking URI별 JSON 파일, ttl초 동안 유효).
+    - {model: {"stages": {version: stage}, "aliases": {alias: version}, "fetched_at": ts}}
+    - 만료되었거나 없는 모델만 search_model_versions로 병렬 조회
+    """
+
+    def __init__(self, client: RegistryRestClient, cache_dir: Optional[os.PathLike] = None, ttl: float = 300.0):
+        self.client = client
+        self.ttl = ttl
+        key = "".join(c if c.isalnum() else "_" for c in client.base_url)[:80]
+        self.path = Path(cache_dir or DEFAULT_CACHE_DIR) / f"{key}.json"
+        self._lock = threading.Lock()
+        self.models: Dict[str, Dict[str, Any]] = json.loads(self.path.read_text()) if self.path.exists() else {}
+
+    def _fetch(self, name: str) -> Dict[str, Any]:
+        stages, aliases = {}, {}
+        for v in self.client.search_model_versions(f"name='{name}'"):
+            stages[str(v["version"])] = v.get("current_stage", "None")
+            for a in v.get("aliases") or []:
+                aliases[a] = str(v["version"])
+        return {"stages": stages, "aliases": aliases, "fetched_at": time.time()}
+
+    def ensure(self, names: Iterable[str], refresh: bool = False, max_workers: int = 16):
+        now = time.time()
+        stale = [n for n in set(names) if refresh or now - self.models.get(n, {}).get("fetched_at", 0) > self.ttl]
+        if stale:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                for name, state in zip(stale, pool.map(self._fetch, stale)):
+                    self.models[name] = state
+            self.save()
+
+    def invalidate(self, name: str):
+        with self._lock:
+            self.models.pop(name, None)
+
+    def save(self):
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.models))
+            os.replace(tmp, self.path)
+
+
+def expand_models(client: RegistryRestClient, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """model_like 항목을 실제 모델 이름별 항목으로 펼침 (페이지 단위 스트리밍 조회)"""
+    out = []
+    for e in entries:
+        if "model_like" in e:
+            pattern = e["model_like"]
+            for m in client.search_registered_models(f"name LIKE '{pattern}'"):
+                out.append({**{k: v for k, v in e.items() if k != "model_like"}, "model": m["name"]})
+        else:
+            out.append(e)
+    return out
+
+
+def _resolve_version(selector, state: Dict[str, Any]) -> Optional[str]:
+    if selector is None:
+        return None
+    s = str(selector)
+    if s.isdigit():
+        return s if s in state["stages"] else None
+    if s == "latest":
+        return max(state["stages"], key=int) if state["stages"] else None
+    if s.startswith("stage:"):
+        matches = [v for v, st in state["stages"].items() if st == s[len("stage:"):]]
+        return max(matches, key=int) if matches else None
+    if s.startswith("alias:"):
+        return state["aliases"].get(s[len("alias:"):])
+    raise ValueError(f"Unknown version selector: {selector!r}")
+
+
+def plan_changes(entries: List[Dict[str, Any]], state: RegistryState) -> List[Dict[str, Any]]:
+    """
+    매니페스트를 현재 상태와 비교해 실제로 바뀌는 항목만 반환 (dry-run diff).
+    - 항목 순서대로 가상 상태에 반영하므로 뒤 항목은 앞 항목의 결과를 기준으로 계산
+    - archive_existing으로 서버가 함께 보관(Archived) 처리할 버전은 implied=True로 표시
+    """
+    sim = json.loads(json.dumps({m: state.models[m] for m in {e["model"] for e in entries}}))
+    changes = []
+    for e in entries:
+        name = e["model"]
+        st = sim[name]
+        version = _resolve_version(e.get("version"), st)
+        if version is None and (e.get("version") is not None or e.get("stage") or e.get("aliases")):
+            reason = "version not found" if e.get("version") is not None else "version is required"
+            changes.append({"model": name, "version": e.get("version"), "action": "error",
+                            "before": None, "after": reason})
+            continue
+
+        stage = e.get("stage")
+        if stage is not None:
+            if stage not in STAGES:
+                raise ValueError(f"Invalid stage {stage!r} for {name}")
+            archive = bool(e.get("archive_existing", True))
+            if st["stages"][version] != stage:
+                changes.append({"model": name, "version": version, "action": "stage",
+                                "before": st["stages"][version], "after": stage, "archive_existing": archive})
+                if archive and stage in ("Staging", "Production"):
+                    for v, cur in st["stages"].items():
+                        if v != version and cur == stage:
+                            changes.append({"model": name, "version": v, "action": "stage", "before": cur,
+                                            "after": "Archived", "implied": True})
+                            st["stages"][v] = "Archived"
+                st["stages"][version] = stage
+
+        aliases = e.get("aliases") or []
+        for alias in [aliases] if isinstance(aliases, str) else aliases:
+            if st["aliases"].get(alias) != version:
+                changes.append({"model": name, "version": version, "action": "set_alias", "alias": alias,
+                                "before": st["aliases"].get(alias), "after": version})
+                st["aliases"][alias] = version
+
+        for alias in e.get("remove_aliases") or []:
+            if alias in st["aliases"]:
+                changes.append({"model": name, "version": st["aliases"][alias], "action": "delete_alias",
+                                "alias": alias, "before": st["aliases"][alias], "after": None})
+                del st["aliases"][alias]
+    return changes
+
+
+def format_change(c: Dict[str, Any]) -> str:
+    target = f"{c['model']} v{c['version']}"
+    if c["action"] == "stage":
+        suffix = " (implied by archive_existing)" if c.get("implied") else ""
+        return f"~ {target:<32} stage  {c['before']} -> {c['after']}{suffix}"
+    if c["action"] == "set_alias":
+        return f"+ {target:<32} alias  @{c['alias']} (was v{c['before']})" if c["before"] else \
+            f"+ {target:<32} alias  @{c['alias']}"
+    if c["action"] == "delete_alias":
+        return f"- {target:<32} alias  @{c['alias']}"
+    return f"! {target:<32} {c['after']}"
+
+
+def apply_changes(
+    client: RegistryRestClient,
+    changes: List[Dict[str, Any]],
+    state: Optional[RegistryState] = None,
+    max_workers: int = 16,
+    on_result: Optional[Callable[[str, Optional[Exception]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    모델 단위로 묶어 병렬 실행 (같은 모델 안에서는 매니페스트 순서 유지: stage 전환 → alias).
+    - implied / error 항목은 실행하지 않음
+    - 실패한 모델은 캐시에서 제거 → 다음 실행 시 다시 조회
+    """
+    by_model: Dict[str, List[Dict[str, Any]]] = {}
+    for c in changes:
+        if c["action"] != "error" and not c.get("implied"):
+            by_model.setdefault(c["model"], []).append(c)
+
+    def run(name: str):
+        for c in by_model[name]:
+            if c["action"] == "stage":
+                # archive_existing_versions는 활성 stage(Staging / Production) 전환에서만 허용됨
+                archive = c["archive_existing"] and c["after"] in ("Staging", "Production")
+                client.transition_model_version_stage(name, c["version"], c["after"],
+                                                      archive_existing_versions=archive)
+            elif c["action"] == "set_alias":
+                client.set_registered_model_alias(name, c["alias"], c["version"])
+            elif c["action"] == "delete_alias":
+                client.delete_registered_model_alias(name, c["alias"])
+        return len(by_model[name])
+
+    t0 = time.perf_counter()
+    ok, failed = 0, {}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="registry") as pool:
+        futures = {pool.submit(run, name): name for name in by_model}
+        for fut in as_completed(futures):
+            name = futures[fut]
+            err = fut.exception()
+            if err is None:
+                ok += fut.result()
+            else:
+                failed[name] = str(err)
+            if state is not None:
+                state.invalidate(name)  # 다음 조회 때 서버 상태로 다시 채움
+            if on_result is not None:
+                on_result(name, err)
+    if state is not None:
+        state.save()
+    return {"applied": ok, "models": len(by_model), "failed": failed, "elapsed_s": time.perf_counter() - t0}
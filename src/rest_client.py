@@ -0,0 +1,199 @@
+import os
+from typing import Any, Dict, Iterator, Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# 재시도해도 안전한 메서드 (이 클라이언트의 POST / DELETE는 모두 멱등한 registry 변경)
+IDEMPOTENT_METHODS = frozenset({"GET", "POST", "DELETE"})
+
+
+def is_http_uri(uri: Optional[str]) -> bool:
+    return bool(uri) and uri.startswith(("http://", "https://"))
+
+
+class RegistryRestClient:
+    """
+    mlflow 패키지를 import하지 않고 Model Registry REST API(/api/2.0/mlflow)를 직접 호출하는 경량 클라이언트.
+    - list_versions.py / promote_stage.py 같은 짧은 CLI의 시작 시간 단축용
+    - 하나의 requests.Session(keep-alive 커넥션 풀)을 재사용
+      - pool_size: 동시 요청 수만큼 커넥션 유지 (여러 스레드에서 공유 가능)
+      - 429 / 5xx는 지수 backoff로 재시도 (POST / DELETE 포함: 여기서 쓰는 stage 전환 / alias 설정·삭제는
+        같은 요청을 다시 보내도 결과가 같음)
+    - 응답은 REST JSON(dict) 그대로 반환 (예: {"name", "version", "current_stage", "aliases", ...})
+    - http(s) tracking 서버 전용: file / sqlite 등 로컬 store는 registry_client()가 MlflowRegistryClient로 대체
+    """
+
+    def __init__(
+        self,
+        tracking_uri: Optional[str] = None,
+        timeout: float = 30.0,
+        session: Optional[requests.Session] = None,
+        pool_size: int = 10,
+        max_retries: int = 3,
+    ):
+        self.base_url = (tracking_uri or os.getenv("MLFLOW_TRACKING_URI", "")).rstrip("/")
+        if not is_http_uri(self.base_url):
+            raise ValueError(f"RegistryRestClient requires an http(s) tracking URI, got {self.base_url!r} "
+                             "(use registry_client() to fall back to MlflowClient)")
+        self.timeout = timeout
+        if session is None:
+            session = requests.Session()
+            retry = Retry(total=max_retries, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504),
+                          allowed_methods=IDEMPOTENT_METHODS)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+        user, password = os.getenv("MLFLOW_TRACKING_USERNAME"), os.getenv("MLFLOW_TRACKING_PASSWORD")
+        if user and password:
+            self.session.auth = (user, password)
+        if os.getenv("MLFLOW_TRACKING_TOKEN"):
+            self.session.headers["Authorization"] = f"Bearer {os.environ['MLFLOW_TRACKING_TOKEN']}"
+
+    def _call(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        resp = self.session.request(method, f"{self.base_url}/api/2.0/mlflow/{endpoint}", timeout=self.timeout, **kwargs)
+        if not resp.ok:
+            raise RuntimeError(f"{method} {endpoint} failed ({resp.status_code}): {resp.text}")
+        return resp.json() if resp.content else {}
+
+    def search_model_versions(
+        self, filter_string: str = "", page_size: int = 200, order_by: Optional[list] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """페이지 단위로 가져오며 한 건씩 yield (전체 목록을 메모리에 올리지 않음)"""
+        token = None
+        while True:
+            params: Dict[str, Any] = {"filter": filter_string, "max_results": page_size}
+            if order_by:
+                params["order_by"] = order_by
+            if token:
+                params["page_token"] = token
+            data = self._call("GET", "model-versions/search", params=params)
+            yield from data.get("model_versions", [])
+            token = data.get("next_page_token")
+            if not token:
+                return
+
+    def search_registered_models(self, filter_string: str = "", page_size: int = 200) -> Iterator[Dict[str, Any]]:
+        token = None
+        while True:
+            params: Dict[str, Any] = {"filter": filter_string, "max_results": page_size}
+            if token:
+                params["page_token"] = token
+            data = self._call("GET", "registered-models/search", params=params)
+            yield from data.get("registered_models", [])
+            token = data.get("next_page_token")
+            if not token:
+                return
+
+    def get_registered_model(self, name: str) -> Dict[str, Any]:
+        """aliases: [{"alias", "version"}, ...] 포함"""
+        return self._call("GET", "registered-models/get", params={"name": name}).get("registered_model", {})
+
+    def transition_model_version_stage(
+        self, name: str, version, stage: str, archive_existing_versions: bool = False
+    ) -> Dict[str, Any]:
+        return self._call(
+            "POST",
+            "model-versions/transition-stage",
+            json={
+                "name": name,
+                "version": str(version),
+                "stage": stage,
+                "archive_existing_versions": archive_existing_versions,
+            },
+        ).get("model_version", {})
+
+    def set_registered_model_alias(self, name: str, alias: str, version) -> None:
+        self._call("POST", "registered-models/alias", json={"name": name, "alias": alias, "version": str(version)})
+
+    def delete_registered_model_alias(self, name: str, alias: str) -> None:
+        self._call("DELETE", "registered-models/alias", json={"name": name, "alias": alias})
+
+
+def _version_dict(mv) -> Dict[str, Any]:
+    """MlflowClient ModelVersion → REST 응답과 같은 형태의 dict"""
+    return {
+        "name": mv.name,
+        "version": str(mv.version),
+        "current_stage": mv.current_stage,
+        "aliases": list(getattr(mv, "aliases", None) or []),
+        "creation_timestamp": mv.creation_timestamp,
+        "last_updated_timestamp": mv.last_updated_timestamp,
+        "run_id": mv.run_id,
+        "source": mv.source,
+        "status": mv.status,
+        "description": mv.description,
+    }
+
+
+class MlflowRegistryClient:
+    """
+    RegistryRestClient와 같은 메서드 / dict 응답을 MlflowClient로 제공 (file / sqlite 등 http가 아닌 tracking URI용).
+    - 이 경우에는 mlflow를 import하므로 빠른 시작 이점은 없음
+    """
+
+    def __init__(self, tracking_uri: Optional[str] = None):
+        from mlflow.tracking import MlflowClient
+
+        self.client = MlflowClient(tracking_uri=tracking_uri)
+        self.base_url = self.client.tracking_uri
+
+    def search_model_versions(
+        self, filter_string: str = "", page_size: int = 200, order_by: Optional[list] = None
+    ) -> Iterator[Dict[str, Any]]:
+        token = None
+        while True:
+            page = self.client.search_model_versions(filter_string, max_results=page_size, order_by=order_by,
+                                                     page_token=token)
+            yield from (_version_dict(mv) for mv in page)
+            token = page.token
+            if not token:
+                return
+
+    def search_registered_models(self, filter_string: str = "", page_size: int = 200) -> Iterator[Dict[str, Any]]:
+        token = None
+        while True:
+            page = self.client.search_registered_models(filter_string, max_results=page_size, page_token=token)
+            yield from (self._model_dict(m) for m in page)
+            token = page.token
+            if not token:
+                return
+
+    @staticmethod
+    def _model_dict(m) -> Dict[str, Any]:
+        return {
+            "name": m.name,
+            "aliases": [{"alias": a, "version": str(v)} for a, v in (getattr(m, "aliases", None) or {}).items()],
+            "latest_versions": [_version_dict(mv) for mv in m.latest_versions or []],
+        }
+
+    def get_registered_model(self, name: str) -> Dict[str, Any]:
+        return self._model_dict(self.client.get_registered_model(name))
+
+    def transition_model_version_stage(
+        self, name: str, version, stage: str, archive_existing_versions: bool = False
+    ) -> Dict[str, Any]:
+        return _version_dict(self.client.transition_model_version_stage(
+            name, str(version), stage, archive_existing_versions=archive_existing_versions
+        ))
+
+    def set_registered_model_alias(self, name: str, alias: str, version) -> None:
+        self.client.set_registered_model_alias(name, alias, str(version))
+
+    def delete_registered_model_alias(self, name: str, alias: str) -> None:
+        self.client.delete_registered_model_alias(name, alias)
+
+
+def registry_client(tracking_uri: Optional[str] = None, **kwargs) -> Union[RegistryRestClient, MlflowRegistryClient]:
+    """
+    tracking URI에 맞는 registry 클라이언트.
+    - http(s)면 RegistryRestClient(**kwargs) (mlflow import 없음)
+    - 그 외(file:, sqlite:, 미설정 → 기본 ./mlruns)는 MlflowClient 기반 MlflowRegistryClient
+    """
+    uri = tracking_uri or os.getenv("MLFLOW_TRACKING_URI")
+    if is_http_uri(uri):
+        return RegistryRestClient(uri, **kwargs)
+    return MlflowRegistryClient(uri)
@@ -0,0 +1,157 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_INDEX_DIR = Path(os.getenv("RUN_INDEX_DIR", Path.home() / ".cache" / "mlflow-study" / "run_index"))
+# 이 간격(초)마다 실험 전체를 다시 조회 (종료 후에 바뀐 태그 반영, 삭제된 run 제거)
+FULL_SYNC_INTERVAL = float(os.getenv("RUN_INDEX_FULL_SYNC_S", "3600"))
+
+
+class RunIndex:
+    """
+    실험의 run / params / 최종 metrics / tags를 로컬 Parquet 파일로 동기화한 컬럼형 인덱스.
+    - sync(): 마지막 동기화 이후 종료된 run(end_time >= watermark)과 아직 RUNNING인 run만 가져와 병합
+      (run_id 기준으로 최신 값으로 교체). full_sync_interval마다 또는 sync(full=True)면 실험 전체를 다시 조회해
+      종료 후에 기록된 태그(model_logged, trial_state 등)를 반영하고 삭제된 run을 제거
+    - 인덱스의 태그는 마지막 전체 동기화 시점 기준일 수 있으므로, 결정에 쓰는 태그는 서버에서 다시 확인할 것
+    - 조회(top_k / best_child / compare)는 서버 왕복 없이 pandas/NumPy로 로컬에서 처리
+    - 컬럼 이름은 mlflow.search_runs(output_format="pandas")와 동일 (metrics.*, params.*, tags.*)
+    """
+
+    def __init__(self, experiment_name: str, index_dir: Optional[os.PathLike] = None, client=None,
+                 full_sync_interval: float = FULL_SYNC_INTERVAL):
+        self.experiment_name = experiment_name
+        self.full_sync_interval = full_sync_interval
+        self.index_dir = Path(index_dir or DEFAULT_INDEX_DIR)
+        self._client = client
+        self._df: Optional[pd.DataFrame] = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            from mlflow.tracking import MlflowClient
+
+            self._client = MlflowClient()
+        return self._client
+
+    @property
+    def _base(self) -> Path:
+        import mlflow
+
+        # tracking 서버가 바뀌어도 섞이지 않도록 URI별로 분리
+        uri_key = "".join(c if c.isalnum() else "_" for c in mlflow.get_tracking_uri())[:80]
+        return self.index_dir / uri_key / self.experiment_name
+
+    @property
+    def _data_path(self) -> Path:
+        return self._base.with_suffix(".parquet")
+
+    @property
+    def _state_path(self) -> Path:
+        return self._base.with_suffix(".state.json")
+
+    def _read_state(self) -> Dict:
+        if self._state_path.exists():
+            return json.loads(self._state_path.read_text())
+        return {"watermark_ms": 0, "full_sync_at": 0}
+
+    # ---- 동기화 ----
+    def sync(self, full: bool = False) -> int:
+        """변경된 run만 가져와 인덱스를 갱신, 새로 가져온 run 수를 반환 (full=True면 전체 재조회)"""
+        import mlflow
+
+        exp = self.client.get_experiment_by_name(self.experiment_name)
+        if exp is None:
+            raise RuntimeError(f"Experiment '{self.experiment_name}' not found.")
+        state = self._read_state()
+        wm = int(state["watermark_ms"])
+        full_sync_at = float(state.get("full_sync_at", 0))
+        full = full or time.time() - full_sync_at > self.full_sync_interval
+
+        if full:
+            # 삭제된 run은 결과에 없으므로 인덱스를 통째로 교체
+            fetched = [mlflow.search_runs([exp.experiment_id], max_results=100_000, output_format="pandas")]
+            full_sync_at = time.time()
+        else:
+            # 같은 end_time의 run을 놓치지 않도록 >= (이미 있는 run은 run_id로 교체)
+            fetched = [
+                mlflow.search_runs([exp.experiment_id], filter_string=f"attributes.end_time >= {wm}",
+                                   max_results=100_000, output_format="pandas"),
+                mlflow.search_runs([exp.experiment_id], filter_string="attributes.status = 'RUNNING'",
+                                   max_results=100_000, output_format="pandas"),
+            ]
+        new = pd.concat([f for f in fetched if len(f)], ignore_index=True) if any(len(f) for f in fetched) else None
+
+        df = self.load()
+        if full:
+            df = new.drop_duplicates("run_id", keep="last") if new is not None else pd.DataFrame({"run_id": []})
+        if new is not None and len(new):
+            new = new.drop_duplicates("run_id", keep="last")
+            df = pd.concat([df[~df["run_id"].isin(new["run_id"])], new], ignore_index=True) if len(df) else new
+            end_ms = pd.to_datetime(new["end_time"], utc=True).dropna()
+            if len(end_ms):
+                wm = max(wm, int(end_ms.max().value // 1_000_000))
+
+        self._base.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._data_path.with_suffix(".tmp")
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, self._data_path)
+        tmp = self._state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"watermark_ms": wm, "full_sync_at": full_sync_at, "experiment_id": exp.experiment_id}))
+        os.replace(tmp, self._state_path)
+        self._df = df
+        return 0 if new is None else len(new)
+
+    def load(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        if self._df is None:
+            self._df = pd.read_parquet(self._data_path) if self._data_path.exists() else pd.DataFrame({"run_id": []})
+        return self._df if columns is None else self._df[columns]
+
+    # ---- 조회 ----
+    def query(
+        self,
+        tags: Optional[Dict[str, str]] = None,
+        status: Optional[str] = "FINISHED",
+        parent_run_id: Optional[str] = None,
+    ) -> pd.DataFrame:
+        df = self.load()
+        mask = np.ones(len(df), dtype=bool)
+        if status is not None and "status" in df:
+            mask &= (df["status"] == status).to_numpy()
+        if parent_run_id is not None:
+            col = "tags.mlflow.parentRunId"
+            mask &= (df[col] == parent_run_id).to_numpy() if col in df else False
+        for k, v in (tags or {}).items():
+            col = f"tags.{k}"
+            mask &= (df[col] == v).to_numpy() if col in df else False
+        return df[mask]
+
+    def top_k(self, metric: str, k: int = 1, ascending: bool = False, **query) -> pd.DataFrame:
+        """metric 기준 상위 k개 (NaN 제외, 동률은 최신 start_time 우선)"""
+        col = f"metrics.{metric}"
+        df = self.query(**query)
+        if col not in df:
+            return df.iloc[0:0]
+        df = df[df[col].notna()]
+        return df.sort_values([col, "start_time"], ascending=[ascending, False]).head(k)
+
+    def latest_parent(self, run_name: str, tags: Optional[Dict[str, str]] = None):
+        df = self.query(tags={"mlflow.runName": run_name, **(tags or {})})
+        if not len(df):
+            return None
+        return df.sort_values("start_time", ascending=False).iloc[0]
+
+    def compare(self, parent_run_ids: Iterable[str], metric: str) -> pd.DataFrame:
+        """여러 study(parent run)의 child metric 분포를 한 표로 비교"""
+        col = f"metrics.{metric}"
+        df = self.query()
+        parent_col = "tags.mlflow.parentRunId"
+        if col not in df or parent_col not in df:
+            return pd.DataFrame()
+        df = df[df[parent_col].isin(list(parent_run_ids))]
+        return df.groupby(parent_col)[col].agg(["count", "mean", "std", "min", "max", "median"])
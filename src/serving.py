@@ -0,0 +1,243 @@
+import asyncio
+import logging
+import time
+from collections import Counter, deque
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.model_cache import ModelCache
+
+
+def input_spec(model) -> Optional[Dict[str, np.dtype]]:
+    """모델 signature의 입력 컬럼 → numpy dtype (이름 있는 스키마가 없으면 None)"""
+    metadata = getattr(model, "metadata", None)
+    schema = metadata.get_input_schema() if metadata is not None else None
+    if schema is None or not schema.has_input_names():
+        return None
+    try:
+        return dict(zip(schema.input_names(), schema.numpy_types()))
+    except Exception:  # numpy로 표현할 수 없는 타입(tensor 등)은 검증 생략
+        return None
+
+
+class InvalidRequest(ValueError):
+    """signature와 맞지 않는 요청 (→ 400, 모델 / 서버 오류는 500)"""
+
+
+def validate_row(row: Dict[str, Any], spec: Optional[Dict[str, np.dtype]]):
+    """요청 하나의 feature 키 / 타입을 signature와 비교 (틀리면 InvalidRequest → 그 요청만 400)"""
+    if spec is None:
+        return
+    missing = [c for c in spec if c not in row]
+    extra = [c for c in row if c not in spec]
+    if missing or extra:
+        raise InvalidRequest(f"features mismatch: missing={missing}, unexpected={extra}")
+    for col, dtype in spec.items():
+        v = row[col]
+        if dtype.kind in "iu":
+            ok = isinstance(v, (int, np.integer)) and not isinstance(v, bool)
+        elif dtype.kind == "f":
+            ok = isinstance(v, (int, float, np.number)) and not isinstance(v, bool)
+        elif dtype.kind == "b":
+            ok = isinstance(v, (bool, np.bool_))
+        elif dtype.kind in "USO":
+            ok = isinstance(v, str)
+        else:
+            ok = True
+        if not ok:
+            raise InvalidRequest(f"feature {col!r}: expected {dtype}, got {type(v).__name__}")
+
+
+class MicroBatcher:
+    """
+    단건 요청을 큐에 모아 한 번의 벡터화 predict로 처리하는 마이크로 배처.
+    - 첫 요청이 들어오면 max_wait_ms 동안(또는 max_batch_size개까지) 더 모은 뒤 predict
+    - predict는 이벤트 루프를 막지 않도록 스레드에서 실행
+    - swap_model()로 모델 교체 시 진행 중인 배치는 기존 모델로 끝나고, 다음 배치부터 새 모델 사용
+    - 요청은 큐에 넣기 전에 모델 signature로 검증하고, 배치는 signature의 컬럼 순서 / dtype으로 구성
+      (한 요청 때문에 다른 요청의 컬럼 dtype이 바뀌지 않음)
+    - 배치 predict가 실패하면 요청별로 다시 predict → 문제 있는 요청만 실패
+    """
+
+    def __init__(self, model, max_batch_size: int = 64, max_wait_ms: float = 5.0, latency_window: int = 10000):
+        self.model = model
+        self._spec = input_spec(model)
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: "asyncio.Queue" = asyncio.Queue()
+        self._latencies = deque(maxlen=latency_window)
+        self._batch_sizes: Counter = Counter()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def predict(self, row: Dict[str, Any]):
+        validate_row(row, self._spec)
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, fut, time.perf_counter()))
+        return await fut
+
+    def swap_model(self, model):
+        self._spec = input_spec(model)
+        self.model = model
+
+    @staticmethod
+    def _frame(rows, spec) -> pd.DataFrame:
+        if spec is None:
+            return pd.DataFrame(list(rows))
+        return pd.DataFrame(list(rows), columns=list(spec)).astype(spec)
+
+    @classmethod
+    def _predict_each(cls, model, rows, spec) -> list:
+        """요청별 predict → [(ok, 결과 또는 예외)]"""
+        out = []
+        for row in rows:
+            try:
+                out.append((True, np.asarray(model.predict(cls._frame([row], spec)))[0].tolist()))
+            except Exception as e:
+                out.append((False, e))
+        return out
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            model, spec = self.model, self._spec  # 이 배치에서 사용할 모델을 고정
+            rows, futs, starts = zip(*batch)
+            try:
+                preds = np.asarray(await asyncio.to_thread(lambda: model.predict(self._frame(rows, spec))))
+                results = [(True, p.tolist()) for p in preds]
+            except Exception as e:
+                if len(rows) == 1:
+                    results = [(False, e)]
+                else:
+                    logging.warning(f"[MicroBatcher] batch predict failed ({e}); retrying {len(rows)} rows one by one")
+                    results = await asyncio.to_thread(self._predict_each, model, rows, spec)
+            for fut, (ok, value) in zip(futs, results):
+                if fut.done():
+                    continue
+                if ok:
+                    fut.set_result(value)
+                else:
+                    fut.set_exception(value)
+
+            now = time.perf_counter()
+            self._latencies.extend((now - s) * 1000 for s in starts)
+            self._batch_sizes[len(batch)] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lat = np.asarray(self._latencies) if self._latencies else None
+        return {
+            "queue_depth": self._queue.qsize(),
+            "latency_ms": None if lat is None else {
+                f"p{p}": float(np.percentile(lat, p)) for p in (50, 90, 95, 99)
+            },
+            "batch_size_histogram": {str(k): v for k, v in sorted(self._batch_sizes.items())},
+        }
+
+
+def create_app(
+    model_uri: str,
+    max_batch_size: int = 64,
+    max_wait_ms: float = 5.0,
+    refresh_interval: float = 30.0,
+    cache: Optional[ModelCache] = None,
+):
+    """
+    model_uri(예: models:/iris_xgb@champion)를 서빙하는 FastAPI 앱.
+    - 시작 시 한 번만 로드, 이후 refresh_interval초마다 alias/stage가 가리키는 버전을 확인해
+      바뀌었으면 백그라운드에서 로드 후 hot-swap (요청은 끊기지 않음)
+    - POST /predict   : {"features": {col: value, ...}} 단건 예측
+    - POST /reload    : 즉시 버전 재확인
+    - GET  /metrics   : 지연시간 백분위수 / 배치 크기 히스토그램 / 현재 버전
+    """
+    from fastapi import FastAPI, HTTPException
+    from pydantic import BaseModel
+
+    cache = cache or ModelCache()
+    state: Dict[str, Any] = {}
+
+    class PredictRequest(BaseModel):
+        features: Dict[str, Any]
+
+    async def reload() -> bool:
+        cache.invalidate(model_uri)
+        resolved = await asyncio.to_thread(cache.resolve, model_uri)
+        if resolved == state.get("resolved_uri"):
+            return False
+        model = await asyncio.to_thread(cache.load, resolved)
+        state["batcher"].swap_model(model)
+        logging.info(f"[serving] {model_uri}: {state.get('resolved_uri')} -> {resolved}")
+        state["resolved_uri"] = resolved
+        return True
+
+    async def refresh_loop():
+        while True:
+            await asyncio.sleep(refresh_interval)
+            try:
+                await reload()
+            except Exception:
+                logging.exception("[serving] model refresh failed; keeping current model")
+
+    @asynccontextmanager
+    async def lifespan(app):
+        resolved = await asyncio.to_thread(cache.resolve, model_uri)
+        model = await asyncio.to_thread(cache.load, resolved)
+        state["resolved_uri"] = resolved
+        state["batcher"] = MicroBatcher(model, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+        state["batcher"].start()
+        refresher = asyncio.create_task(refresh_loop()) if refresh_interval > 0 else None
+        yield
+        if refresher:
+            refresher.cancel()
+        await state["batcher"].stop()
+
+    app = FastAPI(title="mlflow-study serving", lifespan=lifespan)
+
+    @app.post("/predict")
+    async def predict(req: PredictRequest):
+        try:
+            pred = await state["batcher"].predict(req.features)
+        except InvalidRequest as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            logging.exception("[serving] predict failed")
+            raise HTTPException(status_code=500, detail=f"prediction failed: {e}")
+        return {"prediction": pred, "model_uri": state["resolved_uri"]}
+
+    @app.post("/reload")
+    async def reload_endpoint():
+        swapped = await reload()
+        return {"swapped": swapped, "model_uri": state["resolved_uri"]}
+
+    @app.get("/metrics")
+    async def metrics():
+        return {"model_uri": state["resolved_uri"], **state["batcher"].stats()}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    return app
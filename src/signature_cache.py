@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+DEFAULT_CACHE_DIR = Path(os.getenv("SIGNATURE_CACHE_DIR", Path.home() / ".cache" / "mlflow-study" / "signatures"))
+
+_memory: Dict[str, Any] = {}
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def _describe(obj) -> Dict[str, Any]:
+    """스키마를 결정하는 정보만 추출: 컬럼 이름 / dtype / (출력이면) 타입·차원"""
+    import numpy as np
+    import pandas as pd
+
+    if isinstance(obj, pd.DataFrame):
+        return {"kind": "frame", "columns": [[str(c), str(t)] for c, t in obj.dtypes.items()]}
+    if isinstance(obj, pd.Series):
+        return {"kind": "series", "name": str(obj.name), "dtype": str(obj.dtype)}
+    arr = np.asarray(obj)
+    return {"kind": type(obj).__name__, "dtype": str(arr.dtype), "shape": list(arr.shape[1:])}
+
+
+def signature_key(X, y_sample) -> str:
+    payload = json.dumps({"input": _describe(X), "output": _describe(y_sample)}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def infer_signature_cached(
+    model,
+    X,
+    sample_size: int = 5,
+    predict_fn: Optional[Callable] = None,
+    cache_dir: Optional[os.PathLike] = None,
+):
+    """
+    infer_signature(X, model.predict(X))의 캐시 버전.
+    - 전체 학습 데이터 대신 X.head(sample_size)로만 predict → 출력 타입 확인 + 스키마 추론
+    - 키: 입력 컬럼 이름 / dtype + 출력 타입 / dtype / 차원 (같은 study의 trial들은 모두 같은 키)
+    - 메모리(프로세스) → 디스크(SIGNATURE_CACHE_DIR, 프로세스/스크립트 간 공유) 순으로 조회
+    - 주의: dtype은 전체 X 기준이므로 샘플만으로 NaN 등 값 분포가 달라져도 스키마는 동일
+    """
+    from mlflow.models.signature import ModelSignature, infer_signature
+
+    X_sample = X.head(sample_size) if hasattr(X, "head") else X[:sample_size]
+    y_sample = (predict_fn or model.predict)(X_sample)
+    key = signature_key(X, y_sample)
+
+    with _lock:
+        if key in _memory:
+            _stats["hits"] += 1
+            return _memory[key]
+
+    path = Path(cache_dir or DEFAULT_CACHE_DIR) / f"{key}.json"
+    signature = None
+    if path.exists():
+        try:
+            signature = ModelSignature.from_dict(json.loads(path.read_text()))
+        except (ValueError, KeyError, json.JSONDecodeError):
+            signature = None  # 깨진 캐시 파일 → 다시 추론
+    with _lock:
+        _stats["hits" if signature is not None else "misses"] += 1
+    if signature is None:
+        signature = infer_signature(X_sample, y_sample)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(signature.to_dict()))
+        os.replace(tmp, path)
+
+    with _lock:
+        _memory[key] = signature
+    return signature
+
+
+def cache_stats() -> Dict[str, int]:
+    with _lock:
+        return {**_stats, "entries": len(_memory)}
+
+
+def clear_signature_cache(cache_dir: Optional[os.PathLike] = None, disk: bool = False):
+    with _lock:
+        _memory.clear()
+    if disk:
+        for p in Path(cache_dir or DEFAULT_CACHE_DIR).glob("*.json"):
+            p.unlink(missing_ok=True)
@@ -0,0 +1,273 @@
+import hashlib
+import os
+import posixpath
+import shutil
+import tempfile
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import urlparse
+
+from src.lazy import lazy_import
+
+mlflow = lazy_import("mlflow")
+
+DEFAULT_CACHE_DIR = Path(os.getenv("TABLE_CACHE_DIR", Path.home() / ".cache" / "mlflow-study" / "tables"))
+ARROW_EXTENSIONS = (".arrow", ".feather", ".ipc")
+
+
+def _format_of(path: str) -> str:
+    return "arrow" if path.endswith(ARROW_EXTENSIONS) else "parquet"
+
+
+def direct_s3_uri(uri: str) -> Optional[str]:
+    """
+    S3에 직접 접근 가능한 URI로 변환 (불가능하면 None).
+    - s3:// 는 그대로
+    - mlflow-artifacts:/ (--serve-artifacts 프록시)는 서버의 --artifacts-destination과 같은 위치를
+      MLFLOW_ARTIFACTS_DESTINATION(예: s3://mlflow-artifacts) 또는 MLFLOW_ARTIFACT_BUCKET으로 지정한 경우에만 변환
+    """
+    if uri.startswith("s3://"):
+        return uri
+    if uri.startswith("mlflow-artifacts:"):
+        dest = os.getenv("MLFLOW_ARTIFACTS_DESTINATION")
+        if not dest and os.getenv("MLFLOW_ARTIFACT_BUCKET"):
+            dest = f"s3://{os.environ['MLFLOW_ARTIFACT_BUCKET']}"
+        if dest and dest.startswith("s3://"):
+            return posixpath.join(dest.rstrip("/"), urlparse(uri).path.lstrip("/"))
+    return None
+
+
+def _s3_filesystem():
+    """MinIO 등 S3 호환 endpoint를 쓰는 pyarrow S3FileSystem (mlflow와 같은 환경변수 사용)"""
+    from pyarrow import fs
+
+    kwargs = {"region": os.getenv("AWS_DEFAULT_REGION", "us-east-1")}
+    endpoint = os.getenv("MLFLOW_S3_ENDPOINT_URL")
+    if endpoint:
+        parsed = urlparse(endpoint)
+        kwargs.update(endpoint_override=parsed.netloc or parsed.path, scheme=parsed.scheme or "https")
+    if os.getenv("AWS_ACCESS_KEY_ID"):
+        kwargs.update(access_key=os.environ["AWS_ACCESS_KEY_ID"], secret_key=os.getenv("AWS_SECRET_ACCESS_KEY"))
+    return fs.S3FileSystem(**kwargs)
+
+
+class TableArtifactWriter:
+    """
+    DataFrame을 JSON 대신 Parquet(.parquet) / Arrow IPC(.arrow, .feather) 테이블 아티팩트로 기록.
+    - append(df) 호출마다 row group(IPC는 record batch) 하나씩 바로 기록 → 전체 테이블을 메모리에 모으지 않음
+    - S3에 직접 접근 가능하면(direct_s3_uri) 같은 위치의 임시 key(.<이름>.<uuid>.partial)로 multipart 스트리밍하고
+      close() 때 최종 key로 이동, 아니면 로컬 spool 파일에 쓰고 close() 때 ArtifactUploader로 업로드
+    - with 블록이 예외로 끝나거나 close(abort=True)면 업로드하지 않고 임시 key / spool만 삭제
+      (반쯤 쓴 테이블이 아티팩트로 남지 않음)
+    - 스키마는 첫 append의 DataFrame 기준 (이후 append는 같은 스키마로 변환)
+    """
+
+    def __init__(
+        self,
+        artifact_file: str,
+        run_id: Optional[str] = None,
+        client=None,
+        compression: str = "zstd",
+        row_group_size: int = 1_000_000,
+    ):
+        if run_id is None:
+            active = mlflow.active_run()
+            if active is None:
+                raise RuntimeError("No active run. Pass run_id or call inside mlflow.start_run().")
+            run_id = active.info.run_id
+        self.run_id = run_id
+        self.client = client or mlflow.tracking.MlflowClient()
+        self.artifact_file = artifact_file
+        self.format = _format_of(artifact_file)
+        self.compression = compression
+        self.row_group_size = row_group_size
+
+        dest = posixpath.join(self.client.get_run(run_id).info.artifact_uri, artifact_file)
+        self._s3_dest = direct_s3_uri(dest)
+        self._s3_tmp: Optional[str] = None
+        self._spool_dir: Optional[str] = None
+        self._sink = None
+        self._writer = None
+        self._schema = None
+        self.n_rows = 0
+        self.n_row_groups = 0
+
+    def _open(self, schema):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._s3_dest is not None:
+            final = self._s3_dest[len("s3://"):]
+            self._s3_tmp = posixpath.join(posixpath.dirname(final),
+                                          f".{posixpath.basename(final)}.{uuid.uuid4().hex}.partial")
+            self._sink = _s3_filesystem().open_output_stream(self._s3_tmp)
+        else:
+            self._spool_dir = tempfile.mkdtemp(prefix="table-artifact-")
+            self._sink = pa.OSFile(os.path.join(self._spool_dir, posixpath.basename(self.artifact_file)), "wb")
+        if self.format == "parquet":
+            self._writer = pq.ParquetWriter(self._sink, schema, compression=self.compression)
+        else:
+            options = pa.ipc.IpcWriteOptions(compression=None if self.compression in (None, "none") else "zstd")
+            self._writer = pa.ipc.new_file(self._sink, schema, options=options)
+        self._schema = schema
+
+    def append(self, df):
+        """DataFrame(또는 pyarrow.Table)을 row group으로 추가"""
+        import pyarrow as pa
+
+        table = df if isinstance(df, pa.Table) else pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+        if self._writer is None:
+            self._open(table.schema)
+        if self.format == "parquet":
+            self._writer.write_table(table, row_group_size=self.row_group_size)
+        else:
+            self._writer.write_table(table, max_chunksize=self.row_group_size)
+        self.n_rows += table.num_rows
+        self.n_row_groups += -(-table.num_rows // self.row_group_size)
+
+    def close(self, abort: bool = False):
+        """기록 마무리 후 업로드 (abort=True면 업로드 없이 임시 key / spool 삭제)"""
+        if self._writer is None:
+            return
+        try:
+            if abort:
+                self._discard()
+                return
+            self._writer.close()
+            self._sink.close()
+            if self._s3_tmp is not None:
+                _s3_filesystem().move(self._s3_tmp, self._s3_dest[len("s3://"):])
+            elif self._spool_dir is not None:
+                from src.artifacts import ArtifactUploader
+
+                with ArtifactUploader(run_id=self.run_id, client=self.client) as uploader:
+                    uploader.log_file(
+                        os.path.join(self._spool_dir, posixpath.basename(self.artifact_file)),
+                        posixpath.dirname(self.artifact_file) or None,
+                    )
+        except BaseException:
+            self._discard()
+            raise
+        finally:
+            self._writer = None
+            if self._spool_dir is not None:
+                shutil.rmtree(self._spool_dir, ignore_errors=True)
+
+    def _discard(self):
+        for closable in (self._writer, self._sink):
+            try:
+                closable.close()
+            except Exception:
+                pass
+        if self._s3_tmp is not None:
+            try:
+                _s3_filesystem().delete_file(self._s3_tmp)
+            except OSError:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(abort=exc_type is not None)
+
+
+def log_table_columnar(df, artifact_file: str, run_id: Optional[str] = None, **kwargs):
+    """mlflow.log_table 대신 사용하는 한 번에 기록 버전 (artifact_file 확장자로 Parquet / Arrow 결정)"""
+    with TableArtifactWriter(artifact_file, run_id=run_id, **kwargs) as writer:
+        writer.append(df)
+
+
+class TableArtifactReader:
+    """
+    Parquet / Arrow IPC 테이블 아티팩트를 필요한 부분만 읽는 reader.
+    - S3에 직접 접근 가능하면 footer + 요청한 column chunk / row group만 range 요청으로 읽음
+    - 그 외(로컬 / 프록시)는 로컬 캐시에 한 번 내려받은 뒤 memory-map으로 열기 (반복 호출 시 재다운로드 없음)
+    - artifact_uri 예) runs:/<run_id>/tables/predictions.parquet
+    """
+
+    def __init__(self, artifact_uri: str, cache_dir: Optional[os.PathLike] = None):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.artifact_uri = artifact_uri
+        self.format = _format_of(artifact_uri)
+        resolved = artifact_uri
+        if artifact_uri.startswith("runs:/"):
+            from mlflow.tracking.artifact_utils import get_artifact_uri
+
+            run_id, _, path = artifact_uri[len("runs:/"):].partition("/")
+            resolved = get_artifact_uri(run_id=run_id, artifact_path=path)
+        s3 = direct_s3_uri(resolved)
+
+        if s3 is not None:
+            source = _s3_filesystem().open_input_file(s3[len("s3://"):])
+        else:
+            local = self._download(resolved, Path(cache_dir or DEFAULT_CACHE_DIR))
+            source = pa.memory_map(str(local), "r")
+        if self.format == "parquet":
+            self._file = pq.ParquetFile(source)
+        else:
+            self._file = pa.ipc.open_file(source)
+
+    @staticmethod
+    def _download(uri: str, cache_dir: Path) -> Path:
+        key = hashlib.sha256(uri.encode()).hexdigest()[:24]
+        target = cache_dir / key / posixpath.basename(uri)
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.TemporaryDirectory(dir=target.parent) as tmp:
+                os.replace(mlflow.artifacts.download_artifacts(artifact_uri=uri, dst_path=tmp), target)
+        return target
+
+    @property
+    def schema(self):
+        return self._file.schema_arrow if self.format == "parquet" else self._file.schema
+
+    @property
+    def num_rows(self) -> int:
+        if self.format == "parquet":
+            return self._file.metadata.num_rows
+        return sum(self._file.get_batch(i).num_rows for i in range(self._file.num_record_batches))
+
+    @property
+    def num_row_groups(self) -> int:
+        return self._file.num_row_groups if self.format == "parquet" else self._file.num_record_batches
+
+    def read(self, columns: Optional[List[str]] = None, row_groups: Optional[Sequence[int]] = None):
+        """선택한 컬럼 / row group만 읽어 DataFrame으로 반환"""
+        import pyarrow as pa
+
+        if self.format == "parquet":
+            if row_groups is None:
+                table = self._file.read(columns=columns)
+            else:
+                table = self._file.read_row_groups(list(row_groups), columns=columns)
+        else:
+            indices = range(self._file.num_record_batches) if row_groups is None else row_groups
+            batches = [self._file.get_batch(i) for i in indices]
+            table = pa.Table.from_batches(batches, schema=self._file.schema)
+            if columns is not None:
+                table = table.select(columns)
+        return table.to_pandas()
+
+    def iter_batches(self, columns: Optional[List[str]] = None, batch_size: int = 100_000):
+        """row group 단위로 DataFrame을 차례로 yield (전체 테이블을 한 번에 올리지 않음)"""
+        import pyarrow as pa
+
+        if self.format == "parquet":
+            for batch in self._file.iter_batches(batch_size=batch_size, columns=columns):
+                yield batch.to_pandas()
+        else:
+            for i in range(self._file.num_record_batches):
+                table = pa.Table.from_batches([self._file.get_batch(i)])
+                yield (table.select(columns) if columns is not None else table).to_pandas()
+
+    def row_group_stats(self) -> List[Dict[str, int]]:
+        if self.format != "parquet":
+            return [{"row_group": i, "num_rows": self._file.get_batch(i).num_rows}
+                    for i in range(self._file.num_record_batches)]
+        meta = self._file.metadata
+        return [{"row_group": i, "num_rows": meta.row_group(i).num_rows,
+                 "total_byte_size": meta.row_group(i).total_byte_size} for i in range(meta.num_row_groups)]
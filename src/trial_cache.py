@@ -0,0 +1,240 @@
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.lazy import lazy_import
+
+mlflow = lazy_import("mlflow")
+
+# mlflow.utils.mlflow_tags와 동일 (mlflow import 없이 사용)
+MLFLOW_PARENT_RUN_ID = "mlflow.parentRunId"
+
+
+def code_fingerprint(*sources: Any) -> str:
+    """
+    학습 코드 fingerprint: 함수 / 클래스(소스 코드), 파일 경로(내용), 그 외 값(str)을 순서대로 해시.
+    - 예) code_fingerprint(train_trial, to_native_params, xgb.__version__)
+    """
+    h = hashlib.sha256()
+    for src in sources:
+        if callable(src):
+            try:
+                h.update(inspect.getsource(src).encode())
+            except (OSError, TypeError):  # 소스 파일이 없으면(대화형 정의 등) bytecode로 대체
+                h.update(getattr(getattr(src, "__code__", None), "co_code", repr(src).encode()))
+        elif isinstance(src, (str, os.PathLike)) and os.path.isfile(src):
+            with open(src, "rb") as f:
+                h.update(f.read())
+        else:
+            h.update(str(src).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def params_key(params: Dict[str, Any], data_fingerprint: str, code_fp: str) -> str:
+    payload = json.dumps({"params": params, "data": data_fingerprint, "code": code_fp}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class TrialCache:
+    """
+    하이퍼파라미터 + 데이터 fingerprint + 코드 fingerprint → 이전에 학습한 trial run의 결과.
+    - 결과 저장소는 MLflow 자체: 모든 trial child run에 tags(trial_key / trial_data / trial_code)를 남기고,
+      첫 lookup 때 같은 데이터 / 코드로 끝난(FINISHED) run을 한 번에 조회해 메모리 인덱스 구성
+    - 적중하면 replay()로 새 child run에 원래 run의 params / 평가 metric(objective, val_*)과 모델 위치
+      (tags.model_uri, tags.cached_from)만 기록하고 학습은 생략
+    - 모델 유무(model_logged)는 나중에 바뀔 수 있으므로(ModelKeeper의 업로드 / prune) lookup 때 원래 run의
+      현재 태그로 확인
+    - 이번 실행에서 학습한 trial은 add()로 바로 인덱스에 추가
+    """
+
+    def __init__(self, experiment_name: str, data_fingerprint: str, code_fp: str, metric: str = "val_f1",
+                 client=None, replay_prefixes: Tuple[str, ...] = ("val_",)):
+        self.experiment_name = experiment_name
+        self.data_fingerprint = data_fingerprint
+        self.code_fp = code_fp
+        self.metric = metric
+        self.replay_prefixes = replay_prefixes
+        self._client = client
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._parents: List[str] = []  # 최근 parent run 먼저
+        self._stats = {"hits": 0, "misses": 0, "load_s": 0.0}
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = mlflow.tracking.MlflowClient()
+        return self._client
+
+    def key(self, params: Dict[str, Any]) -> str:
+        return params_key(params, self.data_fingerprint, self.code_fp)
+
+    def tags(self, params: Dict[str, Any]) -> Dict[str, str]:
+        """trial child run에 붙일 태그 (다음 실행의 lookup 대상이 됨)"""
+        return {"trial_key": self.key(params), "trial_data": self.data_fingerprint, "trial_code": self.code_fp}
+
+    def _load(self):
+        t0 = time.perf_counter()
+        exp = self.client.get_experiment_by_name(self.experiment_name)
+        entries: Dict[str, Dict[str, Any]] = {}
+        parent_seen: Dict[str, int] = {}
+        if exp is not None:
+            filter_string = (f"tags.trial_data = '{self.data_fingerprint}' and tags.trial_code = '{self.code_fp}' "
+                             "and attributes.status = 'FINISHED'")
+            token = None
+            while True:
+                page = self.client.search_runs([exp.experiment_id], filter_string=filter_string, max_results=1000,
+                                               order_by=["attributes.start_time ASC"], page_token=token)
+                for run in page:
+                    tags = run.data.tags
+                    if self.metric not in run.data.metrics or "trial_key" not in tags:
+                        continue
+                    parent = tags.get(MLFLOW_PARENT_RUN_ID)
+                    if parent:
+                        parent_seen[parent] = run.info.start_time
+                    # cache 적중으로 만든 run은 원래 run을 가리킴 → 같은 key는 처음 학습한 run 하나만 유지
+                    entry = entries.setdefault(tags["trial_key"], self._entry(run.info.run_id, run.data.params,
+                                                                              run.data.metrics, tags))
+                    if parent:
+                        entry["parents"].add(parent)
+                token = page.token
+                if not token:
+                    break
+        self._entries = entries
+        self._parents = sorted(parent_seen, key=parent_seen.get, reverse=True)
+        self._stats["load_s"] = time.perf_counter() - t0
+
+    @staticmethod
+    def _entry(run_id: str, params: Dict[str, str], metrics: Dict[str, float], tags: Dict[str, str]) -> Dict[str, Any]:
+        return {"run_id": tags.get("cached_from", run_id), "params": dict(params), "metrics": dict(metrics),
+                "parents": set()}
+
+    def _model(self, source_run_id: str) -> Optional[str]:
+        """원래 run에 지금 모델이 남아 있으면 model URI (업로드되지 않았거나 prune됐으면 None)"""
+        try:
+            tags = self.client.get_run(source_run_id).data.tags
+        except Exception:  # 삭제된 run
+            return None
+        if tags.get("model_logged", "true") != "true":
+            return None
+        return tags.get("model_uri") or f"runs:/{source_run_id}/model"
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._entries is None:
+                self._load()
+
+    def lookup(self, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """같은 params / 데이터 / 코드로 끝난 이전 trial 결과 (없으면 None, model_uri는 지금 시점 기준)"""
+        self._ensure_loaded()
+        with self._lock:
+            entry = self._entries.get(self.key(params))
+            self._stats["hits" if entry is not None else "misses"] += 1
+        if entry is None:
+            return None
+        return {**entry, "model_uri": self._model(entry["run_id"])}
+
+    def add(self, params: Dict[str, Any], run_id: str, metrics: Dict[str, float],
+            run_params: Optional[Dict[str, Any]] = None, parent_run_id: Optional[str] = None):
+        """이번 실행에서 학습한 trial 결과 추가 (run_params: run에 기록한 전체 params, 기본은 params)"""
+        self._ensure_loaded()
+        logged = {k: str(v) for k, v in (run_params or params).items()}
+        entry = self._entry(run_id, logged, metrics, {})
+        if parent_run_id:
+            entry["parents"].add(parent_run_id)
+        with self._lock:
+            self._entries.setdefault(self.key(params), entry)
+
+    def replay(self, run_id: str, entry: Dict[str, Any]) -> Tuple[float, Dict[str, Any]]:
+        """
+        적중한 결과를 새 child run(run_id)에 기록 → (objective 값, trial user_attrs).
+        - metric은 objective와 replay_prefixes(기본 val_*)로 시작하는 평가 값만 (학습하지 않았으므로 time_* 등 제외)
+        """
+        from mlflow.entities import Metric, Param, RunTag
+
+        ts = int(time.time() * 1000)
+        tags = {"trial_cache": "hit", "cached_from": entry["run_id"],
+                "model_logged": "true" if entry["model_uri"] else "false"}
+        if entry["model_uri"]:
+            tags["model_uri"] = entry["model_uri"]
+        metrics = {k: v for k, v in entry["metrics"].items() if k == self.metric or k.startswith(self.replay_prefixes)}
+        self.client.log_batch(
+            run_id,
+            metrics=[Metric(k, float(v), ts, 0) for k, v in metrics.items()],
+            params=[Param(k, v) for k, v in entry["params"].items()],
+            tags=[RunTag(k, v) for k, v in tags.items()],
+        )
+        attrs = {"run_id": run_id, "cached_from": entry["run_id"]}
+        if entry["model_uri"]:
+            attrs["model_uri"] = entry["model_uri"]
+        return entry["metrics"][self.metric], attrs
+
+    def parent_run_ids(self) -> List[str]:
+        """이 데이터 / 코드로 trial을 기록한 parent run (최근 순)"""
+        self._ensure_loaded()
+        return list(self._parents)
+
+    def entries(self, parent_run_ids: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        self._ensure_loaded()
+        with self._lock:
+            if parent_run_ids is None:
+                return list(self._entries.values())
+            wanted = set(parent_run_ids)
+            return [e for e in self._entries.values() if e["parents"] & wanted]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries or {})}
+
+
+def search_space(suggest_fn: Callable[[Any], Dict[str, Any]]) -> Dict[str, Any]:
+    """suggest_fn이 정의하는 분포 {name: BaseDistribution} (임시 in-memory study에서 ask 한 번, 학습 없음)"""
+    import optuna
+
+    trial = optuna.create_study().ask()
+    suggest_fn(trial)
+    return trial.distributions
+
+
+def _parse_param(value: str, dist) -> Any:
+    # MLflow param은 문자열로 저장됨 → 분포 타입에 맞게 복원
+    from optuna.distributions import CategoricalDistribution, IntDistribution
+
+    if isinstance(dist, IntDistribution):
+        return int(float(value))
+    if isinstance(dist, CategoricalDistribution):
+        return next(c for c in dist.choices if str(c) == value)
+    return float(value)
+
+
+def warm_start(study, cache: TrialCache, suggest_fn: Callable[[Any], Dict[str, Any]],
+               max_parents: Optional[int] = None) -> Dict[str, Any]:
+    """
+    이전 parent run들의 완료된 trial을 새 study에 COMPLETE trial로 추가 (sampler가 이어서 탐색).
+    - max_parents: 최근 parent run 몇 개까지 가져올지 (None이면 전부)
+    - 현재 탐색 공간(search_space)에 없는 params / 범위를 벗어난 값을 가진 trial은 건너뜀
+    - 추가된 trial은 user_attrs warm_start=True, run_id=원래 run
+    """
+    import optuna
+
+    space = search_space(suggest_fn)
+    parents = cache.parent_run_ids()[:max_parents]
+    trials, skipped = [], 0
+    for e in cache.entries(parents):
+        try:
+            params = {name: _parse_param(e["params"][name], dist) for name, dist in space.items()}
+            trials.append(optuna.trial.create_trial(
+                params=params,
+                distributions=space,
+                value=e["metrics"][cache.metric],
+                user_attrs={"run_id": e["run_id"], "warm_start": True},
+            ))
+        except (KeyError, ValueError, StopIteration):
+            skipped += 1
+    study.add_trials(trials)
+    return {"n_trials": len(trials), "n_skipped": skipped, "parents": parents}
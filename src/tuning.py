@@ -0,0 +1,317 @@
+import logging
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.lazy import lazy_import
+
+mlflow = lazy_import("mlflow")
+
+if TYPE_CHECKING:
+    from mlflow.tracking import MlflowClient
+
+# mlflow.utils.mlflow_tags와 동일 (mlflow import 없이 사용)
+MLFLOW_PARENT_RUN_ID = "mlflow.parentRunId"
+MLFLOW_RUN_NAME = "mlflow.runName"
+
+
+@contextmanager
+def child_run(
+    client: "MlflowClient",
+    parent_run_id: str,
+    run_name: str,
+    tags: Optional[Dict[str, Any]] = None,
+):
+    """
+    fluent API(mlflow.start_run(nested=True)) 대신 parent run ID를 명시해서 child run 생성.
+    - 스레드/프로세스마다 독립적으로 사용 가능 (전역 active run 스택을 건드리지 않음)
+    - tags.mlflow.parentRunId가 항상 parent_run_id로 설정됨
+    - 블록이 정상 종료되면 FINISHED, optuna.TrialPruned면 KILLED + tags.trial_state=PRUNED, 그 외 예외면 FAILED
+    - run_id(str)를 yield
+    """
+    parent = client.get_run(parent_run_id)
+    run_tags = {MLFLOW_PARENT_RUN_ID: parent_run_id, MLFLOW_RUN_NAME: run_name}
+    run_tags.update({k: str(v) for k, v in (tags or {}).items()})
+    run = client.create_run(parent.info.experiment_id, tags=run_tags, run_name=run_name)
+    run_id = run.info.run_id
+    try:
+        yield run_id
+    except BaseException as e:
+        if _is_pruned(e):
+            client.set_tag(run_id, "trial_state", "PRUNED")
+            client.set_terminated(run_id, status="KILLED")
+        else:
+            client.set_terminated(run_id, status="FAILED")
+        raise
+    else:
+        client.set_terminated(run_id, status="FINISHED")
+
+
+def _is_pruned(e: BaseException) -> bool:
+    optuna = sys.modules.get("optuna")
+    return optuna is not None and isinstance(e, optuna.TrialPruned)
+
+
+def _init_worker(tracking_uri: str):
+    # 프로세스 워커는 부모의 set_tracking_uri 설정을 물려받지 못할 수 있으므로 다시 지정
+    mlflow.set_tracking_uri(tracking_uri)
+
+
+def _apply_result(trial, result) -> float:
+    # train_fn은 value 또는 (value, user_attrs)를 반환할 수 있음
+    if isinstance(result, tuple):
+        value, attrs = result
+        for k, v in attrs.items():
+            trial.set_user_attr(k, v)
+        return value
+    return result
+
+
+def as_objective(
+    suggest_fn: Callable[[Any], Dict[str, Any]],
+    train_fn: Callable[..., Any],
+    pass_trial: bool = False,
+    **train_kwargs,
+):
+    """
+    suggest_fn + train_fn 조합을 study.optimize용 objective(trial) -> value로 변환
+    - pass_trial=True면 train_fn(..., trial=trial)로 trial 객체 전달 (pruning용 intermediate report)
+    """
+
+    def objective(trial):
+        kwargs = {**train_kwargs, "trial": trial} if pass_trial else train_kwargs
+        return _apply_result(trial, train_fn(suggest_fn(trial), trial.number, **kwargs))
+
+    return objective
+
+
+def optimize_parallel(
+    study,
+    suggest_fn: Callable[[Any], Dict[str, Any]],
+    train_fn: Callable[..., Any],
+    n_trials: int,
+    n_jobs: int,
+    backend: str = "process",
+    train_kwargs: Optional[Dict[str, Any]] = None,
+    callbacks: Optional[Sequence[Callable]] = None,
+    pass_trial: bool = False,
+):
+    """
+    Optuna ask/tell 인터페이스로 trial을 병렬 실행.
+    - suggest_fn(trial) -> params : 메인 프로세스에서 샘플링 (sampler 상태는 한 곳에서만 갱신)
+    - train_fn(params, trial_number, **train_kwargs) -> value 또는 (value, user_attrs) :
+      워커에서 학습/로깅 (process backend에서는 pickle 가능한 top-level 함수여야 함)
+    - backend: "process"(ProcessPoolExecutor) 또는 "thread"(ThreadPoolExecutor)
+    - 동시에 최대 n_jobs개의 trial만 실행 중이도록 유지
+    - callbacks: study.optimize와 동일하게 trial 종료마다 callback(study, frozen_trial) 호출
+    - pass_trial=True면 thread backend에서 train_fn(..., trial=trial) 전달 (pruning 가능).
+      process backend는 in-memory study를 공유할 수 없어 trial을 넘기지 않음 (pruning 비활성)
+    - 워커에서 optuna.TrialPruned가 발생하면 PRUNED 상태로 tell
+    """
+    import optuna
+
+    if pass_trial and backend == "process":
+        logging.warning("[optimize_parallel] pruning is not available with the process backend; "
+                        "use backend='thread' or a shared RDB storage")
+        pass_trial = False
+
+    if backend == "process":
+        executor = ProcessPoolExecutor(
+            max_workers=n_jobs,
+            initializer=_init_worker,
+            initargs=(mlflow.get_tracking_uri(),),
+        )
+    elif backend == "thread":
+        executor = ThreadPoolExecutor(max_workers=n_jobs)
+    else:
+        raise ValueError(f"Unknown backend: {backend!r} (expected 'process' or 'thread')")
+
+    train_kwargs = train_kwargs or {}
+    running = {}
+    submitted = 0
+    with executor:
+        while submitted < n_trials or running:
+            while submitted < n_trials and len(running) < n_jobs:
+                trial = study.ask()
+                params = suggest_fn(trial)
+                kwargs = {**train_kwargs, "trial": trial} if pass_trial else train_kwargs
+                fut = executor.submit(train_fn, params, trial.number, **kwargs)
+                running[fut] = trial
+                submitted += 1
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                trial = running.pop(fut)
+                try:
+                    frozen = study.tell(trial, _apply_result(trial, fut.result()))
+                except optuna.TrialPruned:
+                    frozen = study.tell(trial, state=optuna.trial.TrialState.PRUNED)
+                except Exception as e:
+                    logging.warning(f"[optimize_parallel] trial {trial.number} failed: {e}")
+                    frozen = study.tell(trial, state=optuna.trial.TrialState.FAIL)
+                for cb in callbacks or []:
+                    cb(study, frozen)
+    return study
+
+
+class ModelKeeper:
+    """
+    "개선 시에만 모델 업로드" / "상위 K개만 유지" Optuna callback.
+    - 워커는 모델을 로컬 spool 디렉터리에 저장하고 user_attrs에 run_id / model_spool을 남김
+    - trial이 현재 상위 top_k 안에 들면 spool을 해당 run의 artifact_path로 업로드
+    - 상위 K에서 밀려난 run의 모델 아티팩트는 삭제(prune)
+    - 모든 trial run에 tags.model_logged = "true"/"false"를 기록
+    - store(ContentStore)를 주면 spool을 blob + manifest로 업로드 (같은 파일은 한 번만 저장)
+    - trial cache 적중 trial(user_attrs model_uri)은 업로드 없이 순위에만 참여하고,
+      밀려나도 원래 run의 모델은 지우지 않고 태그만 "false"로 바꿈
+    """
+
+    def __init__(
+        self,
+        client: "MlflowClient",
+        top_k: int = 1,
+        direction: str = "maximize",
+        artifact_path: str = "model",
+        store=None,
+    ):
+        if top_k < 1:
+            raise ValueError("top_k must be >= 1")
+        self.client = client
+        self.top_k = top_k
+        self.maximize = direction == "maximize"
+        self.artifact_path = artifact_path
+        self.store = store
+        self.kept: List[Tuple[float, str]] = []  # (value, run_id), 좋은 순
+        # study.optimize(n_jobs>1)는 워커 스레드에서 callback을 호출 → 순위 갱신 / 업로드 / prune을 직렬화
+        self._lock = threading.Lock()
+        self._borrowed: set = set()  # 다른 run의 모델을 가리키는(cache 적중) run
+
+    def _better(self, a: float, b: float) -> bool:
+        return a > b if self.maximize else a < b
+
+    def __call__(self, study, trial):
+        run_id = trial.user_attrs.get("run_id")
+        spool = trial.user_attrs.get("model_spool")
+        borrowed = spool is None and "model_uri" in trial.user_attrs
+        if run_id is None or (spool is None and not borrowed):
+            return
+        with self._lock:
+            self._keep(trial, run_id, spool, borrowed)
+
+    def _keep(self, trial, run_id: str, spool: Optional[str], borrowed: bool):
+        import optuna
+
+        try:
+            value = trial.value if trial.state == optuna.trial.TrialState.COMPLETE else None
+            if value is not None and (
+                len(self.kept) < self.top_k or self._better(value, self.kept[-1][0])
+            ):
+                if borrowed:
+                    self._borrowed.add(run_id)
+                elif self.store is not None:
+                    self.store.log_model_dir(spool, run_id, artifact_path=self.artifact_path)
+                else:
+                    self.client.log_artifacts(run_id, spool, artifact_path=self.artifact_path)
+                self.client.set_tag(run_id, "model_logged", "true")
+                self.kept.append((value, run_id))
+                self.kept.sort(key=lambda x: x[0], reverse=self.maximize)
+                for _, evicted in self.kept[self.top_k:]:
+                    self._prune(evicted)
+                del self.kept[self.top_k:]
+            else:
+                self.client.set_tag(run_id, "model_logged", "false")
+        finally:
+            if spool is not None:
+                shutil.rmtree(spool, ignore_errors=True)
+
+    def _prune(self, run_id: str):
+        from mlflow.store.artifact.artifact_repository_registry import get_artifact_repository
+
+        if run_id in self._borrowed:
+            self._borrowed.discard(run_id)
+            self.client.set_tag(run_id, "model_logged", "false")
+            return
+        try:
+            repo = get_artifact_repository(self.client.get_run(run_id).info.artifact_uri)
+            repo.delete_artifacts(self.artifact_path)
+            self.client.set_tag(run_id, "model_logged", "false")
+        except Exception as e:
+            logging.warning(f"[ModelKeeper] failed to prune model of run {run_id}: {e}")
+
+
+_dmatrix_lock = threading.Lock()
+_dmatrix_cache: Dict[str, Tuple[Any, Any]] = {}
+
+
+def shared_dmatrices(key: str, X_tr, y_tr, X_val, y_val, max_bin: int = 256) -> Tuple[Any, Any, float]:
+    """
+    study 전체에서 공유하는 XGBoost QuantileDMatrix (train / val).
+    - trial마다 XGBClassifier.fit이 DMatrix와 히스토그램 분위수를 다시 만드는 대신 프로세스당 한 번만 생성
+      (thread 워커는 같은 객체를 공유, process 워커는 워커당 한 번 생성)
+    - key: 데이터 식별자 (예: dataset_cache fingerprint) + max_bin
+    - 반환: (dtrain, dval, 이번 호출에서 생성에 쓴 시간(초) — 캐시 적중이면 0.0)
+    """
+    import xgboost as xgb
+
+    cache_key = f"{key}:{max_bin}"
+    with _dmatrix_lock:
+        if cache_key in _dmatrix_cache:
+            dtrain, dval = _dmatrix_cache[cache_key]
+            return dtrain, dval, 0.0
+        start = time.perf_counter()
+        dtrain = xgb.QuantileDMatrix(X_tr, y_tr, max_bin=max_bin)
+        dval = xgb.QuantileDMatrix(X_val, y_val, ref=dtrain, max_bin=max_bin)  # train의 분위수(cut)를 재사용
+        _dmatrix_cache[cache_key] = (dtrain, dval)
+        return dtrain, dval, time.perf_counter() - start
+
+
+def make_pruner(name: str, max_resource: int = 500, n_warmup_steps: int = 20):
+    """
+    이름으로 Optuna pruner 생성.
+    - "none" | "median" | "sha"(successive halving) | "hyperband"
+    - resource 단위는 boosting round
+    """
+    import optuna
+
+    name = (name or "none").lower()
+    if name == "none":
+        return optuna.pruners.NopPruner()
+    if name == "median":
+        return optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=n_warmup_steps)
+    if name in ("sha", "successive_halving"):
+        return optuna.pruners.SuccessiveHalvingPruner(min_resource=n_warmup_steps, reduction_factor=3)
+    if name == "hyperband":
+        return optuna.pruners.HyperbandPruner(min_resource=n_warmup_steps, max_resource=max_resource, reduction_factor=3)
+    raise ValueError(f"Unknown pruner: {name!r} (expected none/median/sha/hyperband)")
+
+
+def xgb_pruning_callback(trial, data_name: str = "validation_0", metric_name: str = "mlogloss",
+                         lower_is_better: bool = True, report_every: int = 1):
+    """
+    boosting round마다 eval metric을 trial.report하고 pruner가 판단하면 optuna.TrialPruned를 발생시키는
+    XGBoost TrainingCallback.
+    - pruner는 study direction 기준으로 intermediate 값을 비교하므로, maximize study에서 loss를 보고할 때는
+      lower_is_better=True로 부호를 뒤집어(-mlogloss) 보고
+    """
+    import optuna
+    import xgboost as xgb
+
+    sign = -1.0 if lower_is_better and trial.study.direction == optuna.study.StudyDirection.MAXIMIZE else 1.0
+
+    class _PruningCallback(xgb.callback.TrainingCallback):
+        def after_iteration(self, model, epoch, evals_log):
+            if epoch % report_every:
+                return False
+            value = evals_log[data_name][metric_name][-1]
+            if isinstance(value, tuple):  # (mean, std) 형태 (cv)
+                value = value[0]
+            trial.report(sign * float(value), step=epoch)
+            if trial.should_prune():
+                raise optuna.TrialPruned(f"pruned at boosting round {epoch}")
+            return False
+
+    return _PruningCallback()
@@ -1,8 +1,9 @@
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+from src.metrics import compute_metrics
 
 def get_metrics(y_te, y_pred, average):
-    acc = accuracy_score(y_te, y_pred)
-    precision = precision_score(y_te, y_pred, average=average)
-    recall = recall_score(y_te, y_pred, average=average)
-    f1 = f1_score(y_te, y_pred, average=average)
-    return acc, precision, recall, f1
\ No newline at end of file
+    # 혼동행렬을 한 번만 만들어 accuracy / precision / recall / f1을 모두 유도 (src/metrics.py)
+    m = compute_metrics(y_te, y_pred, average)
+    acc = float(m["accuracy"])
+    if average is None:  # 클래스별 배열 그대로 반환
+        return acc, m["precision"], m["recall"], m["f1"]
+    return acc, float(m["precision"]), float(m["recall"]), float(m["f1"])
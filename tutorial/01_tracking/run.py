@@ -1,4 +1,4 @@
-from src.mlflow_utils import setup_mlflow
+from src.mlflow_utils import setup_mlflow, BufferedMetricLogger
 from src.path import TUTORIAL_DIR
 
 import mlflow
@@ -12,15 +12,15 @@ CURRENT_PATH = TUTORIAL_DIR / "01_tracking"
 
 setup_mlflow(EXP_NAME)
 
-with mlflow.start_run(run_name=RUN_NAME, tags=TAGS):
+with mlflow.start_run(run_name=RUN_NAME, tags=TAGS), BufferedMetricLogger() as logger:
         # 1) Params
         params = {"C": 1.0, "max_iter": 200}
-        mlflow.log_params(params)
+        logger.log_params(params)
 
-        # 2) Metrics 
+        # 2) Metrics (버퍼에 쌓고 백그라운드에서 log_batch로 전송 → 학습 루프는 네트워크를 기다리지 않음)
         acc_history = [0.70, 0.76, 0.79]
         for step, acc in enumerate(acc_history):
-            mlflow.log_metric("val_acc", acc, step=step)
+            logger.log_metric("val_acc", acc, step=step)
             time.sleep(0.2) 
 
         # 3) Artifact (간단한 텍스트 리포트)
@@ -30,4 +30,6 @@ with mlflow.start_run(run_name=RUN_NAME, tags=TAGS):
             f"final_val_acc={acc_history[-1]:.4f}\n"
             f"params={params}\n"
         )
-        mlflow.log_artifact(str(report_path), artifact_path="reports")
\ No newline at end of file
+        mlflow.log_artifact(str(report_path), artifact_path="reports")
+        logger.flush()
+        print(f"[INFO] buffered logger stats: {logger.stats()}")
@@ -1,5 +1,7 @@
+from src.artifacts import ArtifactUploader
 from src.mlflow_utils import setup_mlflow
 from src.path import TUTORIAL_DIR
+from src.table_artifacts import TableArtifactReader, TableArtifactWriter
 
 import pandas as pd, numpy as np
 import mlflow
@@ -11,9 +13,10 @@ CURRENT_PATH = TUTORIAL_DIR / "02_artifacts"
 
 setup_mlflow(EXP_NAME)
 
-with mlflow.start_run(run_name = RUN_NAME, tags = TAGS):
+# 각 log_* 호출은 즉시 반환되고, 업로드는 스레드 풀에서 동시에 진행됨 (with 블록 종료 시 모두 완료 대기)
+with mlflow.start_run(run_name = RUN_NAME, tags = TAGS) as run, ArtifactUploader() as uploader:
         # 1) 텍스트 (파일 없이 바로 업로드)
-        mlflow.log_text(
+        uploader.log_text(
             text=(
                 "# Notes\n"
                 "- This run demonstrates various MLflow artifact logging patterns.\n"
@@ -30,9 +33,9 @@ with mlflow.start_run(run_name = RUN_NAME, tags = TAGS):
             "lr": 0.001,
             "comment": "baseline config for demo",
         }
-        mlflow.log_dict(train_config, artifact_file="configs/train_config.json")
+        uploader.log_dict(train_config, artifact_file="configs/train_config.json")
 
-        # 3) CSV 파일 (로컬에 저장 후 업로드)
+        # 3) CSV (로컬 파일을 만들지 않고 메모리에서 바로 업로드)
         df = pd.DataFrame(
             {
                 "step": [0, 1, 2, 3, 4],
@@ -40,12 +43,10 @@ with mlflow.start_run(run_name = RUN_NAME, tags = TAGS):
                 "tag": ["warmup", "phase1", "phase1", "phase2", "phase2"],
             }
         )
-        csv_path = CURRENT_PATH / "metrics.csv"
-        df.to_csv(csv_path, index=False)
-        mlflow.log_artifact(str(csv_path), artifact_path="data")
+        uploader.log_csv(df, artifact_file="data/metrics.csv")
 
         # 4) 테이블로 직접 로깅 (UI에서 미리보기 가능)
-        mlflow.log_table(data=df, artifact_file="tables/metrics.json")
+        uploader.log_table(df, artifact_file="tables/metrics.json")
 
         # 5) 이미지 (넘파이 배열 → PNG)
         #    - 의존성 없이 간단한 그래디언트 이미지를 만들어 저장
@@ -56,4 +57,23 @@ with mlflow.start_run(run_name = RUN_NAME, tags = TAGS):
         img[:, :, 0] = gradient  # R
         img[:, :, 1] = 160       # G
         img[:, :, 2] = 255 - gradient  # B
-        mlflow.log_image(img, artifact_file="images/gradient.png")
\ No newline at end of file
+        uploader.log_image(img, artifact_file="images/gradient.png")
+
+        # 6) 대용량 테이블: JSON(log_table) 대신 Parquet, 청크마다 row group으로 추가 기록
+        #    (S3 직접 접근이 가능하면 multipart 스트리밍, 아니면 로컬 spool 후 업로드)
+        rng = np.random.default_rng(42)
+        with TableArtifactWriter("tables/predictions.parquet", row_group_size=100_000) as writer:
+            for chunk in range(5):
+                n = 100_000
+                writer.append(pd.DataFrame({
+                    "row_id": np.arange(chunk * n, (chunk + 1) * n),
+                    "y_true": rng.integers(0, 3, n),
+                    "y_pred": rng.integers(0, 3, n),
+                    "proba_max": rng.random(n).astype(np.float32),
+                }))
+        print(f"[OK] tables/predictions.parquet: {writer.n_rows} rows, {writer.n_row_groups} row groups")
+
+# 7) 필요한 컬럼 / row group만 읽기 (전체 파일을 파싱하지 않음)
+reader = TableArtifactReader(f"runs:/{run.info.run_id}/tables/predictions.parquet")
+head = reader.read(columns=["y_true", "y_pred"], row_groups=[0])
+print(f"rows={reader.num_rows}, row_groups={reader.num_row_groups}, first group accuracy={(head.y_true == head.y_pred).mean():.3f}")
@@ -1,15 +1,19 @@
 import os
 import pandas as pd
 
+from src.evaluation import evaluate_streaming
+from src.model_cache import load_model
 from src.path import TUTORIAL_DIR
 from src.utils import get_metrics
 
-import mlflow 
 from mlflow.tracking import MlflowClient
 
 
 EXP_NAME = "03-models-pyfunc" 
 model_uri = os.environ.get("MODEL_URI")
+# 설정 시 테스트셋을 EVAL_CHUNK_SIZE행씩 스트리밍 평가 (대용량 holdout용)
+EVAL_CHUNK_SIZE = int(os.environ.get("EVAL_CHUNK_SIZE", "0"))
+run_id = None
 
 
 # 1) 모델 URI 결정
@@ -36,7 +40,8 @@ else:
     print(f"[INFO] Using MODEL_URI from env: {model_uri}")
 
 # 2) 모델 로드
-model = mlflow.pyfunc.load_model(model_uri)
+# - alias/stage URI는 고정 버전으로 해석, 아티팩트는 로컬 디스크 캐시(MODEL_CACHE_DIR)에서 재사용
+model = load_model(model_uri)
 
 # 3) 예시 입력 (Iris feature 스키마에 맞춤)
 sample = pd.DataFrame(
@@ -66,11 +71,21 @@ print(pred)
 X_TEST_PATH = TUTORIAL_DIR / "03_models_pyfunc" / "X_te.csv"
 Y_TEST_PATH = TUTORIAL_DIR / "03_models_pyfunc" / "y_te.csv"
 
-X_te = pd.read_csv(X_TEST_PATH)
-y_te = pd.read_csv(Y_TEST_PATH)["y_true"].to_numpy()
+if EVAL_CHUNK_SIZE > 0:
+    # 청크별 predict + 혼동행렬 누적 → 메모리 사용량이 청크 크기로 제한됨
+    # (모델을 자동 선택한 경우 청크별 처리량/최종 metric을 해당 run에 eval_* 로 기록)
+    result = evaluate_streaming(
+        model, X_TEST_PATH, Y_TEST_PATH,
+        chunksize=EVAL_CHUNK_SIZE, average="macro", run_id=run_id,
+    )
+    acc, precision, recall, f1 = result["accuracy"], result["precision"], result["recall"], result["f1"]
+    print(f"[INFO] streamed {result['n_rows']} rows ({result['rows_per_s']:.0f} rows/s)")
+else:
+    X_te = pd.read_csv(X_TEST_PATH)
+    y_te = pd.read_csv(Y_TEST_PATH)["y_true"].to_numpy()
 
-y_pred = model.predict(X_te)
-acc, precision, recall, f1 = get_metrics(y_te, y_pred, "macro")
+    y_pred = model.predict(X_te)
+    acc, precision, recall, f1 = get_metrics(y_te, y_pred, "macro")
 print(f"accuracy: {acc}") # 0.9666666666666667
 print(f"precision: {precision}") # 0.9696969696969697
 print(f"recall: {recall}") # 0.9666666666666667
@@ -1,4 +1,7 @@
+from src.content_store import ContentStore, cas_enabled
+from src.dataset_cache import load_iris_split, log_dataset_inputs
 from src.mlflow_utils import setup_mlflow
+from src.signature_cache import infer_signature_cached
 from src.utils import get_metrics
 from src.path import TUTORIAL_DIR
 
@@ -6,11 +9,8 @@ import os, logging
 import pandas as pd
 
 import mlflow
-from mlflow.models.signature import infer_signature
 
-from sklearn.datasets import load_iris
 from sklearn.linear_model import LogisticRegression
-from sklearn.model_selection import train_test_split
 
 EXP_NAME = "03-models-pyfunc"
 RUN_NAME = "logreg_v1"
@@ -20,17 +20,15 @@ CURRENT_PATH = TUTORIAL_DIR / "03_models_pyfunc"
 
 setup_mlflow(EXP_NAME)
 
-X, y = load_iris(return_X_y = True, as_frame = True)
-X_tr, X_te, y_tr, y_te = train_test_split(
-    X, y,
-    test_size = 0.2,
-    random_state = 42,
-    stratify = y
-)
+# load_iris + train_test_split 결과를 fingerprint 키로 캐시 (적중 시 memory-mapped 로드)
+split = load_iris_split(test_size = 0.2, random_state = 42)
+X_tr, X_te, y_tr, y_te = split
 X_te.to_csv(CURRENT_PATH / "X_te.csv", index=False) # 재현 확인용
 pd.DataFrame({"y_true": y_te}).to_csv(CURRENT_PATH / "y_te.csv", index=False) # 재현 확인용
 
 with mlflow.start_run(run_name = RUN_NAME, tags = TAGS) as run:
+    log_dataset_inputs(split)  # 데이터셋 fingerprint를 run input으로 기록 (lineage)
+
     # 1) 학습 & 로깅
     params = {"C": 1.0, "max_iter": 200, "solver": "lbfgs", "random_state": 42}
     mlflow.log_params(params)
@@ -48,21 +46,28 @@ with mlflow.start_run(run_name = RUN_NAME, tags = TAGS) as run:
     }
     mlflow.log_metrics(metrics)
 
-    # 2) signature / input_example
-    signature = infer_signature(X_tr, clf.predict(X_tr))
+    # 2) signature / input_example (컬럼·dtype·출력 타입 키로 캐시, 소량 샘플로만 predict)
+    signature = infer_signature_cached(clf, X_tr)
     input_example = X_te.head(2)
 
     # 3) 모델 저장 (+ 선택: 레지스트리 등록)
     do_register = str(os.environ.get("REGISTER_MODEL", "")).lower() in {"1","true","yes"}
     registered_model_name = REGISTER_NAME if do_register else None
 
-    mlflow.sklearn.log_model(
-        sk_model=clf,
-        artifact_path="model",
-        signature=signature,
-        input_example=input_example,
-        registered_model_name=registered_model_name,
-    )
+    if cas_enabled() and do_register:
+        # manifest만 있는 model/을 등록하면 일반 mlflow 로더 / `mlflow models serve`로 열 수 없음 → 전체 모델로 기록
+        logging.warning("[CAS] REGISTER_MODEL is set: logging the full model instead of a CAS manifest")
+    if cas_enabled() and not do_register:
+        # CAS_MODELS=1: 파일별 sha256 blob을 한 번만 저장하고 run에는 manifest만 기록
+        ContentStore().log_model(mlflow.sklearn, clf, "model", signature=signature, input_example=input_example)
+    else:
+        mlflow.sklearn.log_model(
+            sk_model=clf,
+            artifact_path="model",
+            signature=signature,
+            input_example=input_example,
+            registered_model_name=registered_model_name,
+        )
 
     # 4) 간단 리포트 아티팩트
     report = "\n".join([
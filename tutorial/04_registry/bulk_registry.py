@@ -0,0 +1,90 @@
+import argparse
+import sys
+from datetime import datetime
+
+from src.lazy import report_startup
+from src.registry_bulk import (
+    RegistryState, apply_changes, expand_models, format_change, load_manifest, plan_changes,
+)
+from src.rest_client import RegistryRestClient, registry_client  # http 서버면 mlflow import 없이 REST 직접 호출
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Bulk Model Registry operations (list / plan / apply from a manifest).")
+    p.add_argument("--workers", type=int, default=16, help="Concurrent requests (HTTP pool size)")
+    p.add_argument("--refresh", action="store_true", help="Ignore the cached stage/alias map (always on for apply)")
+    p.add_argument("--cache-ttl", type=float, default=300.0, help="Seconds the cached stage/alias map stays valid")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    ls = sub.add_parser("list", help="Stream all model versions (paginated)")
+    ls.add_argument("--model-like", default=None, help="SQL LIKE pattern, e.g. 'iris_%%'")
+    ls.add_argument("--page-size", type=int, default=200)
+
+    for name, help_text in (("plan", "Show the dry-run diff for a manifest"), ("apply", "Apply a manifest")):
+        sp = sub.add_parser(name, help=help_text)
+        sp.add_argument("manifest", help="JSON / YAML manifest (see registry_manifest.yaml)")
+        if name == "apply":
+            sp.add_argument("--yes", action="store_true", help="Apply without stopping after the diff")
+    return p.parse_args()
+
+
+def cmd_list(c: RegistryRestClient, args):
+    filter_string = f"name LIKE '{args.model_like}'" if args.model_like else ""
+    print(f"{'MODEL':<24} {'VER':<5} {'STAGE':<12} {'ALIAS':<16} {'CREATED':<20}")
+    n = 0
+    # 페이지가 도착하는 대로 출력 (수백 개 모델도 첫 줄이 바로 나옴)
+    for v in c.search_model_versions(filter_string, page_size=args.page_size, order_by=["name ASC", "version_number ASC"]):
+        created = datetime.fromtimestamp(int(v["creation_timestamp"]) / 1000).strftime("%Y-%m-%d %H:%M:%S")
+        aliases = ",".join(v.get("aliases") or []) or "-"
+        print(f"{v['name']:<24} {v['version']:<5} {v.get('current_stage', 'None'):<12} {aliases:<16} {created:<20}",
+              flush=True)
+        n += 1
+    print(f"({n} versions)")
+
+
+def cmd_plan_apply(c: RegistryRestClient, args) -> int:
+    entries = expand_models(c, load_manifest(args.manifest))
+    state = RegistryState(c, ttl=args.cache_ttl)
+    # apply는 항상 현재 registry 기준으로 diff (캐시된 map은 plan에서만 사용)
+    refresh = args.refresh or args.command == "apply"
+    state.ensure([e["model"] for e in entries], refresh=refresh, max_workers=args.workers)
+    changes = plan_changes(entries, state)
+
+    if not changes:
+        print("No changes: registry already matches the manifest.")
+        return 0
+    for ch in changes:
+        print(format_change(ch))
+    n_errors = sum(ch["action"] == "error" for ch in changes)
+    n_exec = sum(ch["action"] != "error" and not ch.get("implied") for ch in changes)
+    print(f"\n{n_exec} change(s) across {len({ch['model'] for ch in changes})} model(s), {n_errors} error(s)")
+
+    if args.command == "plan":
+        return 1 if n_errors else 0
+    if n_errors or not args.yes:
+        print("Not applied" + (" (fix errors first)." if n_errors else " — re-run with --yes to apply."))
+        return 1 if n_errors else 0
+
+    def on_result(name, err):
+        print(f"[{'OK' if err is None else 'FAIL'}] {name}" + (f": {err}" if err else ""), flush=True)
+
+    result = apply_changes(c, changes, state=state, max_workers=args.workers, on_result=on_result)
+    print(f"Applied {result['applied']} change(s) on {result['models']} model(s) in {result['elapsed_s']:.2f}s, "
+          f"{len(result['failed'])} failed")
+    return 1 if result["failed"] else 0
+
+
+def main():
+    args = parse_args()
+    c = registry_client(pool_size=args.workers)
+    code = 0
+    if args.command == "list":
+        cmd_list(c, args)
+    else:
+        code = cmd_plan_apply(c, args)
+    report_startup()
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
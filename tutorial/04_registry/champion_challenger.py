@@ -0,0 +1,61 @@
+import argparse
+
+from src.batch_scoring import csv_batches, log_comparison, resolve_candidates, score_models
+from src.mlflow_utils import setup_mlflow
+from src.model_cache import ModelCache
+from src.path import TUTORIAL_DIR
+
+import pandas as pd
+
+EXP_NAME = "04-registry-evaluation"
+X_TEST_PATH = TUTORIAL_DIR / "03_models_pyfunc" / "X_te.csv"
+Y_TEST_PATH = TUTORIAL_DIR / "03_models_pyfunc" / "y_te.csv"
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Score many registry versions on the same evaluation data and log one comparison run.")
+    p.add_argument("--model-uri", action="append", default=[],
+                   help="Candidate URI (repeatable), e.g. models:/iris_clf@prod. The first candidate is the baseline.")
+    p.add_argument("--name", default=None, help="Registered model name to expand with --stages / --all-versions")
+    p.add_argument("--stages", default="Production,Staging", help="Comma-separated stages to include for --name")
+    p.add_argument("--all-versions", action="store_true", help="Include every version of --name")
+    p.add_argument("--x-path", default=str(X_TEST_PATH))
+    p.add_argument("--y-path", default=str(Y_TEST_PATH))
+    p.add_argument("--batch-size", type=int, default=10_000)
+    p.add_argument("--workers", type=int, default=8)
+    p.add_argument("--metric", default="f1", help="Metric used to pick the winner")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    setup_mlflow(EXP_NAME)
+    cache = ModelCache()
+
+    specs = list(args.model_uri)
+    if args.name:
+        spec = {"name": args.name, "stages": [s for s in args.stages.split(",") if s]}
+        if args.all_versions:
+            spec["versions"] = "all"
+        specs.append(spec)
+    candidates = resolve_candidates(specs, cache)
+    if not candidates:
+        raise SystemExit("No candidate models found. Pass --model-uri or --name.")
+    print(f"[INFO] scoring {len(candidates)} candidate(s): {', '.join(label for label, _ in candidates)}")
+
+    # 평가 데이터는 배치 단위로 한 번만 읽고 모든 후보가 같은 배치를 공유
+    table = score_models(
+        candidates,
+        csv_batches(args.x_path, args.y_path, batch_size=args.batch_size),
+        cache=cache,
+        max_workers=args.workers,
+    )
+    run_id = log_comparison(table, metric=args.metric, params={"x_path": args.x_path, "batch_size": args.batch_size})
+
+    with pd.option_context("display.width", 160, "display.max_columns", 20):
+        print(table.drop(columns=["model_uri"]).sort_values(args.metric, ascending=False).to_string(index=False))
+    print(f"[OK] comparison logged to run {run_id}")
+
+
+if __name__ == "__main__":
+    main()
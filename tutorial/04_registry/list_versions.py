@@ -1,20 +1,25 @@
 from datetime import datetime
 
-from mlflow.tracking import MlflowClient
+from src.lazy import report_startup
+from src.rest_client import registry_client  # http 서버면 mlflow import 없이 REST 직접 호출 (빠른 시작)
 
 MODEL_NAME = "iris_clf"
 
-c = MlflowClient()
-versions = c.search_model_versions(f"name='{MODEL_NAME}'")
-if not versions:
-    print(f"No versions found for model '{MODEL_NAME}'. Run log_and_register.py first.")
+c = registry_client()
 
 print(f"Model: {MODEL_NAME}")
 print("-" * 80)
 print(f"{'VER':<5} {'STAGE':<12} {'ALIAS':<12} {'CREATED':<20} {'RUN_ID':<32}")
 print("-" * 80)
-for v in sorted(versions, key=lambda x: int(x.version)):
-    created = datetime.fromtimestamp(v.creation_timestamp/1000).strftime("%Y-%m-%d %H:%M:%S")
-    # aliases: list[str] (None일 수 있어 방어)
-    aliases = ",".join(v.aliases) if getattr(v, "aliases", None) else "-"
-    print(f"{v.version:<5} {v.current_stage:<12} {aliases:<12} {created:<20} {v.run_id:<32}")
\ No newline at end of file
+n = 0
+# 서버에서 버전 순으로 정렬해 페이지 단위로 받아 바로 출력 (전체 목록을 모은 뒤 정렬하지 않음)
+for v in c.search_model_versions(f"name='{MODEL_NAME}'", order_by=["version_number ASC"]):
+    n += 1
+    created = datetime.fromtimestamp(int(v["creation_timestamp"])/1000).strftime("%Y-%m-%d %H:%M:%S")
+    # aliases: list[str] (없을 수 있어 방어)
+    aliases = ",".join(v["aliases"]) if v.get("aliases") else "-"
+    print(f"{v['version']:<5} {v.get('current_stage', 'None'):<12} {aliases:<12} {created:<20} {v.get('run_id', ''):<32}")
+if not n:
+    print(f"No versions found for model '{MODEL_NAME}'. Run log_and_register.py first.")
+
+report_startup()
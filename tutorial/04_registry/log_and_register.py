@@ -1,14 +1,14 @@
 import logging
 
+from src.content_store import cas_enabled
+from src.dataset_cache import load_iris_split, log_dataset_inputs
 from src.utils import get_metrics
 from src.mlflow_utils import setup_mlflow
+from src.signature_cache import infer_signature_cached
 
 import mlflow
-from mlflow.models.signature import infer_signature
 from mlflow.tracking import MlflowClient
 
-from sklearn.datasets import load_iris
-from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LogisticRegression
 
 EXP_NAME   = "04-registry"
@@ -17,12 +17,12 @@ MODEL_NAME = "iris_clf"
 
 setup_mlflow(EXP_NAME)
 
-X, y = load_iris(return_X_y=True, as_frame=True)
-X_tr, X_te, y_tr, y_te = train_test_split(
-    X, y, test_size=0.2, random_state=42, stratify=y
-)
+split = load_iris_split(test_size=0.2, random_state=42)
+X_tr, X_te, y_tr, y_te = split
 
 with mlflow.start_run(run_name=RUN_NAME, tags={"stage": "train"}) as run:
+    log_dataset_inputs(split)
+
     # 1) 학습 + 로깅
     params = {"C": 1.0, "max_iter": 200, "solver": "lbfgs", "random_state": 42}
     mlflow.log_params(params)
@@ -36,10 +36,13 @@ with mlflow.start_run(run_name=RUN_NAME, tags={"stage": "train"}) as run:
     })
 
     # 2) 시그니처/인풋 예시 추천
-    signature = infer_signature(X_tr, clf.predict(X_tr))
+    signature = infer_signature_cached(clf, X_tr)
     input_example = X_te.head(2)
 
     # 3) 모델을 '현재 런의 아티팩트(model/)'로만 기록 (등록은 나중에)
+    #    바로 등록하므로 CAS manifest가 아닌 전체 모델로 기록 (manifest만 있는 버전은 일반 mlflow 로더로 열 수 없음)
+    if cas_enabled():
+        logging.warning("[CAS] this model is registered: logging the full model instead of a CAS manifest")
     mlflow.sklearn.log_model(
         sk_model=clf,
         name="model",                 
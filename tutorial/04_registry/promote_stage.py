@@ -1,5 +1,7 @@
 import argparse
-from mlflow.tracking import MlflowClient
+
+from src.lazy import report_startup
+from src.rest_client import registry_client  # http 서버면 mlflow import 없이 REST 직접 호출 (빠른 시작)
 
 MODEL_NAME = "iris_clf"
 
@@ -17,7 +19,7 @@ def parse_args():
 
 def main():
     args = parse_args()
-    c = MlflowClient()
+    c = registry_client()
 
     # Stage 전환
     c.transition_model_version_stage(
@@ -38,5 +40,7 @@ def main():
         )
         print(f"[OK] alias '{args.alias}' -> version {args.version}")
 
+    report_startup()
+
 if __name__ == "__main__":
     main()
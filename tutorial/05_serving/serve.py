@@ -0,0 +1,23 @@
+from src.serving import create_app
+
+import os
+
+import uvicorn
+
+# 서빙할 레지스트리 모델 (alias 또는 stage)
+MODEL_URI = os.getenv("MODEL_URI", "models:/iris_xgb@champion")
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "64"))
+MAX_WAIT_MS = float(os.getenv("MAX_WAIT_MS", "5"))
+REFRESH_INTERVAL = float(os.getenv("REFRESH_INTERVAL", "30"))  # alias 변경 확인 주기(초), 0이면 끔
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+
+app = create_app(
+    MODEL_URI,
+    max_batch_size=MAX_BATCH_SIZE,
+    max_wait_ms=MAX_WAIT_MS,
+    refresh_interval=REFRESH_INTERVAL,
+)
+
+if __name__ == "__main__":
+    uvicorn.run(app, host=HOST, port=PORT)
@@ -1,27 +1,38 @@
+from src.autolog import downsampled_autolog
+from src.dataset_cache import load_iris_split, log_dataset_inputs
 from src.mlflow_utils import setup_mlflow
 
+import os
 import numpy as np
 
 import mlflow
 
 import xgboost as xgb
-from sklearn.datasets import load_iris
-from sklearn.model_selection import train_test_split
 
 EXP_NAME = "06-autolog"
 RUN_NAME = "xgb_autolog_only"
 TAGS = {"stage": "train"}
+# "full": 모든 boosting round 기록 / "every_n" / "epsilon" / "summary" (마지막·best 값은 항상 기록)
+AUTOLOG_POLICY = os.getenv("AUTOLOG_POLICY", "every_n")
 
 setup_mlflow(EXP_NAME)
 
-mlflow.xgboost.autolog(log_models=True)
+if AUTOLOG_POLICY == "full":
+    mlflow.xgboost.autolog(log_models=True)
+else:
+    downsampled_autolog(
+        "xgboost",
+        policy=AUTOLOG_POLICY,
+        every_n=int(os.getenv("AUTOLOG_EVERY_N", "10")),
+        epsilon=float(os.getenv("AUTOLOG_EPSILON", "0.001")),
+        log_models=True,
+    )
 
-X, y = load_iris(return_X_y=True, as_frame=True)
-X_tr, X_te, y_tr, y_te = train_test_split(
-    X, y, test_size=0.2, random_state=42, stratify=y
-)
+split = load_iris_split(test_size=0.2, random_state=42)
+X_tr, X_te, y_tr, y_te = split
 
 with mlflow.start_run(run_name = RUN_NAME, tags=TAGS):
+    log_dataset_inputs(split)
     params = {
         "n_estimators": 400,
         "max_depth": 4,
@@ -32,7 +43,7 @@ with mlflow.start_run(run_name = RUN_NAME, tags=TAGS):
         "reg_alpha": 0.0,
         "tree_method": "hist",                # GPU면 "gpu_hist"
         "objective": "multi:softprob",
-        "num_class": len(np.unique(y)),
+        "num_class": len(np.unique(y_tr)),
         "eval_metric": "mlogloss",
         "random_state": 42,
         "early_stopping_rounds": 30,
@@ -1,9 +1,8 @@
+from src.dataset_cache import load_iris_split, log_dataset_inputs
 from src.mlflow_utils import setup_mlflow
 
 import mlflow
 
-from sklearn.datasets import load_iris
-from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.pipeline import Pipeline
 from sklearn.linear_model import LogisticRegression
@@ -16,12 +15,11 @@ setup_mlflow(EXP_NAME)
 
 mlflow.sklearn.autolog(log_models = True) # Auto logging start
 
-X, y = load_iris(return_X_y = True, as_frame = True)
-X_tr, X_te, y_tr, y_te = train_test_split(
-    X, y, test_size=0.2, random_state=42, stratify=y
-)
+split = load_iris_split(test_size=0.2, random_state=42)
+X_tr, X_te, y_tr, y_te = split
 
 with mlflow.start_run(run_name = RUN_NAME, tags = TAGS) as run:
+    log_dataset_inputs(split)
     pipe = Pipeline(
         steps = [
             ("scaler", StandardScaler()),
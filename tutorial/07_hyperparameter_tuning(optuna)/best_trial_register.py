@@ -1,4 +1,5 @@
 from src.mlflow_utils import setup_mlflow
+from src.content_store import ContentStore
 
 import os
 
@@ -8,7 +9,7 @@ from mlflow.tracking import MlflowClient
 
 EXP_NAME        = "07-optuna-tuning"
 PARENT_RUN_NAME = "optuna_tuning"
-METRIC_KEY      = "val_f1_macro"
+METRIC_KEY      = "val_f1"          # run.py의 trial이 기록하는 objective metric
 MODEL_NAME      = "iris_xgb"
 PROMOTE_STAGE   = "Production"
 ALIAS           = os.getenv("ALIAS")
@@ -20,44 +21,93 @@ client = MlflowClient()
 exp = client.get_experiment_by_name(EXP_NAME)
 
 
-# 1) 최신 parent run(optuna_search) 찾기
-parent_runs = client.search_runs(
-    experiment_ids=[exp.experiment_id],
-    filter_string=(
-        "attributes.status = 'FINISHED' "
-        f"and tags.mlflow.runName = '{PARENT_RUN_NAME}' "
-        "and tags.stage = 'tuning'"
-    ),
-    order_by=["attributes.start_time DESC"],
-    max_results=1,
-)
-
-parent = parent_runs[0]
-parent_id = parent.info.run_id
-print(f"[INFO] Parent run: {parent_id} (name={PARENT_RUN_NAME})")
-
-# 2) child runs 중에서 METRIC_KEY 기준 최고 run 선정
-#    (metrics.<key> DESC로 정렬)
-child_runs = client.search_runs(
-    experiment_ids=[exp.experiment_id],
-    filter_string=(
-        f"tags.mlflow.parentRunId = '{parent_id}' "
-        "and attributes.status = 'FINISHED'"
-    ),
-    order_by=[f"metrics.{METRIC_KEY} DESC", "attributes.start_time DESC"],
-    max_results=1,
-)
-best = child_runs[0]
+# USE_RUN_INDEX=1이면 서버 search_runs 대신 로컬 Parquet 인덱스(src/run_index.py)를 증분 동기화 후 조회
+USE_RUN_INDEX = os.getenv("USE_RUN_INDEX", "").lower() in {"1", "true", "yes"}
+# LOG_MODELS=improve/top_k로 튜닝한 경우 모델이 업로드되지 않은(또는 prune된) trial은 제외
+def has_model(tags) -> bool:
+    return tags.get("model_logged", "true") == "true" and tags.get("trial_state") != "PRUNED"
+
+if USE_RUN_INDEX:
+    from src.run_index import RunIndex
+
+    index = RunIndex(EXP_NAME, client=client)
+    print(f"[INFO] Run index synced ({index.sync()} changed runs)")
+
+    # 1) 최신 parent run(optuna_search) 찾기
+    parent = index.latest_parent(PARENT_RUN_NAME, tags={"stage": "tuning"})
+    if parent is None:
+        raise SystemExit(f"[ERROR] No finished parent run named '{PARENT_RUN_NAME}' in '{EXP_NAME}'.")
+    parent_id = parent["run_id"]
+    print(f"[INFO] Parent run: {parent_id} (name={PARENT_RUN_NAME})")
+
+    # 2) child runs 중에서 METRIC_KEY 기준 최고 run 선정 (로컬 pandas 정렬)
+    #    종료 후에 바뀌는 태그(model_logged / prune)는 인덱스가 오래됐을 수 있으므로 후보의 태그만 서버에서 확인
+    candidates = index.top_k(METRIC_KEY, k=50, parent_run_id=parent_id)
+    best, best_tags = None, {}
+    for _, row in candidates.iterrows():
+        best_tags = client.get_run(row["run_id"]).data.tags
+        if has_model(best_tags):
+            best = row
+            break
+    if best is None:
+        raise SystemExit(f"[ERROR] No finished child run with metric '{METRIC_KEY}' and a logged model "
+                         f"under parent {parent_id}.")
+    best_run_id = best["run_id"]
+    best_metric = best[f"metrics.{METRIC_KEY}"]
+    cached_from = best_tags.get("cached_from")
+else:
+    # 1) 최신 parent run(optuna_search) 찾기
+    parent_runs = client.search_runs(
+        experiment_ids=[exp.experiment_id],
+        filter_string=(
+            "attributes.status = 'FINISHED' "
+            f"and tags.mlflow.runName = '{PARENT_RUN_NAME}' "
+            "and tags.stage = 'tuning'"
+        ),
+        order_by=["attributes.start_time DESC"],
+        max_results=1,
+    )
 
-# 메트릭 값 확인(없을 수도 있으니 get)
-best_metric = None
-if best.data.metrics and METRIC_KEY in best.data.metrics:
-    best_metric = best.data.metrics[METRIC_KEY]
-print(f"[INFO] Best trial run: {best.info.run_id}  "
+    if not parent_runs:
+        raise SystemExit(f"[ERROR] No finished parent run named '{PARENT_RUN_NAME}' in '{EXP_NAME}'.")
+    parent = parent_runs[0]
+    parent_id = parent.info.run_id
+    print(f"[INFO] Parent run: {parent_id} (name={PARENT_RUN_NAME})")
+
+    # 2) child runs 중에서 METRIC_KEY 기준 최고 run 선정
+    #    (metrics.<key> DESC로 정렬, prune된 trial은 KILLED 상태라 status 필터에서 제외됨)
+    child_runs = client.search_runs(
+        experiment_ids=[exp.experiment_id],
+        filter_string=(
+            f"tags.mlflow.parentRunId = '{parent_id}' "
+            "and attributes.status = 'FINISHED'"
+        ),
+        order_by=[f"metrics.{METRIC_KEY} DESC", "attributes.start_time DESC"],
+        max_results=50,
+    )
+    best = next((r for r in child_runs if METRIC_KEY in r.data.metrics and has_model(r.data.tags)), None)
+    if best is None:
+        raise SystemExit(f"[ERROR] No finished child run with metric '{METRIC_KEY}' and a logged model "
+                         f"under parent {parent_id}.")
+    best_run_id = best.info.run_id
+    cached_from = best.data.tags.get("cached_from")
+
+    # 메트릭 값 확인(없을 수도 있으니 get)
+    best_metric = None
+    if best.data.metrics and METRIC_KEY in best.data.metrics:
+        best_metric = best.data.metrics[METRIC_KEY]
+
+print(f"[INFO] Best trial run: {best_run_id}  "
         f"(metric {METRIC_KEY}={best_metric})")
 
+# trial cache 적중으로 기록된 run이면 실제로 학습한 원래 run의 모델을 등록
+if cached_from:
+    best_run_id = cached_from
+    print(f"[INFO] Reused result; registering the model of the original run {best_run_id}")
+
 # 3) 모델 아티팩트 경로 조립 (각 trial에서 artifact_path='model'로 저장했음)
-source = f"{best.info.artifact_uri}/model"
+#    CAS_MODELS=1로 저장한 trial은 model/에 manifest만 있으므로 전체 모델(model_full/)로 재구성해서 등록
+source = ContentStore(client=client).registrable_source(best_run_id, "model")
 print(f"[INFO] Source artifact path: {source}")
 
 # 4) Registered Model 생성(없으면)
@@ -71,7 +121,7 @@ except Exception:
 mv = client.create_model_version(
     name=MODEL_NAME,
     source=source,
-    run_id=best.info.run_id,
+    run_id=best_run_id,
     description=f"Registered from best trial (metric={METRIC_KEY}) under parent {parent_id}",
 )
 print(f"[OK] Registered '{MODEL_NAME}' version: {mv.version}")
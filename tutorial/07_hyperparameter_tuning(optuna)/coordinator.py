@@ -0,0 +1,73 @@
+import argparse
+import os
+import sys
+
+from src.distributed_tuning import StudyCoordinator, make_storage, redact_url
+from src.mlflow_utils import setup_mlflow
+
+import optuna
+
+EXP_NAME = "07-optuna-tuning"
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Coordinator for a distributed Optuna study (progress / recovery / handoff).")
+    p.add_argument("--storage", default=os.getenv("OPTUNA_STORAGE"), help="RDB storage URL (default: $OPTUNA_STORAGE)")
+    p.add_argument("--study", default=os.getenv("STUDY_NAME", "iris_xgb_acc"), help="Study name (default: $STUDY_NAME)")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("status", help="Print progress once (also recovers trials with a lost heartbeat)")
+    watch = sub.add_parser("watch", help="Poll until the study reaches its target, then hand off the best trial")
+    watch.add_argument("--interval", type=float, default=10.0, help="Seconds between polls")
+    watch.add_argument("--timeout", type=float, default=None, help="Stop watching after this many seconds")
+    watch.add_argument("--no-finalize", action="store_true", help="Do not finish the parent run when done")
+    sub.add_parser("finalize", help="Hand off the current best trial and finish the parent run now")
+    return p.parse_args()
+
+
+def print_progress(p):
+    counts = " ".join(f"{k.lower()}={v}" for k, v in p["counts"].items() if v)
+    best = f"best=#{p['best_number']} {p['best_value']:.4f}" if p["best_value"] is not None else "best=-"
+    print(f"[{p['done']}/{p['target']}] {counts or 'no trials'} | {best} | workers={len(p['workers'])}", flush=True)
+    for r in p["running"]:
+        print(f"    trial {r['number']:>4} on {r['worker'] or '?'} ({r['elapsed_s'] or 0:.0f}s)")
+
+
+def handoff(coordinator: StudyCoordinator):
+    result = coordinator.handoff()
+    print("\n[Handoff] parent run finished")
+    print(f"- parent run: {result['parent_run_id']}")
+    print(f"- best trial: #{result['best_trial_number']} (value={result['best_value']:.4f}, run={result['best_run_id']})")
+    for k, v in result["params"].items():
+        print(f"  - {k}: {v}")
+    print('Next: python "tutorial/07_hyperparameter_tuning(optuna)/best_trial_register.py"')
+
+
+def main() -> int:
+    args = parse_args()
+    if not args.storage:
+        print("OPTUNA_STORAGE (or --storage) is required.", file=sys.stderr)
+        return 2
+    setup_mlflow(EXP_NAME)
+    study = optuna.load_study(study_name=args.study, storage=make_storage(args.storage))
+    coordinator = StudyCoordinator(study)
+    if coordinator.parent_run_id is None:
+        print(f"Study {args.study!r} has no MLflow parent run yet (start a worker first).", file=sys.stderr)
+        return 1
+    print(f"[Coordinator] study={args.study} storage={redact_url(args.storage)} parent={coordinator.parent_run_id}")
+
+    if args.command == "status":
+        for number in coordinator.recover():
+            print(f"[recover] trial {number}: heartbeat lost, child run marked FAILED")
+        print_progress(coordinator.progress())
+    elif args.command == "watch":
+        p = coordinator.watch(interval=args.interval, on_progress=print_progress, timeout=args.timeout)
+        if coordinator.is_done(p) and not args.no_finalize:
+            handoff(coordinator)
+    else:
+        handoff(coordinator)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
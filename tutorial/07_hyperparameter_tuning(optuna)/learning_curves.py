@@ -0,0 +1,58 @@
+from src.metric_history import MetricHistoryFetcher, child_run_ids
+from src.mlflow_utils import setup_mlflow
+
+import os
+import time
+
+import mlflow
+from mlflow.tracking import MlflowClient
+
+EXP_NAME        = "07-optuna-tuning"
+PARENT_RUN_NAME = "optuna_tuning"
+METRIC_KEY      = os.getenv("METRIC_KEY", "validation_0-mlogloss")
+MAX_WORKERS     = int(os.getenv("MAX_WORKERS", "16"))
+
+setup_mlflow(EXP_NAME)
+client = MlflowClient()
+exp = client.get_experiment_by_name(EXP_NAME)
+
+# 1) 최신 parent run 찾기 (best_trial_register.py와 같은 조건)
+parent = client.search_runs(
+    experiment_ids=[exp.experiment_id],
+    filter_string=(
+        "attributes.status = 'FINISHED' "
+        f"and tags.mlflow.runName = '{PARENT_RUN_NAME}' "
+        "and tags.stage = 'tuning'"
+    ),
+    order_by=["attributes.start_time DESC"],
+    max_results=1,
+)[0]
+parent_id = parent.info.run_id
+run_ids = child_run_ids(client, exp.experiment_id, parent_id)
+print(f"[INFO] Parent run: {parent_id} ({len(run_ids)} child runs)")
+
+# 2) 모든 child run의 history를 병렬로 가져와 step 기준으로 정렬 (종료된 run은 로컬 캐시 재사용)
+fetcher = MetricHistoryFetcher(client, max_workers=MAX_WORKERS)
+t0 = time.perf_counter()
+curves = fetcher.aligned(run_ids, METRIC_KEY)   # index=step, columns=run_id
+elapsed = time.perf_counter() - t0
+# history가 없는 run(cache 적중 / 학습 전에 실패한 trial)은 전부 NaN 열 → idxmin이 실패하므로 제외
+curves = curves.dropna(axis=1, how="all")
+print(f"[INFO] {curves.shape[1]} curves x {curves.shape[0]} steps in {elapsed:.2f}s {fetcher.stats()}")
+
+if curves.empty:
+    raise SystemExit(f"No '{METRIC_KEY}' history found. Re-run run.py (trials log per-round history).")
+
+# 3) 곡선 분석: run별 최소값 / 그 step / 마지막 step, 최소값 기준 정렬
+summary = (
+    curves.agg(["min", "idxmin", "last_valid_index"]).T
+    .rename(columns={"min": "best_value", "idxmin": "best_step", "last_valid_index": "last_step"})
+    .sort_values("best_value")
+)
+print(summary.head(10).to_string())
+
+# 4) parent run에 정렬된 곡선 / 요약을 아티팩트로 기록 (플롯은 CSV를 그대로 사용)
+with mlflow.start_run(run_id=parent_id):
+    mlflow.log_text(curves.to_csv(), f"learning_curves/{METRIC_KEY}.csv")
+    mlflow.log_text(summary.to_csv(), f"learning_curves/{METRIC_KEY}_summary.csv")
+print(f"[OK] Logged learning_curves/{METRIC_KEY}.csv to parent run {parent_id}")